@@ -1,8 +1,11 @@
 from fastmcp import FastMCP
 import requests
 import os
+import threading
 import zipfile
 from minsearch import Index
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 mcp = FastMCP("Demo 🚀")
 
@@ -11,6 +14,21 @@ _docs_index = None
 ZIP_URL = "https://github.com/jlowin/fastmcp/archive/refs/heads/main.zip"
 ZIP_PATH = "fastmcp-main.zip"
 
+# One pooled session for all fetches, so repeated tool calls reuse kept-alive
+# connections; idempotent requests are retried on connection errors and 429/5xx
+FETCH_TIMEOUT = (5, 60)  # (connect, read) seconds
+MAX_FETCHES_PER_HOST = 4
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_maxsize=MAX_FETCHES_PER_HOST,
+        max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+    ),
+)
+# Tools can run concurrently; cap parallel requests to the reader service
+_reader_slots = threading.BoundedSemaphore(MAX_FETCHES_PER_HOST)
+
 @mcp.tool
 def add(a: int, b: int) -> int:
     """Add two numbers"""
@@ -23,14 +41,16 @@ def fetch_web_content(url: str) -> str:
 
 def _fetch_web_content(url: str) -> str:
     jina_url = f"https://r.jina.ai/{url}"
-    response = requests.get(jina_url)
+    with _reader_slots:
+        response = _session.get(jina_url, timeout=FETCH_TIMEOUT)
+    response.raise_for_status()
     return response.text
 
 def download_fastmcp_docs() -> str:
     """Download fastmcp zip if not already present."""
     if os.path.exists(ZIP_PATH):
         return f"Already downloaded: {ZIP_PATH}"
-    response = requests.get(ZIP_URL)
+    response = _session.get(ZIP_URL, timeout=FETCH_TIMEOUT)
     response.raise_for_status()
     with open(ZIP_PATH, "wb") as f:
         f.write(response.content)
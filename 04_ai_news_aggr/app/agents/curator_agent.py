@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import List, Optional
 
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -7,6 +7,9 @@ from pydantic import BaseModel, Field
 
 load_dotenv()
 
+# Digests sent to the LLM curator per profile, after embedding pre-ranking
+CURATOR_CANDIDATE_LIMIT = int(os.getenv("CURATOR_CANDIDATE_LIMIT", "60"))
+
 CURATOR_PROMPT = """You are an Expert AI news curator specializing in personalized content ranking.
 
 Your task is to analyze and rank digests based on a user's profile and interests.
@@ -40,13 +43,14 @@ class RankedDigestList(BaseModel):
 
 
 class CuratorAgent:
-    def __init__(self, user_profile: dict):
+    def __init__(self, user_profile: dict, client: Optional[OpenAI] = None):
         """Initialize CuratorAgent with user profile.
 
         Args:
             user_profile: Dictionary containing user's profile data (name, background, interests, preferences, etc.)
+            client: OpenAI client to reuse across agents (default: a new client)
         """
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = client or OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.model = "gpt-4.1"
         self.user_profile = user_profile
         self.system_prompt = self._build_system_prompt()
@@ -57,9 +61,10 @@ class CuratorAgent:
         Returns:
             Formatted system prompt with user profile context
         """
+        # Profiles shared by several subscribers carry no name (see app.profiles.subscribers)
+        name_line = f"- Name: {self.user_profile['name']}\n" if self.user_profile.get("name") else ""
         profile_str = f"""User Profile:
-- Name: {self.user_profile.get('name', 'User')}
-- Title: {self.user_profile.get('title', 'N/A')}
+{name_line}- Title: {self.user_profile.get('title', 'N/A')}
 - Background: {self.user_profile.get('background', 'N/A')}
 - Expertise Level: {self.user_profile.get('expertise_level', 'N/A')}
 - Interests: {', '.join(self.user_profile.get('interests', []))}
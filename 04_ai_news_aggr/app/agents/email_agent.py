@@ -1,13 +1,25 @@
+import hashlib
+import json
+import logging
 import os
-from datetime import datetime
-from typing import List, Optional
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import List, Optional, Tuple
 
 from dotenv import load_dotenv
 from openai import OpenAI
 from pydantic import BaseModel, Field
 
+from app.services.templates import render_digest_text, render_introduction
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# "template": deterministic, no LLM call; "cached": LLM once per (profile, date, top articles); "llm": always call
+INTRO_MODES = ("template", "cached", "llm")
+
 EMAIL_PROMPT = """You are an expert email writer specializing in crafting personalized daily AI news digests.
 
 Your role is to write a warm, professional introduction for daily AI news digests tailored to the user.
@@ -26,6 +38,45 @@ class EmailIntroduction(BaseModel):
     introduction: str
 
 
+class IntroductionCache:
+    """Thread-safe LRU cache of LLM introductions keyed by (profile, date, top article ids)."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, EmailIntroduction]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(profile: dict, digest_date: date, article_ids: List[str]) -> Tuple:
+        profile_key = hashlib.sha256(json.dumps(profile, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        return profile_key, digest_date.isoformat(), tuple(article_ids)
+
+    def get(self, key: Tuple) -> Optional[EmailIntroduction]:
+        with self._lock:
+            intro = self._entries.get(key)
+            if intro is not None:
+                self._entries.move_to_end(key)
+            return intro.model_copy() if intro is not None else None
+
+    def set(self, key: Tuple, intro: EmailIntroduction) -> None:
+        with self._lock:
+            self._entries[key] = intro.model_copy()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+introduction_cache = IntroductionCache()
+
+
+class LinkedSource(BaseModel):
+    """Another source carrying a near-duplicate of a ranked article."""
+
+    source: str
+    title: str
+    url: str
+
+
 class RankedArticleDetail(BaseModel):
     digest_id: str
     rank: int
@@ -35,6 +86,7 @@ class RankedArticleDetail(BaseModel):
     url: str
     article_type: str
     reasoning: Optional[str] = None
+    also_covered_by: List[LinkedSource] = Field(default_factory=list)
 
 
 class EmailDigestResponse(BaseModel):
@@ -42,34 +94,11 @@ class EmailDigestResponse(BaseModel):
     articles: List[RankedArticleDetail]
     total_ranked: int
     top_n: int
+    digest_date: date = Field(default_factory=date.today)
 
     def to_markdown(self) -> str:
         """Convert email digest to markdown format."""
-        lines = []
-
-        # Add greeting and introduction
-        lines.append(self.introduction.greeting)
-        lines.append("")
-        lines.append(self.introduction.introduction)
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-
-        # Add articles
-        for article in self.articles:
-            lines.append(f"## {article.rank}. {article.title}")
-            lines.append(f"**Score:** {article.relevance_score}/10 | **Type:** {article.article_type}")
-            lines.append("")
-            lines.append(article.summary)
-            lines.append("")
-            lines.append(f"[Read more →]({article.url})")
-            if article.reasoning:
-                lines.append(f"\n*Why curated: {article.reasoning}*")
-            lines.append("")
-            lines.append("---")
-            lines.append("")
-
-        return "\n".join(lines)
+        return render_digest_text(self)
 
 
 class EmailDigest(BaseModel):
@@ -78,36 +107,78 @@ class EmailDigest(BaseModel):
 
 
 class EmailAgent:
-    def __init__(self, user_profile: dict):
+    def __init__(self, user_profile: dict, client: Optional[OpenAI] = None, intro_mode: Optional[str] = None):
         """Initialize EmailAgent with user profile.
 
         Args:
             user_profile: Dictionary containing user's profile data
+            client: OpenAI client to reuse across agents (default: a new client)
+            intro_mode: How introductions are written, one of INTRO_MODES (default: EMAIL_INTRO_MODE or "template")
         """
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = client or OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.model = "gpt-4o-mini"
         self.user_profile = user_profile
+        self.intro_mode = (intro_mode or os.getenv("EMAIL_INTRO_MODE", "template")).lower()
+        if self.intro_mode not in INTRO_MODES:
+            raise ValueError(f"Unknown EMAIL_INTRO_MODE {self.intro_mode!r}, expected one of {INTRO_MODES}")
 
-    def generate_introduction(self, ranked_articles: List) -> EmailIntroduction:
+    def generate_introduction(self, ranked_articles: List, digest_date: Optional[date] = None) -> EmailIntroduction:
         """Generate a personalized introduction for the email digest.
 
         Args:
-            ranked_articles: List of ranked article objects
+            ranked_articles: List of ranked article dictionaries
+            digest_date: Date the digest is for (default: today)
 
         Returns:
             EmailIntroduction with greeting and introduction text
         """
+        # Profiles shared by several subscribers carry no name; the greeting is personalised per recipient
+        user_name = self.user_profile.get("name") or "there"
+        digest_date = digest_date or date.today()
+
         if not ranked_articles:
             return EmailIntroduction(
-                greeting=f"Hey {self.user_profile.get('name', 'there')}!",
+                greeting=f"Hey {user_name}!",
                 introduction="No articles were ranked today. Check back tomorrow for fresh AI news!",
             )
 
-        # Prepare context with top 10 articles
-        user_name = self.user_profile.get("name", "there")
-        today_date = datetime.now().strftime("%B %d, %Y")
         top_articles = ranked_articles[:10]
+        if self.intro_mode == "template":
+            return EmailIntroduction(
+                greeting=f"Hey {user_name}!",
+                introduction=render_introduction(top_articles, digest_date),
+            )
 
+        cache_key = None
+        if self.intro_mode == "cached":
+            cache_key = introduction_cache.key(
+                self.user_profile, digest_date, [article.get("digest_id", "") for article in top_articles]
+            )
+            cached = introduction_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            intro = self._llm_introduction(self.user_profile.get("name"), top_articles, digest_date)
+        except Exception as e:
+            logger.error(f"Error generating introduction: {e}")
+            return EmailIntroduction(
+                greeting=f"Hey {user_name}!",
+                introduction="Here's your personalized AI news digest for today.",
+            )
+
+        if cache_key is not None:
+            introduction_cache.set(cache_key, intro)
+        return intro
+
+    def _llm_introduction(
+        self, user_name: Optional[str], top_articles: List[dict], digest_date: date
+    ) -> EmailIntroduction:
+        """Ask the model for a greeting and introduction.
+
+        Without a name the introduction must not address anyone by name, since it
+        is shared by every subscriber of the profile.
+        """
         article_summaries = "\n".join(
             [
                 f"- {article.get('title', 'Untitled')} (Score: {article.get('relevance_score', 'N/A')}/10)"
@@ -115,36 +186,30 @@ class EmailAgent:
             ]
         )
 
-        user_prompt = f"""Generate a warm introduction for a daily AI news digest for {user_name}.
+        reader = user_name or "a subscriber whose name you do not know; do not use any name in the introduction"
+        user_prompt = f"""Generate a warm introduction for a daily AI news digest for {reader}.
 
-Today's date: {today_date}
+Today's date: {digest_date.strftime("%B %d, %Y")}
 Top articles to be featured:
 {article_summaries}
 
 Create a greeting and brief introduction that makes them excited to read the digest."""
 
-        try:
-            response = self.client.responses.parse(
-                model=self.model,
-                instructions=EMAIL_PROMPT,
-                temperature=0.7,
-                input=user_prompt,
-                text_format=EmailIntroduction,
-            )
-            intro = response.output_parsed
+        response = self.client.responses.parse(
+            model=self.model,
+            instructions=EMAIL_PROMPT,
+            temperature=0.7,
+            input=user_prompt,
+            text_format=EmailIntroduction,
+        )
+        intro = response.output_parsed
 
-            # Consistency check: ensure greeting starts with "Hey {name}"
-            expected_greeting = f"Hey {user_name}"
-            if not intro.greeting.startswith(expected_greeting):
-                intro.greeting = f"{expected_greeting}!"
+        # Consistency check: ensure greeting starts with "Hey {name}"
+        expected_greeting = f"Hey {user_name or 'there'}"
+        if not intro.greeting.startswith(expected_greeting):
+            intro.greeting = f"{expected_greeting}!"
 
-            return intro
-        except Exception as e:
-            print(f"Error generating introduction: {e}")
-            return EmailIntroduction(
-                greeting=f"Hey {user_name}!",
-                introduction="Here's your personalized AI news digest for today.",
-            )
+        return intro
 
     def create_email_digest(self, ranked_articles: List[dict], limit: int = 10) -> EmailDigest:
         """Create an email digest from ranked articles.
@@ -175,10 +240,14 @@ Create a greeting and brief introduction that makes them excited to read the dig
         Returns:
             EmailDigestResponse object with introduction, articles, and metadata
         """
-        introduction = self.generate_introduction([article.model_dump() for article in ranked_articles[:limit]])
+        digest_date = date.today()
+        introduction = self.generate_introduction(
+            [article.model_dump() for article in ranked_articles[:limit]], digest_date=digest_date
+        )
         return EmailDigestResponse(
             introduction=introduction,
             articles=ranked_articles[:limit],
             total_ranked=total_ranked,
             top_n=limit,
+            digest_date=digest_date,
         )
@@ -1,13 +1,24 @@
-from typing import List
+import base64
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
 
-from fastapi import FastAPI, Depends, BackgroundTasks
+from fastapi import FastAPI, Depends, BackgroundTasks, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.connection import SessionLocal, get_database_url
-from app.database.repository import Repository
-from app.daily_runner import run_daily_pipeline
-from app.schemas import DigestResponse, RunPipelineResponse
+from app.database.connection import get_async_session, get_pool_metrics
+from app.database.async_repository import AsyncRepository
+from app.schemas import (
+    DigestResponse,
+    RelatedDigest,
+    RunPipelineResponse,
+    SearchResponse,
+    SearchResult,
+    TranscriptChunkResponse,
+    TranscriptResponse,
+)
+from app.scrapers.transcripts import TranscriptSegments, timestamp_url
 
 # Initialize FastAPI app
 app = FastAPI(title="AI News Aggregator API")
@@ -19,29 +30,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination and revalidation headers of GET /digests
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 
 # Dependency: Get database session
-def get_db() -> Session:
-    """Yield a database session for dependency injection."""
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """Yield an async database session for dependency injection."""
+    async with get_async_session() as db:
         yield db
-    finally:
-        db.close()
 
 
 # Health check endpoint
 @app.get("/health")
-def health_check() -> dict:
+async def health_check() -> dict:
     """Health check endpoint to verify API is running."""
     return {"status": "ok"}
 
 
+# Connection pool metrics endpoint
+@app.get("/metrics/db")
+async def db_metrics() -> dict:
+    """Report connection pool checkouts, wait times and occupancy per engine."""
+    return get_pool_metrics()
+
+
 # Pipeline execution endpoint
 @app.post("/pipeline/run", response_model=RunPipelineResponse)
-def run_pipeline(
+async def run_pipeline(
     background_tasks: BackgroundTasks,
     hours: int = 24,
     top_n: int = 10,
@@ -56,6 +73,9 @@ def run_pipeline(
     Returns:
         RunPipelineResponse with status and message
     """
+    # Imported here so serving reads doesn't load the scraping and LLM stacks
+    from app.daily_runner import run_daily_pipeline
+
     background_tasks.add_task(run_daily_pipeline, hours=hours, top_n=top_n)
     return RunPipelineResponse(
         status="accepted",
@@ -63,25 +83,181 @@ def run_pipeline(
     )
 
 
+def encode_cursor(digest) -> str:
+    """Return the opaque cursor of the page following `digest`."""
+    return base64.urlsafe_b64encode(f"{digest.published_at.isoformat()}|{digest.id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of `encode_cursor`.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        published_at, digest_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(published_at), digest_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """Return whether an If-None-Match header matches `etag`.
+
+    The header is `*` or a comma-separated list of entity tags; each is
+    compared whole, with weak comparison (ignoring the W/ prefix).
+
+    Args:
+        etag: Current entity tag of the resource
+        if_none_match: If-None-Match header value ("" when absent)
+    """
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in tags:
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == opaque for tag in tags if tag)
+
+
 # Get recent digests endpoint
 @app.get("/digests", response_model=List[DigestResponse])
-def get_digests(limit: int = 50, db: Session = Depends(get_db)) -> List[DigestResponse]:
-    """Fetch recent digests.
+async def get_digests(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    db: AsyncSession = Depends(get_db),
+) -> List[DigestResponse]:
+    """Fetch the most recently published digests, one page at a time.
+
+    Responses carry a weak ETag that changes when digests are added; a
+    request whose If-None-Match matches it gets an empty 304 without the page
+    being queried. When more digests may follow, the X-Next-Cursor header
+    holds the `cursor` of the next page.
 
     Args:
+        request: Incoming request (for If-None-Match)
+        response: Outgoing response (for headers)
         limit: Maximum number of digests to return (default: 50)
+        cursor: Cursor of the page to fetch (default: the first page)
+        db: Database session (injected)
+
+    Returns:
+        List of DigestResponse objects, newest first
+    """
+    repo = AsyncRepository(session=db)
+    etag = f'W/"{await repo.get_digests_version()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(etag, request.headers.get("if-none-match", "")):
+        return Response(status_code=304, headers=headers)
+
+    after = decode_cursor(cursor) if cursor else None
+    digests = await repo.get_latest_digests(limit=limit, after=after)
+    response.headers.update(headers)
+    if len(digests) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(digests[-1])
+    return digests
+
+
+# Related digests endpoint
+@app.get("/digests/{digest_id}/related", response_model=List[RelatedDigest])
+async def get_related_digests(
+    digest_id: str,
+    k: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+) -> List[RelatedDigest]:
+    """Fetch the digests most similar to a given digest by embedding.
+
+    Args:
+        digest_id: Id of the digest to find neighbours for
+        k: Maximum number of related digests to return (default: 5)
         db: Database session (injected)
 
     Returns:
-        List of DigestResponse objects
+        List of RelatedDigest objects, most similar first
     """
-    repo = Repository(session=db)
+    # Imported here so the API only loads NumPy when similarity is requested
+    from app.services.embeddings import get_embedding_index
+
+    index = get_embedding_index()
+    await run_in_threadpool(index.refresh)
+    if digest_id not in index:
+        raise HTTPException(status_code=404, detail="Digest not found in embedding index")
 
-    # Use a large hour window (1000 hours ≈ 41 days) to get all recent digests
-    digests = repo.get_recent_digests(hours=1000)
+    neighbours = await run_in_threadpool(index.related, digest_id, k)
+    repo = AsyncRepository(session=db)
+    digests = {digest.id: digest for digest in await repo.get_digests_by_ids([item_id for item_id, _ in neighbours])}
+    return [
+        RelatedDigest.model_validate({**DigestResponse.model_validate(digests[item_id]).model_dump(), "score": score})
+        for item_id, score in neighbours
+        if item_id in digests
+    ]
 
-    # Apply limit
-    return digests[:limit]
+
+# Full-text search endpoint
+@app.get("/search", response_model=SearchResponse)
+async def search_digests(
+    q: str = Query(..., min_length=1, description="Free-text search query"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+) -> SearchResponse:
+    """Search digest titles and summaries, most relevant first.
+
+    Args:
+        q: Free-text search query
+        limit: Maximum number of results to return (default: 20)
+        offset: Number of results to skip, for pagination (default: 0)
+        db: Database session (injected)
+
+    Returns:
+        SearchResponse with the ranked page of results and the total match count
+    """
+    repo = AsyncRepository(session=db)
+    matches, total = await repo.search_digests(q, limit=limit, offset=offset)
+    results = [
+        SearchResult.model_validate({**DigestResponse.model_validate(digest).model_dump(), "rank": rank})
+        for digest, rank in matches
+    ]
+    return SearchResponse(query=q, total=total, limit=limit, offset=offset, results=results)
+
+
+# Transcript chunks endpoint
+@app.get("/items/{source}/{external_id}/transcript", response_model=TranscriptResponse)
+async def get_transcript_chunks(
+    source: str,
+    external_id: str,
+    chunk_seconds: float = Query(300, gt=0, description="Approximate length of each chunk"),
+    db: AsyncSession = Depends(get_db),
+) -> TranscriptResponse:
+    """Split a stored transcript into time chunks with links to their start.
+
+    Args:
+        source: Source name of the item, e.g. "youtube"
+        external_id: Id of the item within its source (the video id)
+        chunk_seconds: Approximate length of each chunk in seconds (default: 300)
+        db: Database session (injected)
+
+    Returns:
+        TranscriptResponse with the chunks in playback order
+    """
+    repo = AsyncRepository(session=db)
+    transcript = await repo.get_transcript(source, external_id)
+    if transcript is None:
+        raise HTTPException(status_code=404, detail="Transcript segments not found")
+
+    url, text, row = transcript
+    segments = TranscriptSegments.from_row(row)
+    return TranscriptResponse(
+        source=source,
+        external_id=external_id,
+        language=segments.language,
+        is_generated=segments.is_generated,
+        segments=len(segments),
+        chunks=[
+            TranscriptChunkResponse(start=chunk.start, end=chunk.end, url=timestamp_url(url, chunk.start), text=chunk.text)
+            for chunk in segments.chunks(text, chunk_seconds)
+        ],
+    )
 
 
 if __name__ == "__main__":
@@ -1,3 +1,20 @@
 YOUTUBE_CHANNELS = [
     "UCawZsQWqfGSbCI5yjkdVkTA",  # Matthew Berman
 ]
+
+# Sources scraped by the pipeline (see app.scrapers.registry); a JSON file named
+# by SOURCES_CONFIG replaces this list
+SOURCES = [
+    {"name": "youtube", "type": "youtube", "channels": YOUTUBE_CHANNELS},
+    {"name": "openai", "type": "rss", "feeds": ["https://openai.com/news/rss.xml"]},
+    {
+        "name": "anthropic",
+        "type": "rss",
+        "feeds": [
+            "https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_anthropic_news.xml",
+            "https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_anthropic_research.xml",
+            "https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_anthropic_engineering.xml",
+        ],
+        "fetch_pages": True,
+    },
+]
@@ -1,11 +1,13 @@
 import logging
+from contextlib import nullcontext
 from datetime import datetime
 
 from dotenv import load_dotenv
 
+from app.database.instrumentation import operation, query_stats_enabled, record_queries
 from app.runner import run_scrapers
-from app.services.process_anthropic import process_anthropic_markdown
-from app.services.process_youtube import process_youtube_transcripts
+from app.scrapers.http_client import get_http_client
+from app.services.process_content import process_content
 from app.services.process_digest import process_digests
 from app.services.process_email import send_digest_email
 
@@ -28,10 +30,58 @@ def run_daily_pipeline(hours: int = 24, top_n: int = 10) -> dict:
         top_n: Number of top articles to include in email
 
     Returns:
-        Dictionary with results and success status
+        Dictionary with results and success status, HTTP transfer statistics
+        and per-host circuit breaker states under "http" (plus per-stage
+        query statistics under "queries" when DB_QUERY_STATS is set)
     """
     start_time = datetime.now()
+    http_client = get_http_client()
+    http_before = http_client.stats.snapshot()
+    with record_queries() if query_stats_enabled() else nullcontext() as queries:
+        results = _run_stages(hours, top_n)
+    results["http"] = http_client.stats.since(http_before)
+    results["http"]["breakers"] = http_client.breaker_states()
+    for host, breaker in results["http"]["breakers"].items():
+        if breaker["state"] != "closed":
+            logger.warning(
+                f"Circuit breaker for {host} is {breaker['state']} after {breaker['trips']} trip(s), "
+                f"{breaker['skipped']} request(s) skipped; retrying after {breaker['cooldown']:.0f}s"
+            )
+
+    if queries is not None:
+        results["queries"] = queries.summary()
+        for pattern in results["queries"]["n_plus_one"]:
+            logger.warning(
+                f"Possible N+1 in {pattern['operation']}: {pattern['count']}x {pattern['statement']}"
+            )
 
+    # Summary
+    end_time = datetime.now()
+    duration = (end_time - start_time).total_seconds()
+
+    logger.info("=" * 60)
+    logger.info("Pipeline Summary")
+    logger.info("=" * 60)
+    logger.info(f"Duration: {duration:.2f} seconds")
+    logger.info(f"Success: {results['success']}")
+    logger.info(f"Scraped: {results['scraping']}")
+    logger.info(f"Processing: {results['processing']}")
+    logger.info(f"Digests: {results['digests']}")
+    logger.info(f"Email: {results['email']}")
+    logger.info(
+        f"HTTP: {results['http']['requests']} requests ({results['http']['reused']} on kept-alive connections, "
+        f"{results['http']['failures']} failed, {results['http']['skipped']} skipped by open breakers), "
+        f"{results['http']['bytes_received']} bytes received"
+    )
+    if queries is not None:
+        logger.info(f"Queries: {results['queries']['queries']} ({results['queries']['by_stage']})")
+    logger.info("=" * 60)
+
+    return results
+
+
+def _run_stages(hours: int, top_n: int) -> dict:
+    """Run the pipeline steps in order, labelling each one's queries by stage."""
     results = {
         "scraping": {},
         "processing": {},
@@ -46,49 +96,38 @@ def run_daily_pipeline(hours: int = 24, top_n: int = 10) -> dict:
         logger.info("=" * 60)
 
         # Step 1: Scraping
-        logger.info("[1/5] Running scrapers...")
-        scraped = run_scrapers(hours=hours)
-        results["scraping"] = {
-            "youtube": len(scraped["youtube"]),
-            "openai": len(scraped["openai"]),
-            "anthropic": len(scraped["anthropic"]),
-        }
-        logger.info(
-            f"✓ Scraped: YouTube {results['scraping']['youtube']}, "
-            f"OpenAI {results['scraping']['openai']}, "
-            f"Anthropic {results['scraping']['anthropic']}"
-        )
-
-        # Step 2: Process Anthropic Markdown
-        logger.info("[2/5] Processing Anthropic markdown...")
-        anthropic_stats = process_anthropic_markdown()
-        results["processing"]["anthropic"] = anthropic_stats
-        logger.info(
-            f"✓ Processed: {anthropic_stats['processed']} articles, "
-            f"Failed: {anthropic_stats['failed']}"
-        )
-
-        # Step 3: Process YouTube Transcripts
-        logger.info("[3/5] Processing YouTube transcripts...")
-        youtube_stats = process_youtube_transcripts()
-        results["processing"]["youtube"] = youtube_stats
-        logger.info(
-            f"✓ Processed: {youtube_stats['processed']} transcripts, "
-            f"Unavailable: {youtube_stats['unavailable']}"
-        )
-
-        # Step 4: Generate Digests
-        logger.info("[4/5] Generating digests...")
-        digest_stats = process_digests()
+        logger.info("[1/4] Running scrapers...")
+        with operation("scraping"):
+            scraped = run_scrapers(hours=hours)
+        results["scraping"] = {name: len(items) for name, items in scraped.items()}
+        logger.info("✓ Scraped: " + ", ".join(f"{name} {count}" for name, count in results["scraping"].items()))
+
+        # Step 2: Fetch content (transcripts, page markdown) for sources that need it
+        logger.info("[2/4] Fetching content...")
+        with operation("content"):
+            results["processing"] = process_content()
+        for name, stats in results["processing"].items():
+            logger.info(
+                f"✓ {name}: processed {stats['processed']}, "
+                f"unavailable {stats['unavailable']}, failed {stats['failed']}"
+            )
+
+        # Step 3: Generate Digests
+        logger.info("[3/4] Generating digests...")
+        with operation("digests"):
+            digest_stats = process_digests()
         results["digests"] = digest_stats
         logger.info(
             f"✓ Generated: {digest_stats['processed']} digests, "
-            f"Failed: {digest_stats['failed']}/{digest_stats['total']}"
+            f"Failed: {digest_stats['failed']}/{digest_stats['total']}, "
+            f"Near-duplicates skipped: {digest_stats.get('duplicates', 0)}, "
+            f"Semantic near-duplicates: {digest_stats.get('semantic_duplicates', 0)}"
         )
 
-        # Step 5: Send Email
-        logger.info("[5/5] Sending digest email...")
-        email_result = send_digest_email(hours=hours, top_n=top_n)
+        # Step 4: Send Email
+        logger.info("[4/4] Sending digest email...")
+        with operation("email"):
+            email_result = send_digest_email(hours=hours, top_n=top_n)
         results["email"] = email_result
 
         if email_result.get("success"):
@@ -101,21 +140,6 @@ def run_daily_pipeline(hours: int = 24, top_n: int = 10) -> dict:
         logger.error(f"Pipeline error: {e}", exc_info=True)
         results["error"] = str(e)
 
-    # Summary
-    end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
-
-    logger.info("=" * 60)
-    logger.info("Pipeline Summary")
-    logger.info("=" * 60)
-    logger.info(f"Duration: {duration:.2f} seconds")
-    logger.info(f"Success: {results['success']}")
-    logger.info(f"Scraped: {results['scraping']}")
-    logger.info(f"Processing: {results['processing']}")
-    logger.info(f"Digests: {results['digests']}")
-    logger.info(f"Email: {results['email']}")
-    logger.info("=" * 60)
-
     return results
 
 
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .instrumentation import traced_operations
+from .compression import decompress_text
+from .models import ArchivedContent, ContentItem, Digest, TranscriptSegmentSet
+from .repository import ARCHIVED_MARKER, UNAVAILABLE_MARKER
+from .search import build_search_query
+
+
+@traced_operations
+class AsyncRepository:
+    """Read-side repository for async request handlers.
+
+    Mirrors the query methods of `Repository` that the API serves, so request
+    handlers can await database I/O instead of holding a threadpool slot.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_latest_digests(
+        self, limit: int = 50, offset: int = 0, after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Digest]:
+        """Return digests ordered by publication time, newest first.
+
+        Args:
+            limit: Maximum number of digests
+            offset: Digests to skip
+            after: (published_at, id) of the last digest of the previous page;
+                keyset pagination that, unlike `offset`, stays one index range
+                scan however deep the page
+        """
+        statement = select(Digest).order_by(Digest.published_at.desc(), Digest.id.desc())
+        if after is not None:
+            published_at, digest_id = after
+            statement = statement.where(
+                or_(
+                    Digest.published_at < published_at,
+                    and_(Digest.published_at == published_at, Digest.id < digest_id),
+                )
+            )
+        result = await self.session.execute(statement.offset(offset).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_digests_version(self) -> str:
+        """Return a token that changes whenever digests are added or removed (digests are never updated)."""
+        count, latest = (await self.session.execute(select(func.count(), func.max(Digest.created_at)))).one()
+        return f"{count}-{latest:%Y%m%d%H%M%S%f}" if latest else f"{count}-0"
+
+    async def get_recent_digests(self, hours: int = 24) -> List[Digest]:
+        """Return digests created in the last X hours, ordered by newest first."""
+        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        result = await self.session.execute(
+            select(Digest)
+            .where(Digest.created_at >= cutoff_time)
+            .order_by(Digest.created_at.desc())
+        )
+        return list(result.scalars().all())
+
+    async def get_digests_by_ids(self, digest_ids: List[str]) -> List[Digest]:
+        """Fetch digests by id, in no particular order."""
+        if not digest_ids:
+            return []
+        result = await self.session.execute(select(Digest).where(Digest.id.in_(digest_ids)))
+        return list(result.scalars().all())
+
+    async def search_digests(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[List[Tuple[Digest, float]], int]:
+        """Full-text search over digest titles and summaries.
+
+        Returns:
+            Tuple of ((digest, rank) pairs ordered by relevance, total number of matches)
+        """
+        statement, count = build_search_query(self.session.get_bind().dialect.name, query, limit, offset)
+        results = [(digest, rank) for digest, rank in (await self.session.execute(statement)).all()]
+        total = (await self.session.execute(count)).scalar_one()
+        return results, total
+
+    async def get_transcript(self, source: str, external_id: str) -> Optional[Tuple[str, str, TranscriptSegmentSet]]:
+        """Return the (url, text, segment timing) of a stored transcript.
+
+        Text moved to the archive by retention is read back from there.
+        Returns None if the item has no stored segments or text.
+        """
+        segments = await self.session.get(TranscriptSegmentSet, (source, external_id))
+        item = await self.session.get(ContentItem, (source, external_id))
+        if segments is None or item is None or not item.content or item.content == UNAVAILABLE_MARKER:
+            return None
+        text = item.content
+        if text == ARCHIVED_MARKER:
+            archived = await self.session.get(ArchivedContent, f"{source}:{external_id}")
+            if archived is None:
+                return None
+            text = decompress_text(archived.payload)
+        return item.url, text, segments
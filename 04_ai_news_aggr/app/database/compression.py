@@ -0,0 +1,212 @@
+"""zstd compression for stored text.
+
+Two formats live here:
+
+* `compress_text` / `decompress_text` produce bare zstd frames, used for the
+  archive table payloads.
+* `encode_text` / `decode_text` back the `CompressedText` column type. The
+  first byte says how the rest is stored: `RAW` (UTF-8, for values too short
+  to gain from compression), `ZSTD` (a zstd frame) or `INCOMPRESSIBLE`
+  (UTF-8 that zstd did not shrink, so a backfill knows it was already tried).
+  Short values encode deterministically, so SQL comparisons against markers
+  such as "__UNAVAILABLE__" keep working on compressed columns.
+
+Frames may be compressed with a dictionary trained on our own stored content,
+which helps most for short and medium documents. A frame records its
+dictionary id, and every dictionary in ZSTD_DICTIONARY_DIR is available for
+decompression; ZSTD_DICTIONARY_ID picks the one used for new values. Trained
+dictionaries must therefore never be deleted while rows still use them.
+
+Compressor/decompressor contexts are not thread-safe, so each thread keeps its
+own; creating them per call would cost more than compressing a short transcript.
+
+Usage:
+    python -m app.database.compression train   # train a dictionary from stored content
+"""
+import argparse
+import os
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import zstandard
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+COMPRESSION_LEVEL = int(os.getenv("ZSTD_LEVEL", "9"))
+COLUMN_COMPRESSION_LEVEL = int(os.getenv("ZSTD_COLUMN_LEVEL", "3"))
+DICTIONARY_DIR = Path(os.getenv("ZSTD_DICTIONARY_DIR", str(Path(__file__).parent / "dictionaries")))
+
+# Header byte of values stored through CompressedText
+RAW = b"\x00"
+ZSTD = b"\x01"
+INCOMPRESSIBLE = b"\x02"
+# Values shorter than this are stored raw; a zstd frame would barely shrink them
+MIN_COMPRESS_BYTES = 128
+
+_local = threading.local()
+
+
+def load_dictionaries() -> Dict[int, zstandard.ZstdCompressionDict]:
+    """Return every `<dict_id>.zdict` dictionary in ZSTD_DICTIONARY_DIR, keyed by dictionary id."""
+    return _load_dictionaries(DICTIONARY_DIR)
+
+
+@lru_cache(maxsize=None)
+def _load_dictionaries(directory: Path) -> Dict[int, zstandard.ZstdCompressionDict]:
+    dictionaries = {}
+    if directory.is_dir():
+        for path in sorted(directory.glob("*.zdict")):
+            dictionary = zstandard.ZstdCompressionDict(path.read_bytes())
+            dictionaries[dictionary.dict_id()] = dictionary
+    return dictionaries
+
+
+def active_dictionary() -> Optional[zstandard.ZstdCompressionDict]:
+    """Return the dictionary selected by ZSTD_DICTIONARY_ID for new values, if any."""
+    dict_id = os.getenv("ZSTD_DICTIONARY_ID")
+    if not dict_id:
+        return None
+    dictionaries = load_dictionaries()
+    if int(dict_id) not in dictionaries:
+        raise LookupError(f"ZSTD_DICTIONARY_ID={dict_id} not found in {DICTIONARY_DIR}")
+    return dictionaries[int(dict_id)]
+
+
+def _compressor(level: int, dictionary: Optional[zstandard.ZstdCompressionDict]) -> zstandard.ZstdCompressor:
+    key = (level, dictionary.dict_id() if dictionary is not None else 0)
+    compressors = _local.__dict__.setdefault("compressors", {})
+    if key not in compressors:
+        compressors[key] = zstandard.ZstdCompressor(level=level, dict_data=dictionary)
+    return compressors[key]
+
+
+def _decompressor(dict_id: int) -> zstandard.ZstdDecompressor:
+    decompressors = _local.__dict__.setdefault("decompressors", {})
+    if dict_id not in decompressors:
+        dictionary = load_dictionaries().get(dict_id) if dict_id else None
+        if dict_id and dictionary is None:
+            raise LookupError(f"zstd dictionary {dict_id} not found in {DICTIONARY_DIR}")
+        decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dictionary)
+    return decompressors[dict_id]
+
+
+def _decompress_frame(frame: bytes) -> bytes:
+    return _decompressor(zstandard.get_frame_parameters(frame).dict_id).decompress(frame)
+
+
+def compress_text(text: str, level: int = COMPRESSION_LEVEL) -> bytes:
+    """Compress UTF-8 text into a zstd frame."""
+    return _compressor(level, active_dictionary()).compress(text.encode("utf-8"))
+
+
+def decompress_text(payload: bytes) -> str:
+    """Inverse of `compress_text`."""
+    return _decompress_frame(bytes(payload)).decode("utf-8")
+
+
+def encode_text(
+    text: str,
+    level: int = COLUMN_COMPRESSION_LEVEL,
+    dictionary: Union[zstandard.ZstdCompressionDict, None, bool] = True,
+) -> bytes:
+    """Encode text as a header byte plus raw UTF-8 or a zstd frame, whichever is smaller.
+
+    Args:
+        text: Value to store
+        level: zstd compression level
+        dictionary: Dictionary to compress with; True uses the active one, None none
+    """
+    raw = text.encode("utf-8")
+    if len(raw) < MIN_COMPRESS_BYTES:
+        return RAW + raw
+    if dictionary is True:
+        dictionary = active_dictionary()
+    frame = _compressor(level, dictionary).compress(raw)
+    return ZSTD + frame if len(frame) < len(raw) else INCOMPRESSIBLE + raw
+
+
+def decode_text(value: Union[bytes, memoryview, str]) -> str:
+    """Inverse of `encode_text`; text not yet migrated to the encoded form passes through."""
+    if isinstance(value, str):
+        return value
+    value = bytes(value)
+    header, body = value[:1], value[1:]
+    if header == RAW or header == INCOMPRESSIBLE:
+        return body.decode("utf-8")
+    if header == ZSTD:
+        return _decompress_frame(body).decode("utf-8")
+    raise ValueError(f"Unknown CompressedText header {header!r}")
+
+
+class CompressedText(TypeDecorator):
+    """Text column stored as `encode_text` bytes and read back as `str`.
+
+    Equality against short literals (markers) works in SQL because short
+    values are stored raw; LIKE and full-text search on the column do not.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else encode_text(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else decode_text(value)
+
+
+def train_dictionary(samples: Iterable[str], size: int = 112_640) -> zstandard.ZstdCompressionDict:
+    """Train a zstd dictionary from sample documents."""
+    return zstandard.train_dictionary(size, [sample.encode("utf-8") for sample in samples if sample])
+
+
+def save_dictionary(dictionary: zstandard.ZstdCompressionDict) -> Path:
+    """Write a dictionary to ZSTD_DICTIONARY_DIR and make it available for decompression."""
+    DICTIONARY_DIR.mkdir(parents=True, exist_ok=True)
+    path = DICTIONARY_DIR / f"{dictionary.dict_id()}.zdict"
+    path.write_bytes(dictionary.as_bytes())
+    _load_dictionaries.cache_clear()
+    _local.__dict__.pop("decompressors", None)
+    return path
+
+
+def _stored_samples(limit: int) -> List[str]:
+    from sqlalchemy import select
+
+    from app.database.connection import session_scope
+    from app.database.models import ContentItem
+
+    with session_scope() as session:
+        return [
+            content
+            for content in session.execute(
+                select(ContentItem.content)
+                .where(ContentItem.content.isnot(None))
+                .order_by(ContentItem.created_at.desc())
+                .limit(limit)
+            ).scalars()
+            if len(content) >= MIN_COMPRESS_BYTES
+        ]
+
+
+if __name__ == "__main__":
+    project_root = Path(__file__).parent.parent.parent
+    sys.path.insert(0, str(project_root))
+
+    parser = argparse.ArgumentParser(description="Manage zstd dictionaries for compressed text columns")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="Train a dictionary from stored item content")
+    train.add_argument("--samples", type=int, default=5000, help="Most recent documents to train on")
+    train.add_argument("--size", type=int, default=112_640, help="Dictionary size in bytes")
+    commands.add_parser("list", help="List available dictionaries")
+    args = parser.parse_args()
+
+    if args.command == "train":
+        dictionary = train_dictionary(_stored_samples(args.samples), size=args.size)
+        path = save_dictionary(dictionary)
+        print(f"Wrote {path}; set ZSTD_DICTIONARY_ID={dictionary.dict_id()} to compress new values with it")
+    else:
+        for dict_id, dictionary in load_dictionaries().items():
+            print(f"{dict_id}\t{len(dictionary.as_bytes())} bytes")
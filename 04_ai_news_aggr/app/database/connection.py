@@ -1,13 +1,27 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, Optional
+
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
 
-load_dotenv()
+@lru_cache(maxsize=None)
+def _load_env() -> None:
+    """Load `.env` once, on first use rather than at import time."""
+    load_dotenv()
 
 
 def get_database_url() -> str:
     """Construct PostgreSQL connection string from environment variables."""
+    _load_env()
     user = os.getenv("POSTGRES_USER", "postgres")
     password = os.getenv("POSTGRES_PASSWORD", "postgres")
     host = os.getenv("POSTGRES_HOST", "localhost")
@@ -17,10 +31,223 @@ def get_database_url() -> str:
     return f"postgresql://{user}:{password}@{host}:{port}/{db}"
 
 
-engine = create_engine(get_database_url())
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_async_database_url() -> str:
+    """Construct the asyncpg connection string used by the async engine."""
+    return get_database_url().replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+def get_pool_settings() -> dict:
+    """Read connection pool settings from environment variables.
+
+    Returns:
+        Keyword arguments for `create_engine` / `create_async_engine`
+    """
+    _load_env()
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
+
+
+class PoolMetrics:
+    """Thread-safe counters for connection pool checkouts and wait times."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Times how long callers wait for a pooled connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.record_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        # Engine.dispose() swaps in a fresh pool; keep accumulating into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_pool_metrics: Dict[str, PoolMetrics] = {}
+_engines: Dict[str, Engine] = {}
+
+
+def _instrument(name: str, engine: Engine) -> None:
+    """Attach pool metrics to an engine and register it for `get_pool_metrics`."""
+    metrics = PoolMetrics()
+    engine.pool.metrics = metrics
+
+    event.listen(engine, "connect", lambda *args: metrics.increment("connects"))
+    event.listen(engine, "checkout", lambda *args: metrics.increment("checkouts"))
+    event.listen(engine, "checkin", lambda *args: metrics.increment("checkins"))
+    event.listen(engine, "invalidate", lambda *args: metrics.increment("invalidations"))
+
+    _pool_metrics[name] = metrics
+    _engines[name] = engine
+
 
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (url.rstrip("/").endswith(":") or ":memory:" in url)
 
-def get_session():
+
+def create_db_engine(url: Optional[str] = None, name: str = "sync", **overrides) -> Engine:
+    """Create a sync engine with env-configured pooling and metrics.
+
+    Args:
+        url: Database URL (default: built from POSTGRES_* variables)
+        name: Label the pool metrics are reported under
+        **overrides: Extra `create_engine` arguments, taking precedence over env settings
+
+    Returns:
+        Configured SQLAlchemy Engine
+    """
+    url = url or get_database_url()
+    if _is_memory_sqlite(url):
+        # In-memory SQLite needs its single-connection pool; queue pool settings don't apply
+        return create_engine(url, **overrides)
+
+    engine = create_engine(url, poolclass=InstrumentedQueuePool, **{**get_pool_settings(), **overrides})
+    _instrument(name, engine)
+    return engine
+
+
+def create_async_db_engine(url: Optional[str] = None, name: str = "async", **overrides) -> AsyncEngine:
+    """Create an async engine with env-configured pooling and metrics.
+
+    Args:
+        url: Async database URL (default: asyncpg URL built from POSTGRES_* variables)
+        name: Label the pool metrics are reported under
+        **overrides: Extra `create_async_engine` arguments, taking precedence over env settings
+
+    Returns:
+        Configured SQLAlchemy AsyncEngine
+    """
+    url = url or get_async_database_url()
+    if _is_memory_sqlite(url):
+        return create_async_engine(url, **overrides)
+
+    engine = create_async_engine(url, poolclass=InstrumentedAsyncQueuePool, **{**get_pool_settings(), **overrides})
+    _instrument(name, engine.sync_engine)
+    return engine
+
+
+def get_pool_metrics() -> Dict[str, dict]:
+    """Return checkout/wait counters and current pool occupancy per engine."""
+    report = {}
+    for name, metrics in _pool_metrics.items():
+        pool = _engines[name].pool
+        report[name] = {
+            **metrics.snapshot(),
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        }
+    return report
+
+
+# Session factories are bound to their engine on first use (see get_engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """Return the application engine, creating it on first call."""
+    engine = create_db_engine()
+    SessionLocal.configure(bind=engine)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """Return the application async engine, creating it on first call."""
+    async_engine = create_async_db_engine()
+    AsyncSessionLocal.configure(bind=async_engine)
+    return async_engine
+
+
+def __getattr__(name: str):
+    # Keep `from app.database.connection import engine` working without an import-time engine
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_session() -> Session:
     """Return a new database session."""
+    if SessionLocal.kw.get("bind") is None:
+        get_engine()
     return SessionLocal()
+
+
+def get_async_session() -> AsyncSession:
+    """Return a new async database session."""
+    if AsyncSessionLocal.kw.get("bind") is None:
+        get_async_engine()
+    return AsyncSessionLocal()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Provide a session that is committed on success, rolled back on error and always closed.
+
+    Yields:
+        SQLAlchemy Session whose connection returns to the pool on exit
+    """
+    session = get_session()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
@@ -1,14 +1,219 @@
 import sys
+from datetime import datetime
 from pathlib import Path
 
 # Add project root to path for imports
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.database.models import Base
-from app.database.connection import engine
+from sqlalchemy import LargeBinary, MetaData, Table, bindparam, insert, inspect, select, text
+
+from app.database.compression import MIN_COMPRESS_BYTES, decode_text, encode_text
+from app.database.models import Base, ContentItem
+from app.database.connection import get_engine
+from app.database.search import install_search_index
+
+
+def upgrade_schema(bind) -> None:
+    """Bring tables created by an older version up to date with the models.
+
+    `create_all` only creates missing tables, so columns added later have to
+    be added (and backfilled) explicitly. Every step is idempotent.
+    """
+    inspector = inspect(bind)
+    if "digests" not in inspector.get_table_names():
+        return
+
+    migrate_legacy_sources(bind)
+
+    digest_columns = {column["name"] for column in inspector.get_columns("digests")}
+    with bind.begin() as conn:
+        if "published_at" not in digest_columns:
+            column_type = "TIMESTAMP WITH TIME ZONE" if bind.dialect.name == "postgresql" else "DATETIME"
+            conn.execute(text(f"ALTER TABLE digests ADD COLUMN published_at {column_type}"))
+
+            # Backfill from the source tables, falling back to the digest creation time
+            for table, key in (
+                ("youtube_videos", "video_id"),
+                ("openai_articles", "guid"),
+                ("anthropic_articles", "guid"),
+            ):
+                article_type = table.split("_")[0]
+                conn.execute(
+                    text(
+                        f"UPDATE digests SET published_at = "
+                        f"(SELECT s.published_at FROM {table} s WHERE s.{key} = digests.article_id) "
+                        f"WHERE article_type = :article_type AND published_at IS NULL"
+                    ),
+                    {"article_type": article_type},
+                )
+            conn.execute(text("UPDATE digests SET published_at = created_at WHERE published_at IS NULL"))
+            if bind.dialect.name == "postgresql":
+                conn.execute(text("ALTER TABLE digests ALTER COLUMN published_at SET NOT NULL"))
+
+        conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_digests_published_at_id ON digests (published_at, id)")
+        )
+
+        install_search_index(None, conn)
+
+        if "content_fingerprints" in inspector.get_table_names():
+            fingerprint_columns = {column["name"] for column in inspector.get_columns("content_fingerprints")}
+            if "duplicate_of" not in fingerprint_columns:
+                conn.execute(text("ALTER TABLE content_fingerprints ADD COLUMN duplicate_of VARCHAR"))
+
+    backfill_compressed_columns(bind)
+
+
+# Per-source tables replaced by `content_items`:
+# (table, source name, key column, content column or None, extra columns)
+LEGACY_SOURCE_TABLES = [
+    ("youtube_videos", "youtube", "video_id", "transcript", ("channel_id",)),
+    ("openai_articles", "openai", "guid", None, ()),
+    ("anthropic_articles", "anthropic", "guid", "markdown", ()),
+]
+
+
+def migrate_legacy_sources(bind, batch_size: int = 1000) -> int:
+    """Copy rows of the old per-source tables into `content_items`.
+
+    Content is decoded whatever form it was stored in (plain text, or a
+    CompressedText value) and re-encoded on insert. OpenAI articles were
+    digested from their description, which becomes their content. Items
+    already in `content_items` are left alone, so this can be rerun; the old
+    tables are kept and can be dropped once the copy has been checked.
+
+    Returns:
+        Number of items copied
+    """
+    tables = set(inspect(bind).get_table_names())
+    copied = 0
+
+    for table, source, key, content_column, extra_columns in LEGACY_SOURCE_TABLES:
+        if table not in tables:
+            continue
+        # Reflected so values come back typed (datetimes, bytes) on every dialect
+        legacy = Table(table, MetaData(), autoload_with=bind)
+        key_column = legacy.c[key]
+
+        def to_item(row) -> dict:
+            if content_column is None:
+                content = row["description"]
+            else:
+                content = None if row[content_column] is None else decode_text(row[content_column])
+            return {
+                "source": source,
+                "external_id": row[key],
+                "title": row["title"],
+                "url": row["url"],
+                "description": row["description"],
+                "published_at": row["published_at"],
+                "created_at": row["created_at"] or datetime.utcnow(),
+                "category": row["category"] if "category" in legacy.c else None,
+                "extra": {column: row[column] for column in extra_columns} or None,
+                "content": content,
+            }
+
+        after = ""
+        while True:
+            with bind.begin() as conn:
+                rows = (
+                    conn.execute(select(legacy).where(key_column > after).order_by(key_column).limit(batch_size))
+                    .mappings()
+                    .all()
+                )
+                if not rows:
+                    break
+                existing = set(
+                    conn.execute(
+                        select(ContentItem.external_id).where(
+                            ContentItem.source == source, ContentItem.external_id.in_([row[key] for row in rows])
+                        )
+                    ).scalars()
+                )
+                items = [to_item(row) for row in rows if row[key] not in existing]
+                if items:
+                    conn.execute(insert(ContentItem), items)
+            copied += len(items)
+            after = rows[-1][key]
+
+    return copied
+
+
+# (table, key columns, column) stored as CompressedText
+COMPRESSED_COLUMNS = [
+    ("content_items", ("source", "external_id"), "content"),
+]
+
+
+def backfill_compressed_columns(bind, batch_size: int = 1000) -> int:
+    """Convert plain-text values of CompressedText columns to the encoded form.
+
+    Postgres columns are first retyped to bytea with every value wrapped as raw
+    (header byte 0), which keeps the table readable throughout; SQLite stores
+    bytes in the existing TEXT column, so legacy rows are simply those still
+    typed as text. Values are then compressed in keyset-paginated batches, one
+    transaction per batch, so the backfill can be interrupted and rerun.
+
+    Returns:
+        Number of values rewritten
+    """
+    tables = set(inspect(bind).get_table_names())
+    postgres = bind.dialect.name == "postgresql"
+    rewritten = 0
+
+    for table, keys, column in COMPRESSED_COLUMNS:
+        if table not in tables:
+            continue
+        if postgres:
+            column_type = next(c["type"] for c in inspect(bind).get_columns(table) if c["name"] == column)
+            if not isinstance(column_type, LargeBinary):
+                with bind.begin() as conn:
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE bytea "
+                            f"USING ('\\x00'::bytea || convert_to({column}, 'UTF8'))"
+                        )
+                    )
+            # Long values that did not compress are stored as INCOMPRESSIBLE, so only
+            # values wrapped as RAW by the retype above still match
+            pending = f"get_byte({column}, 0) = 0 AND octet_length({column}) > {MIN_COMPRESS_BYTES}"
+        else:
+            pending = f"typeof({column}) = 'text'"
+
+        key_list = ", ".join(keys)
+        after_params = ", ".join(f":after_{i}" for i in range(len(keys)))
+        select_batch = text(
+            f"SELECT {key_list}, {column} FROM {table} "
+            f"WHERE {column} IS NOT NULL AND {pending} AND ({key_list}) > ({after_params}) "
+            f"ORDER BY {key_list} LIMIT :limit"
+        )
+        key_match = " AND ".join(f"{key} = :key_{i}" for i, key in enumerate(keys))
+        update_row = text(f"UPDATE {table} SET {column} = :value WHERE {key_match}").bindparams(
+            bindparam("value", type_=LargeBinary)
+        )
+        after = [""] * len(keys)
+        while True:
+            with bind.begin() as conn:
+                params = {f"after_{i}": value for i, value in enumerate(after)}
+                rows = conn.execute(select_batch, {**params, "limit": batch_size}).all()
+                if not rows:
+                    break
+                conn.execute(
+                    update_row,
+                    [
+                        {**{f"key_{i}": row[i] for i in range(len(keys))}, "value": encode_text(decode_text(row[-1]))}
+                        for row in rows
+                    ],
+                )
+            rewritten += len(rows)
+            after = list(rows[-1][: len(keys)])
+
+    return rewritten
 
 
 if __name__ == "__main__":
+    engine = get_engine()
     Base.metadata.create_all(engine)
+    upgrade_schema(engine)
     print("Tables created successfully")
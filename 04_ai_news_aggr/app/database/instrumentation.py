@@ -0,0 +1,215 @@
+"""Opt-in query instrumentation.
+
+`record_queries()` listens on SQLAlchemy engines and attributes every
+statement to the logical operation running when it was issued: the
+innermost `operation(...)` label, which is the `Repository` method for
+repository calls, and the outermost label, which the daily pipeline sets
+per stage. Nothing is recorded (and labelling is a flag check) unless a
+recorder is active.
+
+Usage in tests:
+    with record_queries() as queries:
+        repo.bulk_create_content_items("youtube", items)
+    assert queries.count < 10
+    assert not queries.n_plus_one()
+"""
+import functools
+import inspect
+import logging
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+UNLABELLED = "<unlabelled>"
+
+# Same statement this many times within one operation looks like a per-row query
+N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "10"))
+SLOW_QUERY_SECONDS = float(os.getenv("DB_SLOW_QUERY_MS", "100")) / 1000
+
+_operations: ContextVar[Tuple[str, ...]] = ContextVar("db_operations", default=())
+_active_recorders = 0
+
+
+@dataclass
+class QueryEvent:
+    statement: str
+    operation: str
+    stage: str
+    seconds: float
+    executemany: bool
+
+
+class QueryRecorder:
+    """Collects statements issued while active, grouped by operation and stage."""
+
+    def __init__(
+        self,
+        n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD,
+        slow_query_seconds: float = SLOW_QUERY_SECONDS,
+    ):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_query_seconds = slow_query_seconds
+        self.events: List[QueryEvent] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.events)
+
+    @property
+    def seconds(self) -> float:
+        return sum(query.seconds for query in self.events)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault(("query_started", id(self)), []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        seconds = time.perf_counter() - conn.info[("query_started", id(self))].pop()
+        labels = _operations.get()
+        query = QueryEvent(
+            statement=statement,
+            operation=labels[-1] if labels else UNLABELLED,
+            stage=labels[0] if labels else UNLABELLED,
+            seconds=seconds,
+            executemany=executemany,
+        )
+        self.events.append(query)
+        if seconds >= self.slow_query_seconds:
+            logger.warning(f"Slow query ({seconds * 1000:.0f} ms) in {query.operation}: {_shorten(statement)}")
+
+    def by_operation(self) -> Dict[str, dict]:
+        """Statement count and total seconds per innermost operation."""
+        return self._group(lambda query: query.operation)
+
+    def by_stage(self) -> Dict[str, dict]:
+        """Statement count and total seconds per outermost operation (pipeline stage)."""
+        return self._group(lambda query: query.stage)
+
+    def _group(self, key) -> Dict[str, dict]:
+        groups: Dict[str, dict] = defaultdict(lambda: {"queries": 0, "seconds": 0.0})
+        for query in self.events:
+            groups[key(query)]["queries"] += 1
+            groups[key(query)]["seconds"] += query.seconds
+        return {name: {**group, "seconds": round(group["seconds"], 6)} for name, group in groups.items()}
+
+    def slow_queries(self) -> List[QueryEvent]:
+        return [query for query in self.events if query.seconds >= self.slow_query_seconds]
+
+    def n_plus_one(self) -> List[dict]:
+        """Statements repeated at least `n_plus_one_threshold` times within one operation.
+
+        Statements are compared by their parameterised SQL, so a per-row
+        lookup shows up as one statement with a high count.
+        """
+        repeats = Counter((query.operation, _normalise(query.statement)) for query in self.events)
+        return [
+            {"operation": operation, "statement": _shorten(statement), "count": count}
+            for (operation, statement), count in repeats.most_common()
+            if count >= self.n_plus_one_threshold
+        ]
+
+    def summary(self) -> dict:
+        """JSON-friendly report for logs and pipeline results."""
+        return {
+            "queries": self.count,
+            "seconds": round(self.seconds, 6),
+            "by_stage": self.by_stage(),
+            "by_operation": self.by_operation(),
+            "slow": len(self.slow_queries()),
+            "n_plus_one": self.n_plus_one(),
+        }
+
+
+def _normalise(statement: str) -> str:
+    # Expanded IN lists and multi-row VALUES differ only in their placeholder count
+    return re.sub(r"\((?:\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)\s*,?)+\)", "(...)", " ".join(statement.split()))
+
+
+def _shorten(statement: str, length: int = 160) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[: length - 3] + "..."
+
+
+@contextmanager
+def record_queries(
+    engine: Union[Engine, AsyncEngine, None] = None,
+    n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD,
+    slow_query_seconds: float = SLOW_QUERY_SECONDS,
+) -> Iterator[QueryRecorder]:
+    """Record statements issued on `engine` (default: every engine) while the block runs.
+
+    Yields:
+        QueryRecorder holding the statements issued so far
+    """
+    global _active_recorders
+    target = engine.sync_engine if isinstance(engine, AsyncEngine) else (engine or Engine)
+    recorder = QueryRecorder(n_plus_one_threshold=n_plus_one_threshold, slow_query_seconds=slow_query_seconds)
+    event.listen(target, "before_cursor_execute", recorder._before)
+    event.listen(target, "after_cursor_execute", recorder._after)
+    _active_recorders += 1
+    try:
+        yield recorder
+    finally:
+        _active_recorders -= 1
+        event.remove(target, "before_cursor_execute", recorder._before)
+        event.remove(target, "after_cursor_execute", recorder._after)
+
+
+@contextmanager
+def operation(name: str) -> Iterator[None]:
+    """Label statements issued inside the block with `name`.
+
+    Labels nest: the outermost one is reported as the stage and the
+    innermost one as the operation.
+    """
+    token = _operations.set(_operations.get() + (name,))
+    try:
+        yield
+    finally:
+        _operations.reset(token)
+
+
+def traced_operations(cls):
+    """Class decorator labelling each public method's statements as `Class.method`."""
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(method):
+            continue
+        setattr(cls, name, _traced(f"{cls.__name__}.{name}", method))
+    return cls
+
+
+def _traced(label: str, method):
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            if not _active_recorders:
+                return await method(*args, **kwargs)
+            with operation(label):
+                return await method(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if not _active_recorders:
+            return method(*args, **kwargs)
+        with operation(label):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+def query_stats_enabled() -> bool:
+    """Whether DB_QUERY_STATS asks the pipeline to record and report query statistics."""
+    return os.getenv("DB_QUERY_STATS", "").lower() in ("1", "true", "yes")
@@ -0,0 +1,108 @@
+"""Cross-process locks that keep pipeline runs from overlapping.
+
+On PostgreSQL `run_lock` takes a session-level advisory lock, held by a
+dedicated connection for the duration of the run, so schedulers on several
+hosts exclude each other. SQLite has no advisory locks; there it locks a file
+next to the database, which covers processes on one host. Either lock is
+released if its holder dies, so a crashed run never blocks the next one.
+"""
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def lock_key(name: str) -> int:
+    """Return the signed 64-bit advisory lock key of a lock name."""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
+def lock_file_path(engine: Engine, name: str) -> str:
+    """Return the lock file of `name` for a SQLite database (in the temp dir for in-memory ones)."""
+    database = engine.url.database
+    if database and database != ":memory:":
+        return f"{database}.{name}.lock"
+    return os.path.join(tempfile.gettempdir(), f"ai-news-aggregator.{name}.lock")
+
+
+@contextmanager
+def _advisory_lock(engine: Engine, name: str) -> Iterator[bool]:
+    key = lock_key(name)
+    with engine.connect() as connection:
+        acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar()
+        connection.commit()
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                connection.commit()
+
+
+@contextmanager
+def file_lock(path: str, blocking: bool = True) -> Iterator[bool]:
+    """Take an exclusive lock on a file, creating it if needed.
+
+    Args:
+        path: Lock file path
+        blocking: Wait for the lock instead of giving up when it is held
+
+    Yields:
+        Whether the lock was acquired (always True when blocking)
+    """
+    with open(path, "a+b") as f:
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except OSError:
+            if blocking:
+                raise
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def run_lock(name: str = "pipeline", engine: Optional[Engine] = None) -> Iterator[bool]:
+    """Try to take the named run lock without waiting.
+
+    Args:
+        name: Lock name; runs holding the same name exclude each other
+        engine: Database the lock belongs to (default: the application engine)
+
+    Yields:
+        Whether the lock was acquired; if not, another run holds it and the
+        caller should skip its work
+    """
+    if engine is None:
+        from .connection import get_engine
+
+        engine = get_engine()
+    if engine.dialect.name == "postgresql":
+        with _advisory_lock(engine, name) as acquired:
+            yield acquired
+    elif engine.dialect.name == "sqlite":
+        with file_lock(lock_file_path(engine, name), blocking=False) as acquired:
+            yield acquired
+    else:
+        raise NotImplementedError(f"No run lock for the {engine.dialect.name} dialect")
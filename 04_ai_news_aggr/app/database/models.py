@@ -1,52 +1,85 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy import JSON, Boolean, Column, Integer, String, DateTime, Text, Index, LargeBinary, event
 from sqlalchemy.orm import declarative_base
 
-Base = declarative_base()
+from .compression import CompressedText
+from .search import install_search_index, drop_search_index
 
+Base = declarative_base()
 
-class YouTubeVideo(Base):
-    __tablename__ = "youtube_videos"
 
-    video_id = Column(String, primary_key=True)
-    title = Column(String, nullable=False)
-    url = Column(String, nullable=False)
-    channel_id = Column(String, nullable=False)
-    published_at = Column(DateTime, nullable=False)
-    description = Column(Text)
-    transcript = Column(Text, nullable=True, default=None)
-    created_at = Column(DateTime, default=datetime.utcnow)
+class ContentItem(Base):
+    """An item scraped from any configured source (see app.scrapers.registry).
 
+    `content` is the text that gets digested: the transcript or page markdown
+    for sources that fetch it after scraping, the feed description otherwise.
+    """
 
-class OpenAIArticle(Base):
-    __tablename__ = "openai_articles"
+    __tablename__ = "content_items"
 
-    guid = Column(String, primary_key=True)
+    source = Column(String, primary_key=True)
+    external_id = Column(String, primary_key=True)  # Digest.id is "{source}:{external_id}"
     title = Column(String, nullable=False)
     url = Column(String, nullable=False)
     description = Column(Text)
     published_at = Column(DateTime, nullable=False)
     category = Column(String, nullable=True)
+    extra = Column(JSON, nullable=True)  # Source-specific metadata, e.g. {"channel_id": ...}
+    content = Column(CompressedText, nullable=True, default=None)
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
-class AnthropicArticle(Base):
-    __tablename__ = "anthropic_articles"
+class SeenIdSet(Base):
+    """Sorted 64-bit hashes of every external_id stored for a source (see app.scrapers.seen_ids)."""
 
-    guid = Column(String, primary_key=True)
-    title = Column(String, nullable=False)
-    url = Column(String, nullable=False)
-    description = Column(Text)
-    published_at = Column(DateTime, nullable=False)
-    category = Column(String, nullable=True)
-    markdown = Column(Text, nullable=True)
+    __tablename__ = "seen_ids"
+
+    source = Column(String, primary_key=True)
+    hashes = Column(LargeBinary, nullable=False)  # Little-endian uint64s, ascending
+    count = Column(Integer, nullable=False)
+    rebuilt_at = Column(DateTime, nullable=False)  # Last full rebuild from content_items
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class TranscriptSegmentSet(Base):
+    """Segment timing of a transcript stored in `ContentItem.content` (see app.scrapers.transcripts)."""
+
+    __tablename__ = "transcript_segments"
+
+    source = Column(String, primary_key=True)
+    external_id = Column(String, primary_key=True)
+    language = Column(String, nullable=True)
+    is_generated = Column(Boolean, nullable=True)
+    count = Column(Integer, nullable=False)
+    # Little-endian uint32 columns: starts and durations in ms, offsets into the content text
+    starts = Column(LargeBinary, nullable=False)
+    durations = Column(LargeBinary, nullable=False)
+    offsets = Column(LargeBinary, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class SchedulerRun(Base):
+    """Last scheduled run of a scheduler job (see app.scheduler), for catch-up after downtime."""
+
+    __tablename__ = "scheduler_runs"
+
+    job = Column(String, primary_key=True)
+    scheduled_at = Column(DateTime, nullable=False)  # Schedule slot of the last run, UTC
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    status = Column(String, nullable=False)  # "success", "failed" or "skipped" (slot missed beyond catch-up)
+    error = Column(Text, nullable=True)
+    last_success_at = Column(DateTime, nullable=True)  # Start of the last successful run
+
+
 class Digest(Base):
     __tablename__ = "digests"
+    __table_args__ = (
+        # Feed ordering (published_at DESC, id DESC) is served by a single index scan
+        Index("ix_digests_published_at_id", "published_at", "id"),
+    )
 
     id = Column(String, primary_key=True)
     article_type = Column(String, nullable=False)
@@ -54,4 +87,67 @@ class Digest(Base):
     url = Column(String, nullable=False)
     title = Column(String, nullable=False)
     summary = Column(Text, nullable=False)
+    published_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ContentFingerprint(Base):
+    """MinHash signature of a scraped item and the near-duplicate cluster it belongs to."""
+
+    __tablename__ = "content_fingerprints"
+
+    item_key = Column(String, primary_key=True)  # "{article_type}:{article_id}", same as Digest.id
+    article_type = Column(String, nullable=False)
+    article_id = Column(String, nullable=False)
+    signature = Column(LargeBinary, nullable=False)
+    cluster_id = Column(String, nullable=False, index=True)
+    # Digest.id of the cluster member digested instead of this item; set once that
+    # digest exists, which takes the item out of the pending queue
+    duplicate_of = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class FingerprintBand(Base):
+    """LSH band bucket; items sharing a band_key are near-duplicate candidates."""
+
+    __tablename__ = "fingerprint_bands"
+
+    band_key = Column(String, primary_key=True)
+    item_key = Column(String, primary_key=True)
+
+
+class Subscriber(Base):
+    """Digest recipient and the interest profile their digest is ranked against."""
+
+    __tablename__ = "subscribers"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    email = Column(String, nullable=False, unique=True)
+    name = Column(String, nullable=False)
+    profile = Column(JSON, nullable=False)
+    # Subscribers with the same interests share one ranking (see app.profiles.subscribers.profile_hash)
+    profile_hash = Column(String, nullable=False, index=True)
+    active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ArchivedContent(Base):
+    """Raw content moved out of `content_items` once digested.
+
+    `ContentItem.content` keeps `ARCHIVED_MARKER` (see `app.database.repository`)
+    so the item is not picked up as pending work again.
+    """
+
+    __tablename__ = "archived_content"
+
+    item_key = Column(String, primary_key=True)  # "{article_type}:{article_id}", same as Digest.id
+    article_type = Column(String, nullable=False)
+    article_id = Column(String, nullable=False)
+    payload = Column(LargeBinary, nullable=False)  # zstd-compressed UTF-8 (app.database.compression)
+    raw_bytes = Column(Integer, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+# Full-text search column/table is dialect-specific, so it is created alongside the table
+event.listen(Digest.__table__, "after_create", install_search_index)
+event.listen(Digest.__table__, "before_drop", drop_search_index)
@@ -1,171 +1,245 @@
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Sequence, Set, Tuple
 
+from sqlalchemy import bindparam, delete, func, insert, select, update
 from sqlalchemy.orm import Session
 
-from .models import YouTubeVideo, OpenAIArticle, AnthropicArticle, Digest
+from .models import (
+    ContentItem,
+    Digest,
+    ContentFingerprint,
+    FingerprintBand,
+    Subscriber,
+    ArchivedContent,
+    SchedulerRun,
+    SeenIdSet,
+    TranscriptSegmentSet,
+)
 from .connection import get_session
+from .instrumentation import traced_operations
+from .search import build_search_query
 
+# Keys per IN (...) lookup; stays well under SQLite's bound-parameter limit
+EXISTING_KEYS_CHUNK = 500
 
-class Repository:
-    def __init__(self, session: Optional[Session] = None):
-        self.session = session if session is not None else get_session()
+# LSH band keys per IN (...) lookup: a scraped batch has 32 per item, so a 1000-item
+# batch takes a few statements; under the 32766 parameters of SQLite >= 3.32
+BAND_KEYS_CHUNK = 10000
 
-    # YouTube Methods
-    def create_youtube_video(
-        self,
-        video_id: str,
-        title: str,
-        url: str,
-        channel_id: str,
-        published_at: datetime,
-        description: Optional[str] = None,
-        transcript: Optional[str] = None,
-    ) -> YouTubeVideo:
-        """Create a YouTube video record if it doesn't exist."""
-        existing = self.session.query(YouTubeVideo).filter_by(video_id=video_id).first()
-        if existing:
-            return existing
+# Rows per executemany UPDATE, each chunk committed in its own transaction
+UPDATE_CHUNK = 500
 
-        video = YouTubeVideo(
-            video_id=video_id,
-            title=title,
-            url=url,
-            channel_id=channel_id,
-            published_at=published_at,
-            description=description,
-            transcript=transcript,
-        )
-        self.session.add(video)
-        self.session.commit()
-        return video
-
-    def bulk_create_youtube_videos(self, videos: List[dict]) -> int:
-        """Bulk create YouTube videos, checking existence for each."""
-        added_count = 0
-        for video_data in videos:
-            video_id = video_data.get("video_id")
-            existing = self.session.query(YouTubeVideo).filter_by(video_id=video_id).first()
-            if not existing:
-                video = YouTubeVideo(**video_data)
-                self.session.add(video)
-                added_count += 1
+# Stored in place of content moved to `archived_content`
+ARCHIVED_MARKER = "__ARCHIVED__"
 
-        self.session.commit()
-        return added_count
+# Stored when a source cannot provide an item's content, so it is not retried
+UNAVAILABLE_MARKER = "__UNAVAILABLE__"
 
-    def get_youtube_videos_without_transcript(self, limit: Optional[int] = None) -> List[YouTubeVideo]:
-        """Fetch YouTube videos that don't have a transcript."""
-        query = self.session.query(YouTubeVideo).filter(YouTubeVideo.transcript.is_(None))
-        if limit:
-            query = query.limit(limit)
-        return query.all()
+# Digest fields the curator and email ranking read (see get_recent_digests)
+DIGEST_CANDIDATE_COLUMNS = ("id", "title", "summary", "article_type", "url")
 
-    def update_youtube_video_transcript(self, video_id: str, transcript: str) -> None:
-        """Update the transcript for a YouTube video."""
-        video = self.session.query(YouTubeVideo).filter_by(video_id=video_id).first()
-        if video:
-            video.transcript = transcript
-            self.session.commit()
 
-    # OpenAI Methods
-    def create_openai_article(
-        self,
-        guid: str,
-        title: str,
-        url: str,
-        published_at: datetime,
-        description: Optional[str] = None,
-        category: Optional[str] = None,
-    ) -> OpenAIArticle:
-        """Create an OpenAI article record if it doesn't exist."""
-        existing = self.session.query(OpenAIArticle).filter_by(guid=guid).first()
-        if existing:
-            return existing
+def _entities(model, columns: Optional[Sequence[str]]) -> list:
+    """Query the full ORM entity, or only the named columns when given.
 
-        article = OpenAIArticle(
-            guid=guid,
-            title=title,
-            url=url,
-            published_at=published_at,
-            description=description,
-            category=category,
-        )
-        self.session.add(article)
-        self.session.commit()
-        return article
-
-    def bulk_create_openai_articles(self, articles: List[dict]) -> int:
-        """Bulk create OpenAI articles, checking existence for each."""
-        added_count = 0
-        for article_data in articles:
-            guid = article_data.get("guid")
-            existing = self.session.query(OpenAIArticle).filter_by(guid=guid).first()
-            if not existing:
-                article = OpenAIArticle(**article_data)
-                self.session.add(article)
-                added_count += 1
+    Column queries return lightweight rows with attribute access (`row.external_id`),
+    skipping identity-map bookkeeping and the heavy text columns a caller
+    does not read.
+    """
+    return [getattr(model, name) for name in columns] if columns else [model]
 
-        self.session.commit()
-        return added_count
 
-    # Anthropic Methods
-    def create_anthropic_article(
+@traced_operations
+class Repository:
+    def __init__(self, session: Optional[Session] = None):
+        self.session = session if session is not None else get_session()
+
+    def _existing_external_ids(self, source: str, external_ids: List[str]) -> Set[str]:
+        """Return which of `external_ids` are stored for `source`, using chunked IN queries."""
+        existing = set()
+        for start in range(0, len(external_ids), EXISTING_KEYS_CHUNK):
+            chunk = external_ids[start : start + EXISTING_KEYS_CHUNK]
+            existing.update(
+                self.session.execute(
+                    select(ContentItem.external_id).where(
+                        ContentItem.source == source, ContentItem.external_id.in_(chunk)
+                    )
+                ).scalars()
+            )
+        return existing
+
+    # Content Item Methods
+    def create_content_item(
         self,
-        guid: str,
+        source: str,
+        external_id: str,
         title: str,
         url: str,
         published_at: datetime,
         description: Optional[str] = None,
         category: Optional[str] = None,
-        markdown: Optional[str] = None,
-    ) -> AnthropicArticle:
-        """Create an Anthropic article record if it doesn't exist."""
-        existing = self.session.query(AnthropicArticle).filter_by(guid=guid).first()
+        extra: Optional[dict] = None,
+        content: Optional[str] = None,
+    ) -> ContentItem:
+        """Create a content item if it doesn't exist."""
+        existing = self.session.get(ContentItem, (source, external_id))
         if existing:
             return existing
 
-        article = AnthropicArticle(
-            guid=guid,
+        item = ContentItem(
+            source=source,
+            external_id=external_id,
             title=title,
             url=url,
             published_at=published_at,
             description=description,
             category=category,
-            markdown=markdown,
+            extra=extra,
+            content=content,
         )
-        self.session.add(article)
+        self.session.add(item)
         self.session.commit()
-        return article
-
-    def bulk_create_anthropic_articles(self, articles: List[dict]) -> int:
-        """Bulk create Anthropic articles, checking existence for each."""
-        added_count = 0
-        for article_data in articles:
-            guid = article_data.get("guid")
-            existing = self.session.query(AnthropicArticle).filter_by(guid=guid).first()
-            if not existing:
-                article = AnthropicArticle(**article_data)
-                self.session.add(article)
-                added_count += 1
+        return item
 
-        self.session.commit()
-        return added_count
+    def bulk_create_content_items(self, source: str, items: List[dict]) -> int:
+        """Insert the items not stored yet for `source`, in one batched INSERT.
+
+        Existing ids are looked up with chunked IN queries rather than one
+        query per row; items repeating an id within the batch are dropped too.
 
-    def get_anthropic_articles_without_markdown(self, limit: Optional[int] = None) -> List[AnthropicArticle]:
-        """Fetch Anthropic articles that don't have markdown."""
-        query = self.session.query(AnthropicArticle).filter(AnthropicArticle.markdown.is_(None))
+        Args:
+            source: Source name the items belong to
+            items: Rows as built by `ScrapedItem.to_row`, keyed by external_id
+
+        Returns:
+            Number of items inserted
+        """
+        existing = self._existing_external_ids(source, list(dict.fromkeys(item["external_id"] for item in items)))
+
+        new_rows = {}
+        for item in items:
+            if item["external_id"] not in existing:
+                new_rows.setdefault(item["external_id"], {**item, "source": source})
+        if new_rows:
+            self.session.execute(insert(ContentItem), list(new_rows.values()))
+        self.session.commit()
+        return len(new_rows)
+
+    def get_items_without_content(
+        self, source: str, limit: Optional[int] = None, columns: Optional[Sequence[str]] = None
+    ) -> List[ContentItem]:
+        """Fetch items of `source` whose content has not been fetched yet.
+
+        Args:
+            source: Source name
+            limit: Maximum number of items
+            columns: Return rows of only these columns instead of ORM objects
+        """
+        query = self.session.query(*_entities(ContentItem, columns)).filter(
+            ContentItem.source == source, ContentItem.content.is_(None)
+        )
         if limit:
             query = query.limit(limit)
         return query.all()
 
-    def update_anthropic_article_markdown(self, guid: str, markdown: str) -> None:
-        """Update the markdown for an Anthropic article."""
-        article = self.session.query(AnthropicArticle).filter_by(guid=guid).first()
-        if article:
-            article.markdown = markdown
+    def update_item_content(self, source: str, external_id: str, content: str) -> None:
+        """Update the content of one item."""
+        item = self.session.get(ContentItem, (source, external_id))
+        if item:
+            item.content = content
             self.session.commit()
 
+    def bulk_update_content(self, source: str, contents: Dict[str, str]) -> None:
+        """Set content for many items of one source with chunked executemany UPDATEs.
+
+        Each chunk is one statement and one commit, instead of a SELECT and a
+        commit per row. Ids with no stored item are skipped.
+
+        Args:
+            source: Source name
+            contents: Content (or a marker) by external_id
+        """
+        table = ContentItem.__table__
+        statement = (
+            update(table)
+            .where(table.c.source == source, table.c.external_id == bindparam("_external_id"))
+            .values(content=bindparam("_content"))
+        )
+        items = list(contents.items())
+        for start in range(0, len(items), UPDATE_CHUNK):
+            chunk = items[start : start + UPDATE_CHUNK]
+            self.session.execute(statement, [{"_external_id": k, "_content": v} for k, v in chunk])
+            self.session.commit()
+
+    # Transcript Segment Methods
+    def bulk_save_transcript_segments(self, source: str, segments: Dict[str, dict]) -> None:
+        """Insert or replace the segment timing of many transcripts of one source.
+
+        Args:
+            source: Source name
+            segments: Packed columns (`TranscriptSegments.to_row()`) by external_id
+        """
+        table = TranscriptSegmentSet.__table__
+        rows = [{"source": source, "external_id": external_id, **row} for external_id, row in segments.items()]
+        for start in range(0, len(rows), UPDATE_CHUNK):
+            chunk = rows[start : start + UPDATE_CHUNK]
+            self.session.execute(
+                delete(table).where(
+                    table.c.source == source, table.c.external_id.in_([row["external_id"] for row in chunk])
+                )
+            )
+            self.session.execute(insert(table), chunk)
+            self.session.commit()
+
+    def get_transcript_segments(self, source: str, external_id: str) -> Optional[TranscriptSegmentSet]:
+        """Fetch the stored segment timing of one transcript, if any."""
+        return self.session.get(TranscriptSegmentSet, (source, external_id))
+
+    # Seen Id Methods
+    def iter_external_ids(self, source: str, batch_size: int = 10000) -> Iterator[str]:
+        """Stream every stored external_id of `source` without loading rows."""
+        yield from self.session.execute(
+            select(ContentItem.external_id)
+            .where(ContentItem.source == source)
+            .execution_options(yield_per=batch_size)
+        ).scalars()
+
+    def get_seen_ids(self, source: str) -> Optional[SeenIdSet]:
+        """Fetch the persisted seen-id hashes of `source`, if any."""
+        return self.session.get(SeenIdSet, source)
+
+    def save_seen_ids(self, source: str, hashes: bytes, count: int, rebuilt_at: datetime) -> None:
+        """Insert or replace the seen-id hashes of `source`."""
+        self.session.merge(SeenIdSet(source=source, hashes=hashes, count=count, rebuilt_at=rebuilt_at))
+        self.session.commit()
+
+    # Scheduler Methods
+    def get_scheduler_runs(self) -> Dict[str, SchedulerRun]:
+        """Fetch the last run of every scheduler job, by job name."""
+        return {run.job: run for run in self.session.query(SchedulerRun).all()}
+
+    def record_scheduler_run(
+        self,
+        job: str,
+        scheduled_at: datetime,
+        status: str,
+        started_at: Optional[datetime] = None,
+        finished_at: Optional[datetime] = None,
+        error: Optional[str] = None,
+    ) -> SchedulerRun:
+        """Insert or replace the last run of a scheduler job."""
+        run = self.session.get(SchedulerRun, job) or SchedulerRun(job=job)
+        run.scheduled_at = scheduled_at
+        run.status = status
+        run.started_at = started_at
+        run.finished_at = finished_at
+        run.error = error
+        if status == "success":
+            run.last_success_at = started_at
+        self.session.add(run)
+        self.session.commit()
+        return run
+
     # Digest Methods
     def create_digest(
         self,
@@ -194,88 +268,330 @@ class Repository:
             url=url,
             title=title,
             summary=summary,
+            published_at=published_at,
         )
         self.session.add(digest)
         self.session.commit()
         return digest
 
     def get_articles_without_digest(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Return unified list of content (Videos + Articles) that haven't been summarized yet."""
-        # Fetch all existing Digest entries and build a set of seen IDs
-        existing_digests = self.session.query(Digest).all()
-        seen_ids = {digest.id for digest in existing_digests}
-
-        # Fetch valid YouTube videos (has transcript AND transcript != "__UNAVAILABLE__")
-        youtube_videos = self.session.query(YouTubeVideo).filter(
-            YouTubeVideo.transcript.isnot(None),
-            YouTubeVideo.transcript != "__UNAVAILABLE__",
-        ).all()
+        """Return items of every source that have content but no digest yet, oldest first.
+
+        Near-duplicates already linked to a digested representative are not pending.
+        """
+        item_key = ContentItem.source + ":" + ContentItem.external_id
+        digested = select(Digest.id).where(Digest.id == item_key)
+        duplicate = select(ContentFingerprint.item_key).where(
+            ContentFingerprint.item_key == item_key, ContentFingerprint.duplicate_of.isnot(None)
+        )
+        query = (
+            select(
+                ContentItem.source,
+                ContentItem.external_id,
+                ContentItem.title,
+                ContentItem.url,
+                ContentItem.content,
+                ContentItem.published_at,
+            )
+            .where(
+                ContentItem.content.isnot(None),
+                ContentItem.content.notin_([UNAVAILABLE_MARKER, ARCHIVED_MARKER]),
+                ~digested.exists(),
+                ~duplicate.exists(),
+            )
+            .order_by(ContentItem.published_at, ContentItem.source, ContentItem.external_id)
+            .limit(limit)
+        )
+        return [
+            {
+                "type": row.source,
+                "id": row.external_id,
+                "title": row.title,
+                "url": row.url,
+                "content": row.content,
+                "published_at": row.published_at,
+            }
+            for row in self.session.execute(query)
+        ]
+
+    def get_recent_digests(self, hours: int = 24, columns: Optional[Sequence[str]] = None) -> List[Digest]:
+        """Return digests created in the last X hours, ordered by newest first.
+
+        Args:
+            hours: Look-back window
+            columns: Return rows of only these columns instead of ORM objects
+                (e.g. DIGEST_CANDIDATE_COLUMNS, or ("id",))
+        """
+        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        return (
+            self.session.query(*_entities(Digest, columns))
+            .filter(Digest.created_at >= cutoff_time)
+            .order_by(Digest.created_at.desc())
+            .all()
+        )
+
+    def get_latest_digests(
+        self, limit: Optional[int] = 50, offset: int = 0, columns: Optional[Sequence[str]] = None
+    ) -> List[Digest]:
+        """Return digests ordered by publication time, newest first.
 
-        # Fetch OpenAI articles
-        openai_articles = self.session.query(OpenAIArticle).all()
+        Args:
+            limit: Maximum number of digests (None for all)
+            offset: Number of digests to skip
+            columns: Return rows of only these columns instead of ORM objects
+        """
+        return (
+            self.session.query(*_entities(Digest, columns))
+            .order_by(Digest.published_at.desc(), Digest.id.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
 
-        # Fetch Anthropic articles (must have markdown)
-        anthropic_articles = self.session.query(AnthropicArticle).filter(
-            AnthropicArticle.markdown.isnot(None)
+    def get_digests_by_ids(self, digest_ids: List[str], columns: Optional[Sequence[str]] = None) -> List[Digest]:
+        """Fetch digests by id, in no particular order.
+
+        Args:
+            digest_ids: Digest ids to fetch
+            columns: Return rows of only these columns instead of ORM objects
+        """
+        if not digest_ids:
+            return []
+        return self.session.query(*_entities(Digest, columns)).filter(Digest.id.in_(digest_ids)).all()
+
+    def search_digests(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[List[Tuple[Digest, float]], int]:
+        """Full-text search over digest titles and summaries.
+
+        Returns:
+            Tuple of ((digest, rank) pairs ordered by relevance, total number of matches)
+        """
+        statement, count = build_search_query(self.session.get_bind().dialect.name, query, limit, offset)
+        results = [(digest, rank) for digest, rank in self.session.execute(statement).all()]
+        total = self.session.execute(count).scalar_one()
+        return results, total
+
+    # Near-duplicate Methods
+    def get_fingerprints(self, item_keys: List[str]) -> List[ContentFingerprint]:
+        """Fetch fingerprints for the given item keys, using chunked IN queries."""
+        fingerprints = []
+        for start in range(0, len(item_keys), EXISTING_KEYS_CHUNK):
+            chunk = item_keys[start : start + EXISTING_KEYS_CHUNK]
+            fingerprints.extend(
+                self.session.query(ContentFingerprint).filter(ContentFingerprint.item_key.in_(chunk)).all()
+            )
+        return fingerprints
+
+    def get_band_members(self, band_keys: List[str]) -> Dict[str, List[str]]:
+        """Map LSH band bucket keys to the item keys stored in them, using chunked IN queries."""
+        members: Dict[str, List[str]] = {}
+        for start in range(0, len(band_keys), BAND_KEYS_CHUNK):
+            chunk = band_keys[start : start + BAND_KEYS_CHUNK]
+            rows = self.session.execute(
+                select(FingerprintBand.band_key, FingerprintBand.item_key).where(FingerprintBand.band_key.in_(chunk))
+            )
+            for band_key, item_key in rows:
+                members.setdefault(band_key, []).append(item_key)
+        return members
+
+    def bulk_create_fingerprints(self, fingerprints: List[Dict[str, Any]]) -> None:
+        """Insert fingerprints and their band buckets with one executemany per table (committed by the caller).
+
+        Args:
+            fingerprints: content_fingerprints rows, each with its "band_keys" list too
+        """
+        if not fingerprints:
+            return
+        bands = [
+            {"band_key": key, "item_key": row["item_key"]} for row in fingerprints for key in set(row["band_keys"])
+        ]
+        self.session.execute(
+            insert(ContentFingerprint), [{k: v for k, v in row.items() if k != "band_keys"} for row in fingerprints]
+        )
+        self.session.execute(insert(FingerprintBand), bands)
+
+    def get_cluster_ids(self, item_keys: List[str]) -> Dict[str, str]:
+        """Map item keys to their near-duplicate cluster id."""
+        return {fingerprint.item_key: fingerprint.cluster_id for fingerprint in self.get_fingerprints(item_keys)}
+
+    def assign_cluster(self, item_key: str, cluster_id: str) -> None:
+        """Move an item into another near-duplicate cluster (flushed, committed by the caller)."""
+        self.session.query(ContentFingerprint).filter_by(item_key=item_key).update({"cluster_id": cluster_id})
+        self.session.flush()
+
+    def get_cluster_digests(self, cluster_ids: Set[str]) -> Dict[str, str]:
+        """Map the clusters that already have a digest to the Digest.id of one digested member."""
+        if not cluster_ids:
+            return {}
+        rows = (
+            self.session.query(ContentFingerprint.cluster_id, func.min(Digest.id).label("digest_id"))
+            .join(Digest, Digest.id == ContentFingerprint.item_key)
+            .filter(ContentFingerprint.cluster_id.in_(cluster_ids))
+            .group_by(ContentFingerprint.cluster_id)
+            .all()
+        )
+        return {row.cluster_id: row.digest_id for row in rows}
+
+    def mark_duplicates(self, links: Dict[str, str]) -> None:
+        """Link skipped near-duplicates to the Digest.id digested in their place (flushed, committed by the caller)."""
+        if not links:
+            return
+        self.session.execute(
+            update(ContentFingerprint),
+            [{"item_key": item_key, "duplicate_of": digest_id} for item_key, digest_id in links.items()],
+        )
+        self.session.flush()
+
+    def get_linked_sources(self, item_keys: List[str]) -> Dict[str, List[Any]]:
+        """Return the other stored items in the near-duplicate cluster of each item key.
+
+        Returns:
+            Lists of (item_key, source, title, url) rows by item key, oldest first;
+            keys without linked items are left out
+        """
+        if not item_keys:
+            return {}
+        clusters = self.get_cluster_ids(item_keys)
+        if not clusters:
+            return {}
+        rows = self.session.execute(
+            select(
+                ContentFingerprint.item_key,
+                ContentFingerprint.cluster_id,
+                ContentItem.source,
+                ContentItem.title,
+                ContentItem.url,
+            )
+            .join(
+                ContentItem,
+                (ContentItem.source == ContentFingerprint.article_type)
+                & (ContentItem.external_id == ContentFingerprint.article_id),
+            )
+            .where(ContentFingerprint.cluster_id.in_(set(clusters.values())))
+            .order_by(ContentItem.published_at, ContentFingerprint.item_key)
         ).all()
+        by_cluster: Dict[str, List[Any]] = {}
+        for row in rows:
+            by_cluster.setdefault(row.cluster_id, []).append(row)
+        linked: Dict[str, List[Any]] = {}
+        for item_key, cluster_id in clusters.items():
+            members = [row for row in by_cluster.get(cluster_id, []) if row.item_key != item_key]
+            if members:
+                linked[item_key] = members
+        return linked
+
+    # Subscriber Methods
+
+    def upsert_subscriber(self, email: str, name: str, profile: dict, profile_hash: str, active: bool = True) -> Subscriber:
+        """Create a subscriber or update the profile of an existing one."""
+        subscriber = self.session.query(Subscriber).filter_by(email=email).first()
+        if subscriber is None:
+            subscriber = Subscriber(email=email)
+            self.session.add(subscriber)
+        subscriber.name = name
+        subscriber.profile = profile
+        subscriber.profile_hash = profile_hash
+        subscriber.active = active
+        self.session.commit()
+        return subscriber
 
-        # Normalize output into dictionaries
-        results = []
-
-        for video in youtube_videos:
-            video_id = f"youtube:{video.video_id}"
-            if video_id not in seen_ids:
-                results.append(
-                    {
-                        "type": "youtube",
-                        "id": video.video_id,
-                        "title": video.title,
-                        "url": video.url,
-                        "content": video.transcript,
-                        "published_at": video.published_at,
-                    }
-                )
+    def get_active_subscribers(self) -> List[Subscriber]:
+        """Return active subscribers grouped by profile hash."""
+        return (
+            self.session.query(Subscriber)
+            .filter(Subscriber.active.is_(True))
+            .order_by(Subscriber.profile_hash, Subscriber.id)
+            .all()
+        )
 
-        for article in openai_articles:
-            article_id = f"openai:{article.guid}"
-            if article_id not in seen_ids:
-                results.append(
-                    {
-                        "type": "openai",
-                        "id": article.guid,
-                        "title": article.title,
-                        "url": article.url,
-                        "content": article.description,
-                        "published_at": article.published_at,
-                    }
-                )
+    def count_subscribers(self) -> int:
+        """Return the number of subscribers, active or not."""
+        return self.session.query(Subscriber).count()
 
-        for article in anthropic_articles:
-            article_id = f"anthropic:{article.guid}"
-            if article_id not in seen_ids:
-                results.append(
-                    {
-                        "type": "anthropic",
-                        "id": article.guid,
-                        "title": article.title,
-                        "url": article.url,
-                        "content": article.markdown,
-                        "published_at": article.published_at,
-                    }
-                )
+    # Archive Methods
+    def get_content_sources(self) -> List[str]:
+        """Return the names of all sources with stored items."""
+        return list(self.session.execute(select(ContentItem.source).distinct().order_by(ContentItem.source)).scalars())
 
-        # Apply limit if provided
-        if limit:
-            results = results[:limit]
+    def get_archivable_content(self, source: str, cutoff: datetime, limit: int) -> List[Tuple[str, str]]:
+        """Return (external_id, content) of items of `source` stored before `cutoff` that are done with.
 
-        return results
+        Items are done with once digested, or once linked to the digest of a near-duplicate.
+        """
+        item_key = f"{source}:" + ContentItem.external_id
+        digested = select(Digest.id).where(Digest.id == item_key)
+        duplicate = select(ContentFingerprint.item_key).where(
+            ContentFingerprint.item_key == item_key, ContentFingerprint.duplicate_of.isnot(None)
+        )
+        return [
+            (row[0], row[1])
+            for row in self.session.execute(
+                select(ContentItem.external_id, ContentItem.content)
+                .where(
+                    digested.exists() | duplicate.exists(),
+                    ContentItem.source == source,
+                    ContentItem.created_at < cutoff,
+                    ContentItem.content.isnot(None),
+                    ContentItem.content.notin_([ARCHIVED_MARKER, UNAVAILABLE_MARKER]),
+                )
+                .order_by(ContentItem.created_at)
+                .limit(limit)
+            )
+        ]
+
+    def archive_content(self, source: str, entries: List[dict]) -> None:
+        """Store compressed content and replace it with `ARCHIVED_MARKER` in `content_items`.
+
+        Args:
+            source: Source name of the items
+            entries: Dicts with external_id, payload (compressed bytes) and raw_bytes
+        """
+        if not entries:
+            return
+        self.session.execute(
+            insert(ArchivedContent),
+            [
+                {
+                    "item_key": f"{source}:{entry['external_id']}",
+                    "article_type": source,
+                    "article_id": entry["external_id"],
+                    "payload": entry["payload"],
+                    "raw_bytes": entry["raw_bytes"],
+                }
+                for entry in entries
+            ],
+        )
+        self.session.execute(
+            update(ContentItem),
+            [
+                {"source": source, "external_id": entry["external_id"], "content": ARCHIVED_MARKER}
+                for entry in entries
+            ],
+        )
+        self.session.commit()
 
-    def get_recent_digests(self, hours: int = 24) -> List[Digest]:
-        """Return digests created in the last X hours, ordered by newest first."""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        return (
-            self.session.query(Digest)
-            .filter(Digest.created_at >= cutoff_time)
-            .order_by(Digest.created_at.desc())
-            .all()
+    def get_archived_content(self, item_keys: List[str]) -> List[ArchivedContent]:
+        """Fetch archive rows by item key ("{source}:{external_id}")."""
+        if not item_keys:
+            return []
+        return self.session.query(ArchivedContent).filter(ArchivedContent.item_key.in_(item_keys)).all()
+
+    def restore_content(self, archived: ArchivedContent, content: str) -> None:
+        """Put decompressed content back into `content_items` and drop the archive row."""
+        self.session.execute(
+            update(ContentItem)
+            .where(ContentItem.source == archived.article_type, ContentItem.external_id == archived.article_id)
+            .values(content=content)
         )
+        self.session.execute(delete(ArchivedContent).where(ArchivedContent.item_key == archived.item_key))
+        self.session.commit()
+
+    def get_archive_stats(self) -> Dict[str, int]:
+        """Return the number of archived items and their raw and compressed sizes."""
+        count, raw_bytes, stored_bytes = self.session.execute(
+            select(
+                func.count(ArchivedContent.item_key),
+                func.coalesce(func.sum(ArchivedContent.raw_bytes), 0),
+                func.coalesce(func.sum(func.length(ArchivedContent.payload)), 0),
+            )
+        ).one()
+        return {"items": count, "raw_bytes": raw_bytes, "stored_bytes": stored_bytes}
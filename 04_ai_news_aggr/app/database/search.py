@@ -0,0 +1,119 @@
+"""Full-text search over digest titles and summaries.
+
+Postgres keeps a generated `tsvector` column with a GIN index on `digests`;
+SQLite (tests, local runs) falls back to an FTS5 table synced by triggers.
+Either way the index is maintained row by row as digests are written, never
+rebuilt wholesale.
+"""
+import re
+from typing import Tuple
+
+from sqlalchemy import Select, column, false, func, literal_column, select, table, text
+
+POSTGRES_DDL = [
+    "ALTER TABLE digests ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(summary, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_digests_search_vector ON digests USING GIN (search_vector)",
+]
+
+# The FTS table stores the digest id rather than borrowing `digests.rowid`:
+# `digests` has a string primary key, so its rowids are not stable and VACUUM
+# may renumber them, which would point an external-content index at the wrong rows.
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS digests_fts USING fts5("
+    "digest_id UNINDEXED, title, summary, tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS digests_fts_ai AFTER INSERT ON digests BEGIN "
+    "INSERT INTO digests_fts(digest_id, title, summary) VALUES (new.id, new.title, new.summary); END",
+    "CREATE TRIGGER IF NOT EXISTS digests_fts_ad AFTER DELETE ON digests BEGIN "
+    "DELETE FROM digests_fts WHERE digest_id = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS digests_fts_au AFTER UPDATE OF id, title, summary ON digests BEGIN "
+    "DELETE FROM digests_fts WHERE digest_id = old.id; "
+    "INSERT INTO digests_fts(digest_id, title, summary) VALUES (new.id, new.title, new.summary); END",
+]
+
+SQLITE_TRIGGERS = ["digests_fts_ai", "digests_fts_ad", "digests_fts_au"]
+
+
+def install_search_index(target, connection, **kw) -> None:
+    """Create the search column/table and index for `digests` (idempotent).
+
+    Registered as an `after_create` listener on the digests table and also
+    called by `upgrade_schema` for databases created before search existed.
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRES_DDL:
+            connection.execute(text(statement))
+    elif dialect == "sqlite":
+        existing = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'digests_fts'")
+        ).scalar()
+        if existing is not None and "digest_id" not in existing:
+            # Earlier versions keyed the index on digests.rowid; replace it
+            for trigger in SQLITE_TRIGGERS:
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+            connection.execute(text("DROP TABLE digests_fts"))
+            existing = None
+        for statement in SQLITE_DDL:
+            connection.execute(text(statement))
+        if existing is None:
+            # One-off population for rows written before the index existed
+            connection.execute(
+                text("INSERT INTO digests_fts(digest_id, title, summary) SELECT id, title, summary FROM digests")
+            )
+
+
+def drop_search_index(target, connection, **kw) -> None:
+    """Drop the SQLite FTS table alongside `digests` (Postgres drops the column with the table)."""
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("DROP TABLE IF EXISTS digests_fts"))
+
+
+def to_fts5_query(query: str) -> str:
+    """Turn free text into an FTS5 query that ANDs quoted terms.
+
+    Quoting each word keeps user input from being parsed as FTS5 syntax.
+    """
+    terms = re.findall(r"\w+", query)
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def build_search_query(dialect: str, query: str, limit: int, offset: int) -> Tuple[Select, Select]:
+    """Build ranked, paginated search and total-count statements for digests.
+
+    Args:
+        dialect: Database dialect name ("postgresql" or "sqlite")
+        query: Free-text search query
+        limit: Maximum number of results
+        offset: Number of results to skip
+
+    Returns:
+        Tuple of (statement yielding (Digest, rank) rows, statement yielding the match count)
+    """
+    from .models import Digest
+
+    if dialect == "postgresql":
+        ts_query = func.websearch_to_tsquery(literal_column("'english'::regconfig"), query)
+        vector = literal_column("digests.search_vector")
+        matches = vector.op("@@")(ts_query)
+        rank = func.ts_rank_cd(vector, ts_query).label("rank")
+        statement = select(Digest, rank).where(matches)
+        count = select(func.count()).select_from(Digest).where(matches)
+    elif dialect == "sqlite":
+        fts_table = table("digests_fts", column("digest_id"))
+        fts = literal_column("digests_fts")
+        fts_query = to_fts5_query(query)
+        matches = fts.op("MATCH")(fts_query) if fts_query else false()
+        # bm25() is lower-is-better; negate so higher rank means more relevant
+        rank = (-func.bm25(fts)).label("rank")
+        join = fts_table.c.digest_id == Digest.id
+        statement = select(Digest, rank).join(fts_table, join).where(matches)
+        count = select(func.count()).select_from(Digest).join(fts_table, join).where(matches)
+    else:
+        raise ValueError(f"Full-text search is not supported on {dialect}")
+
+    statement = statement.order_by(rank.desc(), Digest.published_at.desc()).limit(limit).offset(offset)
+    return statement, count
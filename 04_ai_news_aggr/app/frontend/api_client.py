@@ -0,0 +1,83 @@
+"""HTTP client of the frontend for the digests API.
+
+Kept apart from main.py, which renders the Streamlit page on import, so the
+fetch, ETag revalidation and cursor logic can be imported without Streamlit.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Mapping, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ApiClient:
+    """Pooled API client that revalidates repeated requests by their ETag.
+
+    The last (ETag, payload) of up to `max_validated` distinct requests is
+    kept for revalidation, least recently used dropped first, so paging
+    through ever new cursors does not grow it without bound.
+
+    Args:
+        base_url: API root URL (a trailing slash is removed)
+        max_validated: Responses kept for revalidation
+        session: Session to send requests with (default: a new pooled one)
+    """
+
+    def __init__(self, base_url: str, max_validated: int = 256, session: Optional[requests.Session] = None):
+        self.base_url = base_url.rstrip("/")
+        self.max_validated = max_validated
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=10)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        self._validated: "OrderedDict[Tuple[str, tuple], Tuple[str, Tuple[Any, Mapping[str, str]]]]" = OrderedDict()
+        self._lock = threading.Lock()  # Streamlit reruns of every browser session share the client
+
+    def get_json(self, path: str, params: Mapping[str, Any], timeout: float = 10) -> Tuple[Any, Mapping[str, str]]:
+        """GET an API path, revalidating the previous response by its ETag.
+
+        A 304 Not Modified reuses the stored body, so an expired cache entry costs
+        one small request instead of a full page transfer.
+
+        Returns:
+            Tuple of (decoded JSON body, case-insensitive response headers)
+
+        Raises:
+            requests.RequestException: On connection errors and HTTP error statuses
+        """
+        key = (path, tuple(sorted(params.items())))
+        with self._lock:
+            stored = self._validated.get(key)
+        headers = {"If-None-Match": stored[0]} if stored else {}
+        response = self.session.get(f"{self.base_url}{path}", params=params, headers=headers, timeout=timeout)
+        if response.status_code == 304 and stored:
+            with self._lock:
+                if key in self._validated:
+                    self._validated.move_to_end(key)
+            return stored[1]
+        response.raise_for_status()
+        payload = (response.json(), response.headers)
+        if "ETag" in response.headers:
+            with self._lock:
+                self._validated[key] = (response.headers["ETag"], payload)
+                self._validated.move_to_end(key)
+                while len(self._validated) > self.max_validated:
+                    self._validated.popitem(last=False)
+        return payload
+
+    def fetch_digest_page(self, cursor: Optional[str], limit: int) -> Tuple[list, Optional[str]]:
+        """Fetch one page of digests.
+
+        Args:
+            cursor: Cursor of the page (None for the newest digests)
+            limit: Maximum number of digests on the page
+
+        Returns:
+            Tuple of (digests, cursor of the next page or None on the last page)
+        """
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        digests, headers = self.get_json("/digests", params)
+        return digests, headers.get("X-Next-Cursor")
@@ -1,17 +1,29 @@
 import os
 from datetime import datetime
+from typing import Optional, Tuple
 
 import streamlit as st
 import requests
 from requests.exceptions import ConnectionError
 from dotenv import load_dotenv
 
+from app.frontend.api_client import ApiClient
+
 # Load environment variables
 load_dotenv()
 
 # Configuration - Dynamic API URL with trailing slash removal
 API_URL = os.getenv("API_URL", "http://localhost:8000").rstrip("/")
 
+# Seconds a fetched page is reused before it is revalidated against the API's ETag
+CACHE_TTL_SECONDS = int(os.getenv("FRONTEND_CACHE_TTL", "30"))
+
+# Digests per "Load more" page
+PAGE_SIZE = int(os.getenv("FRONTEND_PAGE_SIZE", "20"))
+
+# Distinct page requests whose last response is kept for ETag revalidation
+MAX_VALIDATED_RESPONSES = int(os.getenv("FRONTEND_MAX_VALIDATED", "256"))
+
 # Page config
 st.set_page_config(
     page_title="AI News Aggregator",
@@ -20,6 +32,22 @@ st.set_page_config(
 )
 
 
+@st.cache_resource
+def get_api_client() -> ApiClient:
+    """Return one pooled API client, shared by every rerun and browser session.
+
+    Returns:
+        Client keeping connections to the API alive and validated pages for revalidation
+    """
+    return ApiClient(API_URL, max_validated=MAX_VALIDATED_RESPONSES)
+
+
+def get_http_session() -> requests.Session:
+    """Return the API client's pooled session."""
+    return get_api_client().session
+
+
+@st.cache_data(ttl=10, show_spinner=False)
 def check_backend_status() -> bool:
     """Check if the backend API is online.
 
@@ -27,7 +55,7 @@ def check_backend_status() -> bool:
         True if online, False otherwise
     """
     try:
-        response = requests.get(f"{API_URL}/health", timeout=5)
+        response = get_http_session().get(f"{API_URL}/health", timeout=5)
         return response.status_code == 200
     except ConnectionError:
         return False
@@ -39,7 +67,7 @@ def run_pipeline():
     """Trigger the pipeline to run in the background."""
     try:
         with st.spinner("🔄 Agents are working..."):
-            response = requests.post(
+            response = get_http_session().post(
                 f"{API_URL}/pipeline/run",
                 params={"hours": 24, "top_n": 10},
                 timeout=30,
@@ -55,33 +83,39 @@ def run_pipeline():
         st.error(f"❌ Error starting pipeline: {str(e)}")
 
 
-def fetch_digests(limit: int = 20) -> list:
-    """Fetch recent digests from the backend API.
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=MAX_VALIDATED_RESPONSES, show_spinner=False)
+def fetch_digest_page(cursor: Optional[str], limit: int = PAGE_SIZE) -> Tuple[list, Optional[str]]:
+    """Fetch one page of digests, cached for CACHE_TTL_SECONDS.
 
     Args:
+        cursor: Cursor of the page (None for the newest digests)
+        limit: Maximum number of digests on the page
+
+    Returns:
+        Tuple of (digests, cursor of the next page or None on the last page)
+    """
+    return get_api_client().fetch_digest_page(cursor, limit)
+
+
+def fetch_digests(cursor: Optional[str] = None, limit: int = PAGE_SIZE) -> Tuple[list, Optional[str]]:
+    """Fetch a page of digests from the backend API, reporting errors in the UI.
+
+    Args:
+        cursor: Cursor of the page (None for the newest digests)
         limit: Maximum number of digests to fetch
 
     Returns:
-        List of digest objects, or empty list on error
+        Tuple of (digests, next page cursor), or ([], None) on error
     """
     try:
-        response = requests.get(
-            f"{API_URL}/digests",
-            params={"limit": limit},
-            timeout=10,
-        )
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.error(f"❌ Failed to fetch digests: {response.status_code}")
-            return []
+        return fetch_digest_page(cursor, limit)
     except ConnectionError:
         st.error("❌ Cannot connect to backend API. Is it running?")
-        return []
+    except requests.HTTPError as e:
+        st.error(f"❌ Failed to fetch digests: {e.response.status_code}")
     except Exception as e:
         st.error(f"❌ Error fetching digests: {str(e)}")
-        return []
+    return [], None
 
 
 def format_date(date_str: str) -> str:
@@ -156,17 +190,30 @@ with col1:
     st.markdown("Stay updated with the latest AI news, research, and trends.")
 with col2:
     if st.button("🔄 Refresh Feed", use_container_width=True):
+        # Revalidate now rather than when the TTL expires; unchanged pages come back as 304s
+        fetch_digest_page.clear()
+        check_backend_status.clear()
         st.rerun()
 
 st.divider()
 
-# Fetch and display digests
-digests = fetch_digests(limit=20)
+# Fetch and display digests; each page's cursor comes from the page before it
+# in this run, so new digests shift the pages instead of leaving gaps
+if "pages_loaded" not in st.session_state:
+    st.session_state.pages_loaded = 1
+
+digests = []
+next_cursor = None
+for page in range(st.session_state.pages_loaded):
+    page_digests, next_cursor = fetch_digests(next_cursor)
+    digests.extend(page_digests)
+    if next_cursor is None:
+        break
 
 if not digests:
     st.info("📭 No digests available yet. Run the pipeline to get started!")
 else:
-    st.markdown(f"**Found {len(digests)} articles**")
+    st.markdown(f"**Showing {len(digests)} articles**")
     st.divider()
 
     for idx, digest in enumerate(digests, 1):
@@ -193,3 +240,8 @@ else:
             # Article type label
             article_type = digest.get("article_type", "unknown").upper()
             st.caption(f"Source: {article_type}")
+
+    if next_cursor is not None:
+        if st.button("⬇️ Load more", use_container_width=True):
+            st.session_state.pages_loaded += 1
+            st.rerun()
@@ -0,0 +1,91 @@
+"""Subscriber profiles stored in the database.
+
+Ranking cost scales with the number of distinct interest profiles, not
+recipients: subscribers whose profiles hash the same share one curator call.
+The hash ignores the name, so the shared ranking and introduction are built
+from `ranking_profile` and the name is only added to each recipient's greeting.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.database.repository import Repository
+from app.profiles.user_profile import USER_PROFILE
+
+# Profile keys that do not affect ranking
+_PERSONAL_KEYS = {"name"}
+
+
+def ranking_profile(profile: dict) -> dict:
+    """Return the ranking-relevant part of a profile, shared by every subscriber with its hash."""
+    return {key: value for key, value in profile.items() if key not in _PERSONAL_KEYS}
+
+
+def profile_hash(profile: dict) -> str:
+    """Return a stable hash of the ranking-relevant part of a profile."""
+    canonical = json.dumps(ranking_profile(profile), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def default_recipients() -> List[str]:
+    """Recipients for the built-in profile: EMAIL_RECIPIENTS, falling back to MY_EMAIL."""
+    recipients = [r.strip() for r in os.getenv("EMAIL_RECIPIENTS", "").split(",") if r.strip()]
+    if not recipients and os.getenv("MY_EMAIL"):
+        recipients = [os.getenv("MY_EMAIL")]
+    return recipients
+
+
+def seed_default_subscribers(repo: Repository) -> int:
+    """Subscribe the default recipients to USER_PROFILE if no subscribers exist yet.
+
+    Returns:
+        Number of subscribers created
+    """
+    if repo.count_subscribers():
+        return 0
+    recipients = default_recipients()
+    for email in recipients:
+        repo.upsert_subscriber(
+            email=email,
+            name=USER_PROFILE.get("name", "there"),
+            profile=USER_PROFILE,
+            profile_hash=profile_hash(USER_PROFILE),
+        )
+    return len(recipients)
+
+
+def add_subscriber(repo: Repository, email: str, profile: dict, name: str = None) -> None:
+    """Add or update a subscriber from a profile dictionary."""
+    name = name or profile.get("name", "there")
+    repo.upsert_subscriber(email=email, name=name, profile=profile, profile_hash=profile_hash(profile))
+
+
+if __name__ == "__main__":
+    from app.database.connection import session_scope
+
+    parser = argparse.ArgumentParser(description="Manage digest subscribers")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Add or update a subscriber")
+    add.add_argument("email")
+    add.add_argument("--profile", type=Path, help="JSON profile file (default: USER_PROFILE)")
+    add.add_argument("--name", help="Name used in the greeting (default: the profile's name)")
+    commands.add_parser("list", help="List active subscribers")
+    args = parser.parse_args()
+
+    with session_scope() as session:
+        repo = Repository(session=session)
+        if args.command == "add":
+            profile = json.loads(args.profile.read_text()) if args.profile else USER_PROFILE
+            add_subscriber(repo, args.email, profile, name=args.name)
+            print(f"Subscribed {args.email}")
+        else:
+            for subscriber in repo.get_active_subscribers():
+                print(f"{subscriber.email}\t{subscriber.name}\t{subscriber.profile_hash}")
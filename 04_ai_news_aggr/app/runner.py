@@ -1,94 +1,61 @@
-from typing import List
+import logging
+from typing import Dict, List, Optional
 
-from app.config import YOUTUBE_CHANNELS
-from app.scrapers.youtube import YouTubeScraper
-from app.scrapers.openai import OpenAIScraper
-from app.scrapers.anthropic import AnthropicScraper
+from app.scrapers.registry import ScrapedItem, Source, load_sources
+from app.scrapers.seen_ids import SeenIds
+from app.database.connection import session_scope
 from app.database.repository import Repository
+from app.services.near_duplicates import NearDuplicateIndex
 
+logger = logging.getLogger(__name__)
 
-def run_scrapers(hours: int = 24) -> dict:
+
+def run_scrapers(hours: int = 24, sources: Optional[List[Source]] = None) -> Dict[str, List[ScrapedItem]]:
     """Run all scrapers and persist raw data to database.
 
+    Items of sources that do not fetch content separately are stored with
+    their description as the content to digest. Items already stored in an
+    earlier run are skipped (see app.scrapers.seen_ids). New items are
+    fingerprinted for near-duplicate detection from their title and feed
+    description; content fetched later is not fingerprinted. A source that fails
+    is logged and left out of the result without affecting the others.
+
     Args:
         hours: Number of hours to look back for content
+        sources: Sources to scrape (default: all configured sources)
 
     Returns:
-        Dictionary with scraped objects: {"youtube": [...], "openai": [...], "anthropic": [...]}
+        New items by source name, e.g. {"youtube": [...], "openai": [...]}
     """
-    youtube_scraper = YouTubeScraper()
-    openai_scraper = OpenAIScraper()
-    anthropic_scraper = AnthropicScraper()
-    repo = Repository()
-
-    youtube_videos = []
-    openai_articles = []
-    anthropic_articles = []
-
-    # YouTube Logic
-    for channel_id in YOUTUBE_CHANNELS:
-        videos = youtube_scraper.get_latest_videos(channel_id, hours=hours)
-
-        # Convert Pydantic models to dictionaries
-        video_dicts = [
-            {
-                "video_id": video.video_id,
-                "title": video.title,
-                "url": video.url,
-                "channel_id": video.channel_id,
-                "published_at": video.published_at,
-                "description": video.description,
-                "transcript": video.transcript,
-            }
-            for video in videos
-        ]
+    sources = sources if sources is not None else load_sources()
 
-        repo.bulk_create_youtube_videos(video_dicts)
-        youtube_videos.extend(videos)
+    with session_scope() as session:
+        repo = Repository(session=session)
+        near_duplicates = NearDuplicateIndex(repo)
 
-    # OpenAI Logic
-    openai_articles_models = openai_scraper.get_articles(hours=hours)
-    openai_dicts = [
-        {
-            "guid": article.guid,
-            "title": article.title,
-            "url": article.url,
-            "description": article.description,
-            "published_at": article.published_at,
-            "category": article.category,
-        }
-        for article in openai_articles_models
-    ]
-    repo.bulk_create_openai_articles(openai_dicts)
-    openai_articles.extend(openai_articles_models)
+        scraped = {}
+        for source in sources:
+            try:
+                # Known ids are skipped by the source where it can, and dropped here otherwise
+                seen = SeenIds.load(repo, source.name)
+                items = [item for item in source.get_items(hours=hours, seen=seen) if item.external_id not in seen]
+                rows = [item.to_row(content=None if source.fetches_content else item.description) for item in items]
 
-    # Anthropic Logic
-    anthropic_articles_models = anthropic_scraper.get_articles(hours=hours)
-    anthropic_dicts = [
-        {
-            "guid": article.guid,
-            "title": article.title,
-            "url": article.url,
-            "description": article.description,
-            "published_at": article.published_at,
-            "category": article.category,
-            "markdown": article.markdown,
-        }
-        for article in anthropic_articles_models
-    ]
-    repo.bulk_create_anthropic_articles(anthropic_dicts)
-    anthropic_articles.extend(anthropic_articles_models)
+                repo.bulk_create_content_items(source.name, rows)
+                near_duplicates.add_many(source.name, rows, id_field="external_id", content_field="description")
+                seen.add_many(item.external_id for item in items)
+                seen.save(repo)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Scraping {source.name} failed: {e}")
+                continue
+            scraped[source.name] = items
 
-    return {
-        "youtube": youtube_videos,
-        "openai": openai_articles,
-        "anthropic": anthropic_articles,
-    }
+    return scraped
 
 
 if __name__ == "__main__":
     results = run_scrapers()
     print(f"Scraper Results:")
-    print(f"  YouTube: {len(results['youtube'])} videos")
-    print(f"  OpenAI: {len(results['openai'])} articles")
-    print(f"  Anthropic: {len(results['anthropic'])} articles")
+    for name, items in results.items():
+        print(f"  {name}: {len(items)} items")
@@ -0,0 +1,389 @@
+"""Built-in scheduler running pipeline stages on cron-like schedules.
+
+Instead of one heavy daily batch, each stage runs on its own schedule, for
+example cheap incremental scrapes every hour (already stored items are
+skipped, see app.scrapers.seen_ids) and the email once a day:
+
+    uv run python -m app.scheduler            # run until stopped
+    uv run python -m app.scheduler --list     # show jobs, last and next runs
+    uv run python -m app.scheduler --run email  # run one job now
+
+Schedules are five-field cron expressions in UTC ("minute hour day month
+weekday", with `*`, `a-b`, `a,b` and `/step`) or @hourly/@daily/@weekly/@monthly,
+read from SCHEDULE_<JOB> variables; an empty value disables the job.
+
+- Overlap protection: jobs run under `app.database.locks.run_lock`, so a
+  second scheduler (or a manual `--run`) skips its turn while a run is in
+  progress, and picks the job up again on its next check.
+- Jitter: due jobs start after a random delay of up to SCHEDULER_JITTER_SECONDS,
+  so replicas and other periodic load do not all fire on the minute.
+- Catch-up: the slot of each job's last run is kept in `scheduler_runs`.
+  After downtime a job that missed slots within SCHEDULER_CATCH_UP_HOURS runs
+  once (missed slots are coalesced); older misses are recorded as skipped.
+  Scrape and email windows stretch to cover the time since their last
+  successful run.
+"""
+import argparse
+import logging
+import math
+import os
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from app.database.connection import session_scope
+from app.database.locks import run_lock
+from app.database.repository import Repository
+
+logger = logging.getLogger(__name__)
+
+ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+# (name, lowest, highest) of the five cron fields
+FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 6))
+
+# Slots missed by less than this run even with SCHEDULER_CATCH_UP_HOURS=0, since checks are not instantaneous
+GRACE = timedelta(minutes=5)
+
+# Longest sleep between checks, so new SCHEDULER_* state and clock changes are noticed
+POLL_SECONDS = 60.0
+
+
+def _parse_field(spec: str, name: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in spec.split(","):
+        value, _, step = part.partition("/")
+        try:
+            step = int(step) if step else 1
+            if value == "*":
+                start, end = low, high
+            elif "-" in value:
+                start, end = (int(bound) for bound in value.split("-", 1))
+            else:
+                start = int(value)
+                end = high if step != 1 or "/" in part else start
+        except ValueError:
+            raise ValueError(f"Invalid cron {name} field {spec!r}") from None
+        if name == "weekday" and end == 7:
+            # Both 0 and 7 mean Sunday
+            values.add(0)
+            if start == 7:
+                continue
+            end = 6
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Invalid cron {name} field {spec!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """Five-field cron expression, evaluated in UTC.
+
+    As in cron, when both day-of-month and weekday are restricted a day
+    matching either one matches.
+
+    Raises:
+        ValueError: If the expression is malformed
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != len(FIELDS):
+            raise ValueError(f"Cron expression {expression!r} needs {len(FIELDS)} fields")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(spec, name, low, high) for spec, (name, low, high) in zip(fields, FIELDS)
+        )
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays  # Cron counts from Sunday
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the first slot strictly after `moment` (naive UTC)."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Leap days can be four years apart
+        limit = candidate + timedelta(days=5 * 366)
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+
+@dataclass
+class Job:
+    """A pipeline stage run on a schedule.
+
+    `run` receives the start of the job's last successful run (None if it
+    never succeeded) and returns a result dict; `"success": False` in it, or
+    an exception, marks the run as failed.
+    """
+
+    name: str
+    schedule: CronSchedule
+    run: Callable[[Optional[datetime]], dict]
+
+
+def lookback_hours(since: Optional[datetime], minimum: int) -> int:
+    """Hours to look back to cover everything since `since`, and at least `minimum`."""
+    if since is None:
+        return minimum
+    return max(minimum, math.ceil((datetime.utcnow() - since).total_seconds() / 3600))
+
+
+def scrape(since: Optional[datetime]) -> dict:
+    """Scrape every source and fetch content for new items."""
+    from app.runner import run_scrapers
+    from app.services.process_content import process_content
+
+    hours = lookback_hours(since, int(os.getenv("SCHEDULER_SCRAPE_HOURS", "24")))
+    scraped = run_scrapers(hours=hours)
+    return {"hours": hours, "scraped": {name: len(items) for name, items in scraped.items()}, "content": process_content()}
+
+
+def digest(since: Optional[datetime]) -> dict:
+    """Generate digests for items with content."""
+    from app.services.process_digest import process_digests
+
+    return process_digests()
+
+
+def email(since: Optional[datetime]) -> dict:
+    """Send the digest email covering the time since the last one."""
+    from app.services.process_email import send_digest_email
+
+    hours = lookback_hours(since, int(os.getenv("SCHEDULER_EMAIL_HOURS", "24")))
+    return send_digest_email(hours=hours, top_n=int(os.getenv("SCHEDULER_TOP_N", "10")))
+
+
+def retention(since: Optional[datetime]) -> dict:
+    """Archive raw content of digested items (see app.services.retention)."""
+    from app.services.retention import run_retention
+
+    return run_retention()
+
+
+def pipeline(since: Optional[datetime]) -> dict:
+    """Run the whole daily pipeline as one job."""
+    from app.daily_runner import run_daily_pipeline
+
+    return run_daily_pipeline(hours=lookback_hours(since, 24), top_n=int(os.getenv("SCHEDULER_TOP_N", "10")))
+
+
+# Job name -> (function, default schedule); due jobs run in this order
+JOB_FUNCTIONS: Dict[str, Tuple[Callable[[Optional[datetime]], dict], str]] = {
+    "scrape": (scrape, "0 * * * *"),
+    "digest": (digest, "10 * * * *"),
+    "email": (email, "0 7 * * *"),
+    "retention": (retention, "30 3 * * 0"),
+    "pipeline": (pipeline, ""),
+}
+
+
+def jobs_from_env() -> List[Job]:
+    """Build the enabled jobs from SCHEDULE_<JOB> variables (default schedules otherwise)."""
+    jobs = []
+    for name, (function, default) in JOB_FUNCTIONS.items():
+        expression = os.getenv(f"SCHEDULE_{name.upper()}", default).strip()
+        if expression:
+            jobs.append(Job(name, CronSchedule(expression), function))
+    return jobs
+
+
+class Scheduler:
+    """Runs due jobs under the run lock, with jitter and catch-up.
+
+    Args:
+        jobs: Jobs to run, in the order they run when due together
+        jitter_seconds: Upper bound of the random delay before due jobs start
+        catch_up_hours: Run a missed slot at most this long after it (coalesced)
+        lock_name: Name of the run lock shared with other schedulers
+        engine: Database holding the lock (default: the application engine)
+        clock: Returns the current naive UTC time (for tests)
+        sleep: Sleeps for a number of seconds (for tests)
+        rng: Random source for jitter
+    """
+
+    def __init__(
+        self,
+        jobs: List[Job],
+        jitter_seconds: float = 60.0,
+        catch_up_hours: float = 24.0,
+        lock_name: str = "pipeline",
+        engine: Optional[Engine] = None,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        self.jobs = list(jobs)
+        self.jitter_seconds = jitter_seconds
+        self.catch_up = max(timedelta(hours=catch_up_hours), GRACE)
+        self.lock_name = lock_name
+        self.engine = engine
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        # Jobs that never ran count from scheduler start, so a first start doesn't fire every job at once
+        self.started_at = clock()
+
+    @classmethod
+    def from_env(cls) -> "Scheduler":
+        """Build a scheduler from the SCHEDULE_* and SCHEDULER_* settings."""
+        return cls(
+            jobs_from_env(),
+            jitter_seconds=float(os.getenv("SCHEDULER_JITTER_SECONDS", "60")),
+            catch_up_hours=float(os.getenv("SCHEDULER_CATCH_UP_HOURS", "24")),
+        )
+
+    def _last_slots(self) -> Dict[str, datetime]:
+        with session_scope() as session:
+            runs = Repository(session=session).get_scheduler_runs()
+            return {job.name: runs[job.name].scheduled_at if job.name in runs else self.started_at for job in self.jobs}
+
+    def due_jobs(self, now: datetime) -> List[Tuple[Job, datetime]]:
+        """Return (job, slot) of jobs with a slot due at `now`, recording slots missed beyond catch-up as skipped."""
+        last_slots = self._last_slots()
+        due = []
+        for job in self.jobs:
+            last = last_slots[job.name]
+            if job.schedule.next_after(last) > now:
+                continue
+            window_start = max(last, now - self.catch_up)
+            latest = None
+            slot = job.schedule.next_after(window_start)
+            while slot <= now:
+                latest, slot = slot, job.schedule.next_after(slot)
+            if latest is None:
+                logger.warning(f"Skipping {job.name}: its slots since {last} were missed by more than {self.catch_up}")
+                self._record(job.name, window_start, "skipped")
+            else:
+                due.append((job, latest))
+        return due
+
+    def next_wakeup(self, now: datetime) -> datetime:
+        """Return when the next job slot comes up."""
+        last_slots = self._last_slots()
+        return min((job.schedule.next_after(max(last_slots[job.name], now)) for job in self.jobs), default=now)
+
+    def _record(self, job: str, scheduled_at: datetime, status: str, **fields) -> None:
+        with session_scope() as session:
+            Repository(session=session).record_scheduler_run(job, scheduled_at, status, **fields)
+
+    def run_job(self, job: Job, scheduled_at: datetime) -> dict:
+        """Run one job (the caller holds the run lock) and record the outcome."""
+        with session_scope() as session:
+            previous = Repository(session=session).get_scheduler_runs().get(job.name)
+            since = previous.last_success_at if previous is not None else None
+
+        started_at = self.clock()
+        logger.info(f"Running {job.name} (slot {scheduled_at:%Y-%m-%d %H:%M})")
+        try:
+            result = job.run(since)
+            error = result.get("error") if result.get("success") is False else None
+            status = "failed" if result.get("success") is False else "success"
+        except Exception as e:
+            logger.error(f"Job {job.name} failed: {e}", exc_info=True)
+            result, status, error = {"success": False, "error": str(e)}, "failed", str(e)
+        self._record(job.name, scheduled_at, status, started_at=started_at, finished_at=self.clock(), error=error)
+        logger.info(f"Finished {job.name}: {status}")
+        return result
+
+    def run_pending(self) -> Dict[str, dict]:
+        """Run every due job once, unless another run holds the lock.
+
+        Due jobs are looked up again once the lock is held, so a slot another
+        scheduler ran meanwhile is not run twice.
+
+        Returns:
+            Results by job name of the jobs that ran
+        """
+        due = self.due_jobs(self.clock())
+        if not due:
+            return {}
+        if self.jitter_seconds > 0:
+            self.sleep(self.rng.uniform(0, self.jitter_seconds))
+
+        with run_lock(self.lock_name, self.engine) as acquired:
+            if not acquired:
+                logger.info(f"Another run holds the {self.lock_name!r} lock; retrying {[job.name for job, _ in due]} later")
+                return {}
+            # Another scheduler may have run these slots during the jitter sleep
+            due = self.due_jobs(self.clock())
+            return {job.name: self.run_job(job, scheduled_at) for job, scheduled_at in due}
+
+    def run_now(self, name: str) -> Optional[dict]:
+        """Run a job immediately, regardless of its schedule; None if the lock is held."""
+        job = next((job for job in self.jobs if job.name == name), None)
+        if job is None:
+            function, _ = JOB_FUNCTIONS[name]
+            job = Job(name, CronSchedule("@daily"), function)
+        with run_lock(self.lock_name, self.engine) as acquired:
+            return self.run_job(job, self.clock()) if acquired else None
+
+    def run_forever(self) -> None:
+        """Check for due jobs until interrupted."""
+        logger.info("Scheduler started: " + ", ".join(f"{job.name} {job.schedule.expression!r}" for job in self.jobs))
+        while True:
+            self.run_pending()
+            now = self.clock()
+            self.sleep(min(max((self.next_wakeup(now) - now).total_seconds(), 1.0), POLL_SECONDS))
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Run pipeline stages on their schedules")
+    parser.add_argument("--list", action="store_true", help="Show jobs with their last and next runs, then exit")
+    parser.add_argument("--once", action="store_true", help="Run the jobs that are due, then exit")
+    parser.add_argument("--run", choices=sorted(JOB_FUNCTIONS), help="Run one job now, then exit")
+    args = parser.parse_args()
+
+    scheduler = Scheduler.from_env()
+    if args.list:
+        with session_scope() as session:
+            runs = Repository(session=session).get_scheduler_runs()
+        now = datetime.utcnow()
+        for job in scheduler.jobs:
+            run = runs.get(job.name)
+            last = f"{run.status} at slot {run.scheduled_at:%Y-%m-%d %H:%M}" if run else "never"
+            print(f"{job.name:<10} {job.schedule.expression:<16} last: {last}, next: {job.schedule.next_after(now):%Y-%m-%d %H:%M} UTC")
+    elif args.run:
+        result = scheduler.run_now(args.run)
+        if result is None:
+            raise SystemExit("Another run is in progress")
+        print(result)
+        raise SystemExit(0 if result.get("success", True) else 1)
+    elif args.once:
+        scheduler.run_pending()
+    else:
+        scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -23,3 +24,45 @@ class RunPipelineResponse(BaseModel):
 
     status: str
     message: str
+
+
+class SearchResult(DigestResponse):
+    """Digest matched by a full-text search, with its relevance rank."""
+
+    rank: float
+
+
+class RelatedDigest(DigestResponse):
+    """Digest similar to another one, with its cosine similarity."""
+
+    score: float
+
+
+class SearchResponse(BaseModel):
+    """Response model for a paginated full-text search."""
+
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: List[SearchResult]
+
+
+class TranscriptChunkResponse(BaseModel):
+    """A time range of a transcript with a link that starts playback at it."""
+
+    start: float
+    end: float
+    url: str
+    text: str
+
+
+class TranscriptResponse(BaseModel):
+    """Response model for a transcript split into time chunks."""
+
+    source: str
+    external_id: str
+    language: Optional[str]
+    is_generated: Optional[bool]
+    segments: int
+    chunks: List[TranscriptChunkResponse]
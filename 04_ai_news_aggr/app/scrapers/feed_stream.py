@@ -0,0 +1,219 @@
+"""Streaming RSS 2.0 / Atom parser for large feeds.
+
+`feedparser.parse` downloads and builds the whole feed before the scraper
+drops every entry older than its cutoff. `stream_feed_items` instead parses
+entries incrementally with `xml.etree.ElementTree.iterparse` while the feed is
+read, keeps one entry in memory at a time, and on feeds sorted newest first
+stops reading (and closes the connection) at the first entry past the cutoff.
+
+Only well-formed RSS 2.0 and Atom documents with RFC 822 / ISO 8601 dates are
+handled here; anything else raises `UnsupportedFeed` so the caller can fall
+back to feedparser, which copes with malformed XML, RSS 1.0/RDF and exotic
+date formats.
+"""
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import BinaryIO, Container, Iterator, List, Optional, Tuple
+
+import feedparser
+import urllib3
+
+from app.scrapers.http_client import get_http_client
+from app.scrapers.registry import ScrapedItem
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+DUBLIN_CORE = "{http://purl.org/dc/elements/1.1/}"
+MEDIA = "{http://search.yahoo.com/mrss/}"
+
+
+class UnsupportedFeed(ValueError):
+    """The document is not a well-formed RSS 2.0 or Atom feed this parser can read."""
+
+
+class FeedReadError(OSError):
+    """The connection failed while the feed body was being read (truncated or timed out)."""
+
+
+def _is_url(location: str) -> bool:
+    return location.startswith(("http://", "https://"))
+
+
+@contextmanager
+def open_feed(location: str) -> Iterator[BinaryIO]:
+    """Open a feed URL (streamed through the shared HTTP client) or local file for reading.
+
+    Raises:
+        FeedReadError: If reading the body of a URL fails part way; reads from
+            `response.raw` raise urllib3 errors, which are not OSErrors
+    """
+    if _is_url(location):
+        with get_http_client().stream(location) as response:
+            try:
+                yield response.raw
+            except (OSError, urllib3.exceptions.HTTPError) as e:
+                raise FeedReadError(f"Reading {location} failed: {e}") from e
+    else:
+        with open(location.removeprefix("file://"), "rb") as f:
+            yield f
+
+
+def parse_with_feedparser(location: str) -> feedparser.FeedParserDict:
+    """Fetch a feed through the shared HTTP client and parse it with feedparser.
+
+    Like `feedparser.parse(url)`, an unreachable feed gives an empty result
+    with `bozo` set rather than an exception.
+    """
+    if not _is_url(location):
+        return feedparser.parse(location)
+    try:
+        response = get_http_client().get(location)
+    except OSError as e:
+        return feedparser.FeedParserDict(entries=[], bozo=1, bozo_exception=e)
+    headers = {key.lower(): value for key, value in response.headers.items()}
+    return feedparser.parse(response.content, response_headers={**headers, "content-location": response.url})
+
+
+def _text(element: ET.Element, tag: str) -> str:
+    child = element.find(tag)
+    return (child.text or "").strip() if child is not None else ""
+
+
+def _parse_date(value: str) -> datetime:
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom) date to UTC, to the second like feedparser."""
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            raise UnsupportedFeed(f"Unrecognised date {value!r}") from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _rss_key(element: ET.Element) -> Tuple[str, str]:
+    """Return the (id, publication date) of an RSS item; the id falls back to the link."""
+    external_id = _text(element, "guid") or _text(element, "link")
+    return external_id, _text(element, "pubDate") or _text(element, f"{DUBLIN_CORE}date")
+
+
+def _rss_item(element: ET.Element, external_id: str, published_at: datetime) -> ScrapedItem:
+    return ScrapedItem(
+        external_id=external_id,
+        title=_text(element, "title"),
+        url=_text(element, "link"),
+        description=_text(element, "description"),
+        published_at=published_at,
+        category=_text(element, "category") or None,
+    )
+
+
+def _atom_link(element: ET.Element) -> str:
+    links = element.findall(f"{ATOM}link")
+    return next((l.get("href", "") for l in links if l.get("rel", "alternate") == "alternate"), "")
+
+
+def _atom_key(element: ET.Element) -> Tuple[str, str]:
+    """Return the (id, publication date) of an Atom entry; the id falls back to the link."""
+    return _text(element, f"{ATOM}id") or _atom_link(element), _text(element, f"{ATOM}published")
+
+
+def _atom_entry(element: ET.Element, external_id: str, published_at: datetime) -> ScrapedItem:
+    category = element.find(f"{ATOM}category")
+    return ScrapedItem(
+        external_id=external_id,
+        title=_text(element, f"{ATOM}title"),
+        url=_atom_link(element),
+        description=(
+            _text(element, f"{ATOM}summary")
+            or _text(element, f"{ATOM}content")
+            or _text(element, f"{MEDIA}group/{MEDIA}description")
+        ),
+        published_at=published_at,
+        category=category.get("term") if category is not None else None,
+    )
+
+
+def iter_feed_items(
+    stream: BinaryIO,
+    cutoff: Optional[datetime] = None,
+    stop_at_cutoff: bool = False,
+    seen: Optional[Container[str]] = None,
+) -> Iterator[ScrapedItem]:
+    """Yield items of an RSS 2.0 or Atom document as they are parsed.
+
+    Entries without a publication date, or without both an id and a link,
+    are skipped, as feedparser-based scraping did. Each entry is dropped from
+    the tree once parsed, so memory stays flat however long the feed is.
+
+    Args:
+        stream: Binary file-like object with the document
+        cutoff: Skip entries published before this time (timezone-aware)
+        stop_at_cutoff: Stop reading at the first entry older than `cutoff`,
+            for feeds sorted newest first. Reading continues regardless if an
+            earlier entry was out of order, so an unsorted feed is read fully.
+        seen: Ids to skip without building an item (see app.scrapers.seen_ids)
+
+    Raises:
+        UnsupportedFeed: If the document is malformed or not RSS 2.0 / Atom
+    """
+    parents = []
+    entry_key = None
+    newest_first = True
+    previous = None
+    try:
+        for event, element in ET.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                if entry_key is None:
+                    if element.tag == "rss":
+                        entry_tag, entry_key, to_item = "item", _rss_key, _rss_item
+                    elif element.tag == f"{ATOM}feed":
+                        entry_tag, entry_key, to_item = f"{ATOM}entry", _atom_key, _atom_entry
+                    else:
+                        raise UnsupportedFeed(f"Unsupported root element {element.tag!r}")
+                parents.append(element)
+                continue
+
+            parents.pop()
+            if element.tag != entry_tag:
+                continue
+
+            item = None
+            external_id, published = entry_key(element)
+            if external_id and published:
+                published_at = _parse_date(published)
+                if previous is not None and published_at > previous:
+                    newest_first = False
+                previous = published_at
+
+                if cutoff is not None and published_at < cutoff:
+                    if stop_at_cutoff and newest_first:
+                        return
+                elif seen is None or external_id not in seen:
+                    item = to_item(element, external_id, published_at)
+
+            if parents:
+                parents[-1].remove(element)
+            if item is not None:
+                yield item
+    except ET.ParseError as e:
+        raise UnsupportedFeed(str(e)) from e
+
+
+def stream_feed_items(
+    location: str, cutoff: datetime, stop_at_cutoff: bool = True, seen: Optional[Container[str]] = None
+) -> List[ScrapedItem]:
+    """Read items published at or after `cutoff` from a feed URL or file.
+
+    See `iter_feed_items` for `stop_at_cutoff` and `seen`.
+
+    Raises:
+        UnsupportedFeed: If the feed cannot be parsed here (use feedparser)
+        FeedReadError: If the body broke off part way (retry without streaming)
+        OSError: If the feed cannot be fetched (requests errors are OSErrors)
+    """
+    with open_feed(location) as stream:
+        return list(iter_feed_items(stream, cutoff, stop_at_cutoff, seen))
@@ -0,0 +1,442 @@
+"""Shared HTTP client for scraper fetches.
+
+One pooled `requests.Session` serves feeds and article pages, so
+connections to the same host are kept alive across fetches instead of being
+reopened by every `feedparser.parse(url)` call. The client also:
+
+- negotiates gzip/deflate, and brotli/zstd when those packages are installed
+  (urllib3 decodes them transparently)
+- applies connect/read timeouts and retries idempotent requests on
+  connection errors and 429/5xx responses, honouring Retry-After
+- caps concurrent requests per host with a semaphore
+- keeps a circuit breaker per host: after HTTP_BREAKER_FAILURES consecutive
+  failures, requests to that host fail immediately with `CircuitOpenError`
+  for a cool-down that doubles each time a trial request fails again, so a
+  dead host costs one error per fetch instead of a timeout
+- adapts the read timeout of each host to its observed latency, so a host
+  that usually answers in 200 ms is given up on in seconds, not minutes
+- counts requests, connections opened (so reuse is visible) and bytes on the
+  wire vs decoded, overall and per host
+
+Libraries that take a `requests.Session` get their own from
+`HttpClient.library_session()`, so they can set headers and cookies without
+touching the shared session while their requests still go through the above.
+
+Settings come from HTTP_* environment variables; see `HttpClient.from_env`.
+"""
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import HTTPError as UrllibHTTPError
+from urllib3.util.retry import Retry
+
+USER_AGENT = "ai-news-aggregator/0.1"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """A request was refused without being sent because its host's breaker is open."""
+
+
+class HttpStats:
+    """Thread-safe transfer counters of an `HttpClient`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.skipped = 0  # Refused by an open circuit breaker
+        self.connections = 0  # New TCP/TLS connections; requests - connections were served on kept-alive ones
+        self.bytes_received = 0  # On the wire, before content decoding
+        self.bytes_decoded = 0  # After decoding, for fully read (non-streamed) responses
+        self.requests_by_host: Counter = Counter()
+        self.bytes_by_host: Counter = Counter()
+
+    def record_response(self, host: str, received: int, decoded: int = 0) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += received
+            self.bytes_decoded += decoded
+            self.requests_by_host[host] += 1
+            self.bytes_by_host[host] += received
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "skipped": self.skipped,
+                "connections": self.connections,
+                "reused": max(self.requests - self.connections, 0),
+                "bytes_received": self.bytes_received,
+                "bytes_decoded": self.bytes_decoded,
+                "by_host": {
+                    host: {"requests": count, "bytes_received": self.bytes_by_host[host]}
+                    for host, count in sorted(self.requests_by_host.items())
+                },
+            }
+
+    def since(self, before: dict) -> dict:
+        """Return the counters accumulated since an earlier `snapshot()`."""
+        now = self.snapshot()
+        delta = {key: now[key] - before[key] for key in now if key != "by_host"}
+        delta["reused"] = max(delta["requests"] - delta["connections"], 0)
+        delta["by_host"] = {
+            host: {
+                key: value - before["by_host"].get(host, {}).get(key, 0)
+                for key, value in counts.items()
+            }
+            for host, counts in now["by_host"].items()
+            if counts["requests"] != before["by_host"].get(host, {}).get("requests", 0)
+        }
+        return delta
+
+
+class CircuitBreaker:
+    """Circuit breaker and latency tracker of one host.
+
+    Closed, requests go through and consecutive failures are counted; at
+    `failure_threshold` it opens and refuses requests for `cooldown` seconds.
+    It then lets one trial request through (half-open): success closes it
+    and resets the cool-down, failure reopens it with the cool-down doubled,
+    up to `max_cooldown`.
+
+    Args:
+        failure_threshold: Consecutive failures that open the breaker
+        cooldown: Seconds the breaker first stays open
+        max_cooldown: Upper bound of the doubling cool-down
+        clock: Monotonic time source (for tests)
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+    LATENCY_WEIGHT = 0.3  # Weight of the newest sample in the latency average
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown: float = 60.0,
+        max_cooldown: float = 1800.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_at = 0.0
+        self.trips = 0
+        self.skipped = 0
+        self.latency: Optional[float] = None  # Moving average of successful response times, seconds
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now; refusals are counted."""
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                return True
+            if self.state == self.CLOSED:
+                return True
+            self.skipped += 1
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until the breaker lets a trial request through."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(self.opened_at + self.cooldown - self.clock(), 0.0)
+
+    def record_success(self, seconds: float) -> None:
+        with self._lock:
+            if self.latency is None:
+                self.latency = seconds
+            else:
+                self.latency += self.LATENCY_WEIGHT * (seconds - self.latency)
+            self.failures = 0
+            if self.state != self.CLOSED:
+                self.state = self.CLOSED
+                self.cooldown = self.base_cooldown
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open()
+            elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened_at = self.clock()
+        self.trips += 1
+
+    def read_timeout(self, default: float, minimum: float, factor: float) -> float:
+        """Read timeout for the next request: `factor` times the usual latency, within [minimum, default]."""
+        with self._lock:
+            if self.latency is None:
+                return default
+            return min(default, max(minimum, factor * self.latency))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "trips": self.trips,
+                "skipped": self.skipped,
+                "cooldown": self.cooldown,
+                "latency_ms": round(self.latency * 1000) if self.latency is not None else None,
+            }
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new connection to `stats`."""
+
+    def __init__(self, stats: HttpStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+
+        def counting(pool_class):
+            def _new_conn(pool):
+                stats.increment("connections")
+                return pool_class._new_conn(pool)
+
+            return type(f"Counting{pool_class.__name__}", (pool_class,), {"_new_conn": _new_conn})
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": counting(HTTPConnectionPool),
+            "https": counting(HTTPSConnectionPool),
+        }
+
+
+class _ClientSession(requests.Session):
+    """Session with its own headers and cookies whose requests are sent through an `HttpClient`."""
+
+    def __init__(self, client: "HttpClient"):
+        super().__init__()
+        self.client = client
+        adapter = client.session.get_adapter("https://")
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        self.headers["User-Agent"] = USER_AGENT
+
+    def request(self, method, url, **kwargs) -> requests.Response:
+        return self.client._fetch(url, method=method, send=super().request, **kwargs)
+
+
+class HttpClient:
+    """Pooled, instrumented HTTP client with per-host concurrency caps and circuit breakers.
+
+    Connection errors, timeouts and 429/5xx responses (after retries) count
+    as host failures; other error statuses such as 404 mean the host is up.
+
+    Args:
+        connect_timeout: Seconds to establish a connection
+        read_timeout: Seconds to wait between bytes of the response, at most
+        pool_size: Kept-alive connections per host (and hosts kept in the pool)
+        max_per_host: Concurrent requests allowed per host
+        retries: Retries of connection errors and 429/5xx responses
+        breaker_failures: Consecutive failures that open a host's breaker
+        breaker_cooldown: Seconds a breaker first stays open (doubles on repeated trips)
+        breaker_max_cooldown: Upper bound of the cool-down
+        min_read_timeout: Lower bound of the latency-based read timeout
+        latency_factor: Read timeout as a multiple of the host's average latency
+        clock: Monotonic time source of the breakers (for tests)
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        pool_size: int = 10,
+        max_per_host: int = 4,
+        retries: int = 2,
+        breaker_failures: int = 3,
+        breaker_cooldown: float = 60.0,
+        breaker_max_cooldown: float = 1800.0,
+        min_read_timeout: float = 5.0,
+        latency_factor: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.min_read_timeout = min(min_read_timeout, read_timeout)
+        self.latency_factor = latency_factor
+        self.max_per_host = max_per_host
+        self.stats = HttpStats()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._slots_lock = threading.Lock()
+        self._new_breaker = lambda: CircuitBreaker(breaker_failures, breaker_cooldown, breaker_max_cooldown, clock)
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        adapter = _CountingAdapter(self.stats, pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = USER_AGENT
+
+    @classmethod
+    def from_env(cls) -> "HttpClient":
+        """Build a client from the HTTP_* timeout, pool, per-host cap, retry and breaker settings."""
+        return cls(
+            connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("HTTP_READ_TIMEOUT", "30")),
+            pool_size=int(os.getenv("HTTP_POOL_SIZE", "10")),
+            max_per_host=int(os.getenv("HTTP_MAX_PER_HOST", "4")),
+            retries=int(os.getenv("HTTP_RETRIES", "2")),
+            breaker_failures=int(os.getenv("HTTP_BREAKER_FAILURES", "3")),
+            breaker_cooldown=float(os.getenv("HTTP_BREAKER_COOLDOWN", "60")),
+            breaker_max_cooldown=float(os.getenv("HTTP_BREAKER_MAX_COOLDOWN", "1800")),
+            min_read_timeout=float(os.getenv("HTTP_MIN_READ_TIMEOUT", "5")),
+            latency_factor=float(os.getenv("HTTP_LATENCY_TIMEOUT_FACTOR", "10")),
+        )
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[host]
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """Return the circuit breaker of `host` (a URL netloc)."""
+        with self._slots_lock:
+            if host not in self._breakers:
+                self._breakers[host] = self._new_breaker()
+            return self._breakers[host]
+
+    def breaker_states(self) -> Dict[str, dict]:
+        """Return the breaker state and average latency of every host contacted."""
+        with self._slots_lock:
+            breakers = sorted(self._breakers.items())
+        return {host: breaker.snapshot() for host, breaker in breakers}
+
+    def _send(
+        self,
+        url: str,
+        host: str,
+        record_success: bool = True,
+        method: str = "GET",
+        send: Optional[Callable[..., requests.Response]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """Send a request through the host's breaker, recording the outcome and latency.
+
+        With `record_success` False a successful response is left for the caller
+        to record, e.g. once a streamed body has been read. `send` replaces the
+        shared session's `request`, for sessions handed to libraries.
+        """
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            self.stats.increment("skipped")
+            raise CircuitOpenError(f"Circuit open for {host}, next attempt in {breaker.retry_in():.0f}s")
+        read_timeout = breaker.read_timeout(self.read_timeout, self.min_read_timeout, self.latency_factor)
+        kwargs.setdefault("timeout", (self.connect_timeout, read_timeout))
+        started = time.monotonic()
+        response = None
+        try:
+            response = (send or self.session.request)(method, url, **kwargs)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self.stats.increment("failures")
+            if response is not None:
+                response.close()
+            if e.response is None or e.response.status_code in RETRY_STATUSES:
+                breaker.record_failure()
+            else:
+                breaker.record_success(time.monotonic() - started)
+            raise
+        if record_success:
+            breaker.record_success(time.monotonic() - started)
+        return response
+
+    @contextmanager
+    def stream(self, url: str, **kwargs) -> Iterator[requests.Response]:
+        """GET `url` without reading the body; the connection is released on exit.
+
+        Read `response.raw`, which decodes gzip/brotli, to consume the body
+        incrementally; leaving early only transfers what was read. The breaker
+        records the outcome on exit, so a host that keeps failing mid-body
+        (connection or urllib3 errors escaping the block) opens its circuit.
+
+        Raises:
+            CircuitOpenError: If the host's breaker is open (nothing is sent)
+            requests.RequestException: On connection errors and HTTP error statuses
+        """
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        with self._host_slot(host):
+            response = self._send(url, host, record_success=False, stream=True, **kwargs)
+            response.raw.decode_content = True
+            body_failed = False
+            try:
+                yield response
+            except (OSError, UrllibHTTPError):
+                body_failed = True
+                self.stats.increment("failures")
+                breaker.record_failure()
+                raise
+            finally:
+                if not body_failed:
+                    breaker.record_success(response.elapsed.total_seconds())
+                self.stats.record_response(host, response.raw.tell())
+                response.close()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET `url` and read the whole body.
+
+        Raises:
+            CircuitOpenError: If the host's breaker is open (nothing is sent)
+            requests.RequestException: On connection errors and HTTP error statuses
+        """
+        return self._fetch(url, **kwargs)
+
+    def _fetch(self, url: str, **kwargs) -> requests.Response:
+        host = urlsplit(url).netloc
+        with self._host_slot(host):
+            response = self._send(url, host, **kwargs)
+        self.stats.record_response(host, response.raw.tell(), len(response.content))
+        return response
+
+    def library_session(self) -> requests.Session:
+        """Return a new session for a library that sends its own requests.
+
+        The session has its own headers and cookies, so the library may
+        configure it freely, but it shares the connection pool, and its
+        requests get the same timeouts, per-host cap, breakers and stats as
+        `get` (error statuses raise `requests.HTTPError` from `get`/`post`).
+        """
+        return _ClientSession(self)
+
+
+@lru_cache(maxsize=None)
+def get_http_client() -> HttpClient:
+    """Return the process-wide client, created on first use."""
+    return HttpClient.from_env()
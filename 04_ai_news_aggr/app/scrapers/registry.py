@@ -0,0 +1,162 @@
+"""Content source registry.
+
+Every source the pipeline scrapes is declared as a dict in `app.config.SOURCES`
+(or in a JSON file named by SOURCES_CONFIG, which replaces that list):
+
+    {"name": "openai", "type": "rss", "feeds": ["https://openai.com/news/rss.xml"]}
+
+`name` is stored as `ContentItem.source` and must stay stable once items are
+stored under it. `type` is a name registered with `@register_source_type`
+(built in: "rss" and "youtube") or a "package.module:Class" path to a plugin
+class; the remaining keys are passed to the class as keyword arguments.
+
+Adding a feed is therefore a config change; a new kind of source is one
+`Source` subclass, and scraping, storage and digesting stay shared.
+"""
+import importlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Container, Dict, List, NamedTuple, Optional, Type, Union
+
+from pydantic import BaseModel, Field
+
+from app.scrapers.transcripts import TranscriptSegments
+
+SOURCE_TYPES: Dict[str, Type["Source"]] = {}
+
+# Modules defining the built-in source types, imported on first use since they
+# pull in the scraping stack (feedparser, youtube_transcript_api)
+BUILTIN_SOURCE_MODULES = ("app.scrapers.rss", "app.scrapers.youtube")
+
+
+class ScrapedItem(BaseModel):
+    external_id: str
+    title: str
+    url: str
+    published_at: datetime
+    description: str = ""
+    category: Optional[str] = None
+    extra: Dict[str, Any] = Field(default_factory=dict)
+
+    def to_row(self, content: Optional[str] = None) -> dict:
+        """Return the item as a row for `Repository.bulk_create_content_items`."""
+        return {
+            "external_id": self.external_id,
+            "title": self.title,
+            "url": self.url,
+            "published_at": self.published_at,
+            "description": self.description,
+            "category": self.category,
+            "extra": self.extra or None,
+            "content": content,
+        }
+
+
+class FetchedContent(NamedTuple):
+    """Content fetched with structured data stored alongside it."""
+
+    text: str
+    segments: Optional[TranscriptSegments] = None  # Timing of a transcript's segments within `text`
+
+
+class Source:
+    """Base class for content sources.
+
+    Subclasses implement `get_items`. Sources whose feed entries are not the
+    text worth digesting (video transcripts, full article pages) set
+    `fetches_content` and implement `fetch_content`, which
+    `app.services.process_content` runs for stored items; other sources
+    digest the feed description.
+    """
+
+    fetches_content: bool = False
+    # Store UNAVAILABLE_MARKER when content cannot be fetched, instead of retrying on the next run
+    mark_unavailable: bool = False
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def get_items(self, hours: int = 24, seen: Optional[Container[str]] = None) -> List[ScrapedItem]:
+        """Return items published within the last `hours`.
+
+        Args:
+            hours: Lookback window
+            seen: External ids already stored (see app.scrapers.seen_ids);
+                sources should skip them before building items. The caller
+                filters them out either way.
+        """
+        raise NotImplementedError
+
+    def fetch_content(self, item) -> Union[str, FetchedContent, None]:
+        """Fetch the digestable content of a stored item.
+
+        Args:
+            item: Row with `external_id`, `title` and `url` attributes
+
+        Returns:
+            The content, a `FetchedContent` to also store transcript segment
+            timing, or None if it is not available
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r})"
+
+
+def register_source_type(type_name: str) -> Callable[[Type[Source]], Type[Source]]:
+    """Class decorator registering a `Source` subclass under a config `type` name."""
+
+    def decorator(cls: Type[Source]) -> Type[Source]:
+        SOURCE_TYPES[type_name] = cls
+        return cls
+
+    return decorator
+
+
+def _source_class(type_name: str) -> Type[Source]:
+    if ":" in type_name:
+        module_name, class_name = type_name.split(":", 1)
+        return getattr(importlib.import_module(module_name), class_name)
+    if type_name not in SOURCE_TYPES:
+        for module_name in BUILTIN_SOURCE_MODULES:
+            importlib.import_module(module_name)
+    if type_name not in SOURCE_TYPES:
+        raise ValueError(f"Unknown source type {type_name!r}, expected one of {sorted(SOURCE_TYPES)}")
+    return SOURCE_TYPES[type_name]
+
+
+def build_source(config: Dict[str, Any]) -> Source:
+    """Instantiate one source from its config dict."""
+    options = dict(config)
+    try:
+        name, type_name = options.pop("name"), options.pop("type")
+    except KeyError as e:
+        raise ValueError(f"Source config {config!r} is missing {e.args[0]!r}") from None
+    return _source_class(type_name)(name, **options)
+
+
+def source_configs() -> List[Dict[str, Any]]:
+    """Return the configured sources: the SOURCES_CONFIG file if set, else `app.config.SOURCES`."""
+    path = os.getenv("SOURCES_CONFIG")
+    if path:
+        with open(path) as f:
+            return json.load(f)
+
+    from app import config
+
+    return config.SOURCES
+
+
+def load_sources(configs: Optional[List[Dict[str, Any]]] = None) -> List[Source]:
+    """Build every configured source, in config order.
+
+    Raises:
+        ValueError: If a config is invalid or two sources share a name
+    """
+    sources = [build_source(config) for config in (configs if configs is not None else source_configs())]
+    names = [source.name for source in sources]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate source names: {duplicates}")
+    return sources
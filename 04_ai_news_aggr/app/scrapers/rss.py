@@ -0,0 +1,175 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import Container, List, Optional
+from urllib.parse import urlsplit
+
+from app.scrapers.feed_stream import FeedReadError, UnsupportedFeed, parse_with_feedparser, stream_feed_items
+from app.scrapers.http_client import get_http_client
+from app.scrapers.registry import ScrapedItem, Source, register_source_type
+
+logger = logging.getLogger(__name__)
+
+PARSERS = ("stream", "feedparser")
+
+DOCUMENT_EXTENSIONS = {
+    "text/html": ".html",
+    "application/xhtml+xml": ".html",
+    "application/pdf": ".pdf",
+    "text/markdown": ".md",
+}
+
+
+@register_source_type("rss")
+class RSSSource(Source):
+    """Items from one or more RSS/Atom feeds.
+
+    Config options:
+        feeds: Feed URLs; an entry appearing in several feeds is kept once
+        fetch_pages: Convert each item's page to markdown and digest that
+            instead of the feed summary
+        parser: "stream" (default) parses entries while the feed downloads,
+            falling back to feedparser for feeds it cannot read; "feedparser"
+            always uses feedparser
+        sorted_by_date: The feeds list entries newest first, so the stream
+            parser can stop reading at the first entry past the cutoff
+    """
+
+    def __init__(
+        self,
+        name: str,
+        feeds: List[str],
+        fetch_pages: bool = False,
+        parser: str = "stream",
+        sorted_by_date: bool = True,
+    ):
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown feed parser {parser!r}, expected one of {PARSERS}")
+        super().__init__(name)
+        self.feeds = list(feeds)
+        self.fetches_content = fetch_pages
+        self.parser = parser
+        self.sorted_by_date = sorted_by_date
+        self._converter = None
+
+    @property
+    def converter(self):
+        """Lazily build the DocumentConverter; docling pulls in the ML stack on import."""
+        if self._converter is None:
+            from docling.document_converter import DocumentConverter
+
+            self._converter = DocumentConverter()
+        return self._converter
+
+    def get_items(self, hours: int = 24, seen: Optional[Container[str]] = None) -> List[ScrapedItem]:
+        """Fetch entries from every feed published within the specified hours."""
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        items = []
+        seen_guids = set()
+
+        for rss_url in self.feeds:
+            for item in self.feed_items(rss_url, cutoff_time, seen):
+                if item.external_id in seen_guids:
+                    continue
+                seen_guids.add(item.external_id)
+                items.append(item)
+
+        return items
+
+    def feed_items(
+        self, rss_url: str, cutoff_time: datetime, seen: Optional[Container[str]] = None
+    ) -> List[ScrapedItem]:
+        """Return one feed's items published at or after `cutoff_time`, except `seen` ids.
+
+        With the stream parser, feeds it cannot read (malformed XML, RSS 1.0,
+        unusual dates) or whose body broke off part way are retried with
+        feedparser. A feed that cannot be fetched (after the HTTP client's
+        retries) gives no items.
+        """
+        if self.parser == "stream":
+            try:
+                return stream_feed_items(rss_url, cutoff_time, stop_at_cutoff=self.sorted_by_date, seen=seen)
+            except UnsupportedFeed as e:
+                logger.info(f"{self.name}: falling back to feedparser for {rss_url}: {e}")
+            except FeedReadError as e:
+                logger.warning(f"{self.name}: retrying {rss_url} without streaming: {e}")
+            except OSError as e:
+                logger.warning(f"{self.name}: could not fetch {rss_url}: {e}")
+                return []
+
+        feed = parse_with_feedparser(rss_url)
+        items = []
+
+        for entry in feed.entries:
+            # Parse published time safely
+            if hasattr(entry, "published_parsed") and entry.published_parsed:
+                published_dt = datetime(*entry.published_parsed[:6]).replace(tzinfo=timezone.utc)
+            else:
+                continue
+
+            # Filter by time
+            if published_dt < cutoff_time:
+                continue
+
+            # Get GUID or use link as fallback
+            guid = entry.get("id") or entry.get("link")
+            if not guid or (seen is not None and guid in seen):
+                continue
+
+            # Extract category from tags if available
+            category = None
+            if hasattr(entry, "tags") and entry.tags:
+                category = entry.tags[0].get("term")
+
+            items.append(
+                ScrapedItem(
+                    external_id=guid,
+                    title=entry.get("title", ""),
+                    url=entry.get("link", ""),
+                    description=entry.get("summary", ""),
+                    published_at=published_dt,
+                    category=category,
+                )
+            )
+
+        return items
+
+    def fetch_content(self, item) -> Optional[str]:
+        """Convert the item's page to markdown."""
+        return self.url_to_markdown(item.url)
+
+    def url_to_markdown(self, url: str) -> Optional[str]:
+        """Fetch a page through the shared HTTP client and convert it to markdown."""
+        try:
+            response = get_http_client().get(url)
+            result = self.converter.convert(document_stream(response))
+            return result.document.export_to_markdown()
+        except Exception:
+            return None
+
+
+def document_stream(response):
+    """Wrap a fetched page as a docling DocumentStream, named so docling picks its format."""
+    from docling.datamodel.base_models import DocumentStream
+
+    return DocumentStream(name=_document_name(response), stream=BytesIO(response.content))
+
+
+def _document_name(response) -> str:
+    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+    stem = PurePosixPath(urlsplit(response.url).path).name or "index"
+    extension = DOCUMENT_EXTENSIONS.get(content_type)
+    if extension is None:
+        return stem if "." in stem else f"{stem}.html"
+    return f"{PurePosixPath(stem).stem}{extension}"
+
+if __name__ == "__main__":
+    from app.scrapers.registry import load_sources
+
+    for source in load_sources():
+        if isinstance(source, RSSSource):
+            items = source.get_items(hours=100)
+            print(f"{source.name}: {len(items)} items")
+            for item in items[:5]:
+                print(f"  - {item.title}")
@@ -0,0 +1,92 @@
+"""Persisted set of the external ids already stored for each source.
+
+With long lookback windows most scraped entries are already in
+`content_items`; building a `ScrapedItem` for each and letting
+`bulk_create_content_items` discover that costs a model per entry and IN
+lookups per run. `SeenIds` keeps a sorted array of 64-bit hashes of every
+stored id per source in the `seen_ids` table, so sources can skip known
+entries before building models and only likely-new items reach the database.
+
+Unlike a Bloom filter, a false positive would need a 64-bit hash collision
+(about n / 2**64 per lookup), so new items are not silently dropped. The
+array is rebuilt from `content_items` every SEEN_IDS_REBUILD_HOURS, which
+also forgets ids whose rows were deleted.
+"""
+import hashlib
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from app.database.repository import Repository
+
+SEEN_IDS_REBUILD_HOURS = float(os.getenv("SEEN_IDS_REBUILD_HOURS", "168"))
+
+
+def id_hash(external_id: str) -> int:
+    """Return the 64-bit hash an external id is stored under."""
+    return int.from_bytes(hashlib.blake2b(external_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _pack(hashes: array) -> bytes:
+    if sys.byteorder == "big":
+        hashes = array("Q", hashes)
+        hashes.byteswap()
+    return hashes.tobytes()
+
+
+def _unpack(data: bytes) -> array:
+    hashes = array("Q")
+    hashes.frombytes(data)
+    if sys.byteorder == "big":
+        hashes.byteswap()
+    return hashes
+
+
+class SeenIds:
+    """Sorted id hashes of one source; supports `external_id in seen`."""
+
+    def __init__(self, source: str, hashes: Optional[array] = None, rebuilt_at: Optional[datetime] = None):
+        self.source = source
+        self.hashes = hashes if hashes is not None else array("Q")
+        self.rebuilt_at = rebuilt_at or datetime.utcnow()
+        self.dirty = False
+
+    def __contains__(self, external_id: str) -> bool:
+        value = id_hash(external_id)
+        index = bisect_left(self.hashes, value)
+        return index < len(self.hashes) and self.hashes[index] == value
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def add_many(self, external_ids: Iterable[str]) -> int:
+        """Add ids (e.g. of items just stored); returns how many were new."""
+        new = {id_hash(external_id) for external_id in external_ids}.difference(self.hashes)
+        if new:
+            self.hashes = array("Q", sorted(new.union(self.hashes)))
+            self.dirty = True
+        return len(new)
+
+    @classmethod
+    def rebuild(cls, repo: Repository, source: str) -> "SeenIds":
+        """Build the set from every id stored for `source`."""
+        seen = cls(source, array("Q", sorted({id_hash(external_id) for external_id in repo.iter_external_ids(source)})))
+        seen.dirty = True
+        return seen
+
+    @classmethod
+    def load(cls, repo: Repository, source: str, max_age_hours: float = SEEN_IDS_REBUILD_HOURS) -> "SeenIds":
+        """Load the persisted set of `source`, rebuilding it if missing or older than `max_age_hours`."""
+        row = repo.get_seen_ids(source)
+        if row is None or row.rebuilt_at < datetime.utcnow() - timedelta(hours=max_age_hours):
+            return cls.rebuild(repo, source)
+        return cls(source, _unpack(row.hashes), row.rebuilt_at)
+
+    def save(self, repo: Repository) -> None:
+        """Persist the set if it changed since it was loaded."""
+        if self.dirty:
+            repo.save_seen_ids(self.source, _pack(self.hashes), len(self.hashes), self.rebuilt_at)
+            self.dirty = False
@@ -0,0 +1,153 @@
+"""Segment timing of transcripts, stored column-wise next to their text.
+
+A transcript is digested as one string (`ContentItem.content`, the segment
+texts joined by spaces), but chunking it by time or linking to the moment a
+passage is spoken needs each segment's start and duration. `TranscriptSegments`
+keeps them as three packed uint32 arrays in the `transcript_segments` table:
+
+- starts: start of each segment, in milliseconds
+- durations: how long each segment is shown, in milliseconds
+- offsets: character offset of each segment in the stored text, plus one
+  final offset past the end, so segment i is
+  `text[offsets[i]:offsets[i + 1] - 1]` (the -1 drops the joining space)
+
+The text itself is not duplicated, and segments or time chunks are slices of
+it. Nothing has to be re-fetched or re-tokenised.
+"""
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+class Segment(NamedTuple):
+    start: float  # Seconds
+    duration: float
+    text: str
+
+
+class TranscriptChunk(NamedTuple):
+    start: float  # Seconds; start of the first segment
+    end: float  # End of the last segment
+    text: str
+
+
+def _pack(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array("I", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack(data: bytes) -> array:
+    values = array("I")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def timestamp_url(url: str, seconds: float) -> str:
+    """Return `url` with a `t=<seconds>s` parameter, which YouTube players start at."""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != "t"]
+    query.append(("t", f"{int(seconds)}s"))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class TranscriptSegments:
+    """Start, duration and text offset of every segment of one transcript.
+
+    Args:
+        starts: Segment starts in milliseconds
+        durations: Segment durations in milliseconds
+        offsets: Text offsets, one more than there are segments
+        language: Language code of the transcript, e.g. "en"
+        is_generated: Whether the transcript was generated by speech recognition
+    """
+
+    def __init__(
+        self,
+        starts: array,
+        durations: array,
+        offsets: array,
+        language: Optional[str] = None,
+        is_generated: Optional[bool] = None,
+    ):
+        self.starts = starts
+        self.durations = durations
+        self.offsets = offsets
+        self.language = language
+        self.is_generated = is_generated
+
+    @classmethod
+    def from_segments(
+        cls, segments: Iterable[Tuple[str, float, float]], language: Optional[str] = None, is_generated: Optional[bool] = None
+    ) -> Tuple[str, "TranscriptSegments"]:
+        """Join (text, start, duration) segments into the stored text and its segment timing."""
+        starts, durations, offsets = array("I"), array("I"), array("I")
+        texts = []
+        position = 0
+        for text, start, duration in segments:
+            starts.append(round(start * 1000))
+            durations.append(round(duration * 1000))
+            offsets.append(position)
+            texts.append(text)
+            position += len(text) + 1
+        offsets.append(position)
+        return " ".join(texts), cls(starts, durations, offsets, language, is_generated)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _end(self, index: int) -> float:
+        return (self.starts[index] + self.durations[index]) / 1000
+
+    def segments(self, text: str) -> Iterator[Segment]:
+        """Yield each segment with its text sliced from the stored `text`."""
+        for i in range(len(self)):
+            yield Segment(self.starts[i] / 1000, self.durations[i] / 1000, text[self.offsets[i] : self.offsets[i + 1] - 1])
+
+    def segment_at(self, seconds: float) -> Optional[int]:
+        """Return the index of the last segment starting at or before `seconds`."""
+        index = bisect_right(self.starts, seconds * 1000) - 1
+        return index if index >= 0 else None
+
+    def chunks(self, text: str, seconds: float = 300.0) -> List[TranscriptChunk]:
+        """Split the transcript into runs of whole segments spanning about `seconds` each.
+
+        A chunk closes at the first segment starting `seconds` or more after
+        the chunk's own start, so chunks follow pauses in the video rather than
+        a fixed grid.
+        """
+        chunks = []
+        first = 0
+        window = seconds * 1000
+        for i in range(1, len(self) + 1):
+            if i == len(self) or self.starts[i] - self.starts[first] >= window:
+                chunks.append(
+                    TranscriptChunk(
+                        self.starts[first] / 1000,
+                        max(self._end(j) for j in range(first, i)),
+                        text[self.offsets[first] : self.offsets[i] - 1],
+                    )
+                )
+                first = i
+        return chunks
+
+    def to_row(self) -> dict:
+        """Return the packed columns for `Repository.bulk_save_transcript_segments`."""
+        return {
+            "language": self.language,
+            "is_generated": self.is_generated,
+            "count": len(self),
+            "starts": _pack(self.starts),
+            "durations": _pack(self.durations),
+            "offsets": _pack(self.offsets),
+        }
+
+    @classmethod
+    def from_row(cls, row) -> "TranscriptSegments":
+        """Unpack a `TranscriptSegmentSet` row."""
+        return cls(_unpack(row.starts), _unpack(row.durations), _unpack(row.offsets), row.language, row.is_generated)
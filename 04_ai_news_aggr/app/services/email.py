@@ -1,66 +1,33 @@
+import logging
 import os
 import smtplib
+import time
+from dataclasses import dataclass, field
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from html import escape
-from typing import List, Optional
+from email.utils import formatdate, make_msgid
+from typing import Callable, Dict, Iterable, List, Optional
 
 import markdown
 from dotenv import load_dotenv
 
+from app.services.templates import render_digest_html, render_markdown_page
+
 load_dotenv()
 
 MY_EMAIL = os.getenv("MY_EMAIL")
 APP_PASSWORD = os.getenv("APP_PASSWORD")
 
+logger = logging.getLogger(__name__)
+
+# Errors that mean the connection is gone and the send should be retried on a new one
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
 
 def markdown_to_html(markdown_text: str) -> str:
     """Convert markdown text to HTML with styling."""
     html_content = markdown.markdown(markdown_text, extensions=["extra", "nl2br"])
-
-    html_template = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {{
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-        }}
-        a {{
-            color: #0066cc;
-            text-decoration: none;
-        }}
-        a:hover {{
-            text-decoration: underline;
-        }}
-        h2 {{
-            color: #222;
-            border-bottom: 2px solid #0066cc;
-            padding-bottom: 10px;
-        }}
-        h3 {{
-            color: #444;
-            margin-top: 20px;
-        }}
-        hr {{
-            border: none;
-            border-top: 2px solid #ddd;
-            margin: 30px 0;
-        }}
-    </style>
-</head>
-<body>
-    {html_content}
-</body>
-</html>"""
-
-    return html_template
+    return render_markdown_page(html_content)
 
 
 def digest_to_html(digest_response) -> str:
@@ -81,83 +48,185 @@ def digest_to_html(digest_response) -> str:
             return markdown_to_html(digest_response.to_markdown())
         return markdown_to_html(str(digest_response))
 
-    # Build HTML for EmailDigestResponse
-    articles_html = []
-
-    # Add greeting and introduction
-    greeting = escape(digest_response.introduction.greeting)
-    introduction = escape(digest_response.introduction.introduction)
-
-    articles_html.append(f"<h1>{greeting}</h1>")
-    articles_html.append(f"<p>{introduction}</p>")
-    articles_html.append("<hr>")
-
-    # Add articles
-    for article in digest_response.articles:
-        title = escape(article.title)
-        score = article.relevance_score
-        article_type = escape(article.article_type)
-        summary = escape(article.summary)
-        url = escape(article.url)
-        reasoning = article.reasoning or ""
-        if reasoning:
-            reasoning = escape(reasoning)
-
-        articles_html.append(f"<h3>#{article.rank}. {title}</h3>")
-        articles_html.append(f"<p><strong>Score:</strong> {score}/10 | <strong>Type:</strong> {article_type}</p>")
-        articles_html.append(f"<p>{summary}</p>")
-        articles_html.append(f'<p><a href="{url}">Read more →</a></p>')
-        if reasoning:
-            articles_html.append(f"<p><em>Why curated: {reasoning}</em></p>")
-        articles_html.append("<hr>")
-
-    articles_content = "\n".join(articles_html)
-
-    html_template = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {{
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-        }}
-        a {{
-            color: #0066cc;
-            text-decoration: none;
-        }}
-        a:hover {{
-            text-decoration: underline;
-        }}
-        h1 {{
-            color: #0066cc;
-            margin-bottom: 10px;
-        }}
-        h3 {{
-            color: #222;
-            margin-top: 20px;
-        }}
-        hr {{
-            border: none;
-            border-top: 2px solid #ddd;
-            margin: 30px 0;
-        }}
-        strong {{
-            color: #222;
-        }}
-    </style>
-</head>
-<body>
-    {articles_content}
-</body>
-</html>"""
-
-    return html_template
+    return render_digest_html(digest_response)
+
+
+@dataclass
+class OutgoingMessage:
+    """One personalised email for a single recipient."""
+
+    recipient: str
+    subject: str
+    body_text: str
+    body_html: Optional[str] = None
+
+
+@dataclass
+class DeliveryReport:
+    """Outcome of a batch send: who received it and why the others did not."""
+
+    sent: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    connections: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+class EmailDeliveryError(Exception):
+    """Raised when no recipient of a send could be delivered to."""
+
+    def __init__(self, report: DeliveryReport):
+        super().__init__(f"Failed to deliver to: {', '.join(f'{r} ({e})' for r, e in report.failed.items())}")
+        self.report = report
+
+
+def build_message(sender: str, message: OutgoingMessage) -> MIMEMultipart:
+    """Build a multipart/alternative MIME message addressed to one recipient."""
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = message.subject
+    msg["From"] = sender
+    msg["To"] = message.recipient
+    msg["Date"] = formatdate(localtime=True)
+    msg["Message-ID"] = make_msgid()
+    msg.attach(MIMEText(message.body_text, "plain"))
+    if message.body_html:
+        msg.attach(MIMEText(message.body_html, "html"))
+    return msg
+
+
+class SMTPMailer:
+    """Sends a batch of messages over one authenticated SMTP connection.
+
+    The connection is opened lazily and re-established if the server drops it
+    mid-batch. Sends are spaced to at most `rate_per_second`, and failures are
+    recorded per recipient instead of aborting the batch.
+    """
+
+    def __init__(
+        self,
+        host: str = "smtp.gmail.com",
+        port: int = 465,
+        security: str = "ssl",
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        sender: Optional[str] = None,
+        rate_per_second: float = 0,
+        max_reconnects: int = 2,
+        timeout: float = 30,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if security not in ("ssl", "starttls", "none"):
+            raise ValueError(f"Unknown SMTP security mode: {security}")
+        self.host = host
+        self.port = port
+        self.security = security
+        self.username = username
+        self.password = password
+        self.sender = sender or username
+        self.rate_per_second = rate_per_second
+        self.max_reconnects = max_reconnects
+        self.timeout = timeout
+        self._sleep = sleep
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_send = 0.0
+        self.connections = 0
+
+    @classmethod
+    def from_env(cls, **overrides) -> "SMTPMailer":
+        """Create a mailer from SMTP_* variables, defaulting to Gmail with MY_EMAIL/APP_PASSWORD."""
+        settings = {
+            "host": os.getenv("SMTP_HOST", "smtp.gmail.com"),
+            "port": int(os.getenv("SMTP_PORT", "465")),
+            "security": os.getenv("SMTP_SECURITY", "ssl").lower(),
+            "username": os.getenv("SMTP_USERNAME", MY_EMAIL),
+            "password": os.getenv("SMTP_PASSWORD", APP_PASSWORD),
+            "sender": os.getenv("EMAIL_SENDER", MY_EMAIL),
+            "rate_per_second": float(os.getenv("EMAIL_RATE_PER_SECOND", "5")),
+            "timeout": float(os.getenv("SMTP_TIMEOUT", "30")),
+        }
+        return cls(**{**settings, **overrides})
+
+    def __enter__(self) -> "SMTPMailer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def connect(self) -> None:
+        """Open and authenticate a connection, replacing any existing one."""
+        self.close()
+        if self.security == "ssl":
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.security == "starttls":
+                server.starttls()
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        self._server = server
+        self.connections += 1
+
+    def close(self) -> None:
+        """Quit the current connection, ignoring errors from an already-dead socket."""
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+
+    def _throttle(self) -> None:
+        if self.rate_per_second <= 0:
+            return
+        wait = self._last_send + 1 / self.rate_per_second - time.monotonic()
+        if wait > 0:
+            self._sleep(wait)
+        self._last_send = time.monotonic()
+
+    def send(self, message: OutgoingMessage) -> None:
+        """Send one message, reconnecting if the connection has dropped.
+
+        Raises:
+            smtplib.SMTPException: If the server rejects the message or reconnects are exhausted
+        """
+        payload = build_message(self.sender, message).as_string()
+        self._throttle()
+        for attempt in range(self.max_reconnects + 1):
+            if self._server is None:
+                self.connect()
+            try:
+                self._server.sendmail(self.sender, [message.recipient], payload)
+                return
+            except _CONNECTION_ERRORS:
+                self._server.close()
+                self._server = None
+                if attempt == self.max_reconnects:
+                    raise
+                logger.warning(f"SMTP connection dropped, reconnecting (attempt {attempt + 1})")
+
+    def send_batch(self, messages: Iterable[OutgoingMessage]) -> DeliveryReport:
+        """Send every message over the shared connection.
+
+        Returns:
+            DeliveryReport listing delivered recipients and per-recipient errors
+        """
+        report = DeliveryReport()
+        connections_before = self.connections
+        for message in messages:
+            try:
+                self.send(message)
+                report.sent.append(message.recipient)
+            except smtplib.SMTPAuthenticationError:
+                # Every later message would fail the same way
+                raise
+            except (smtplib.SMTPException, OSError) as e:
+                logger.error(f"Failed to send email to {message.recipient}: {e}")
+                report.failed[message.recipient] = str(e)
+        report.connections = self.connections - connections_before
+        return report
 
 
 def send_email(
@@ -165,8 +234,8 @@ def send_email(
     body_text: str,
     body_html: Optional[str] = None,
     recipients: Optional[List[str]] = None,
-) -> None:
-    """Send email via Gmail SMTP.
+) -> DeliveryReport:
+    """Send email via SMTP, one message per recipient over a single connection.
 
     Args:
         subject: Email subject
@@ -174,8 +243,12 @@ def send_email(
         body_html: Optional HTML email body
         recipients: List of recipient emails (default: [MY_EMAIL])
 
+    Returns:
+        DeliveryReport with per-recipient outcomes
+
     Raises:
         ValueError: If email config is missing or recipients list is empty
+        EmailDeliveryError: If no recipient could be delivered to
     """
     if not MY_EMAIL or not APP_PASSWORD:
         raise ValueError("MY_EMAIL or APP_PASSWORD not configured in environment variables")
@@ -186,27 +259,13 @@ def send_email(
     if not recipients:
         raise ValueError("Recipients list cannot be empty")
 
-    # Create message
-    msg = MIMEMultipart("alternative")
-    msg["Subject"] = subject
-    msg["From"] = MY_EMAIL
-    msg["To"] = ", ".join(recipients)
-
-    # Attach plain text
-    msg.attach(MIMEText(body_text, "plain"))
+    messages = [OutgoingMessage(recipient, subject, body_text, body_html) for recipient in recipients]
+    with SMTPMailer.from_env() as mailer:
+        report = mailer.send_batch(messages)
 
-    # Attach HTML if provided
-    if body_html:
-        msg.attach(MIMEText(body_html, "html"))
-
-    # Send via Gmail
-    try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(MY_EMAIL, APP_PASSWORD)
-            server.sendmail(MY_EMAIL, recipients, msg.as_string())
-    except Exception as e:
-        print(f"Failed to send email: {e}")
-        raise
+    if not report.sent:
+        raise EmailDeliveryError(report)
+    return report
 
 
 def send_email_to_self(subject: str, body: str) -> None:
@@ -0,0 +1,397 @@
+"""Local embedding index for digest summaries.
+
+Vectors live in an append-only float32 file that is memory-mapped for search,
+with ids in a parallel text file, so adding digests never rewrites the index
+and a 100k x 256 index costs ~100MB of page cache rather than heap. Top-k
+search is a batched matrix product over row chunks. Appends from several
+processes are serialised by a lock file next to the index.
+
+The index backs the related-articles endpoint, the semantic near-duplicate
+check after digesting, and profile-similarity pre-ranking before the curator.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.database.locks import file_lock
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = Path(__file__).parent.parent.parent / "data" / "embeddings"
+SEARCH_CHUNK_ROWS = 65536
+
+# Cosine similarity above which two digest summaries are treated as the same story
+SEMANTIC_DUPLICATE_THRESHOLD = 0.9
+# New digests compared with each other in one matrix (2048^2 float32 scores = 16MB)
+INDEX_BATCH_ROWS = 2048
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """Deterministic, offline embedder using signed feature hashing of words and bigrams.
+
+    Good enough for tests, replays and lexical similarity; no network or model download.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _features(self, text: str) -> Iterable[str]:
+        words = _WORD_RE.findall(text.lower())
+        yield from words
+        yield from (f"{a} {b}" for a, b in zip(words, words[1:]))
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                sign = 1.0 if digest & 1 else -1.0
+                vectors[row, (digest >> 1) % self.dim] += sign
+        return normalize(vectors)
+
+
+class OpenAIEmbedder:
+    """Embeddings from the OpenAI API, requested in batches."""
+
+    name = "openai"
+
+    def __init__(self, model: str = "text-embedding-3-small", dim: int = 512, batch_size: int = 128):
+        from openai import OpenAI
+
+        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.model = model
+        self.dim = dim
+        self.batch_size = batch_size
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=list(texts[start : start + self.batch_size]),
+                dimensions=self.dim,
+            )
+            vectors.extend(item.embedding for item in response.data)
+        return normalize(np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim))
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise rows so dot products are cosine similarities."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+def get_embedder():
+    """Return the embedder selected by EMBEDDING_BACKEND ("hashing" or "openai")."""
+    backend = os.getenv("EMBEDDING_BACKEND", "hashing").lower()
+    dim = int(os.getenv("EMBEDDING_DIM", "256" if backend == "hashing" else "512"))
+    if backend == "openai":
+        return OpenAIEmbedder(dim=dim)
+    return HashingEmbedder(dim=dim)
+
+
+class EmbeddingIndex:
+    """Append-only, memory-mapped matrix of unit vectors keyed by string id."""
+
+    def __init__(self, path: Path, dim: int, embedder_name: str = "hashing"):
+        self.path = Path(path)
+        self.dim = dim
+        self.embedder_name = embedder_name
+        self._vectors_file = self.path / "vectors.f32"
+        self._ids_file = self.path / "ids.txt"
+        self._lock_file = self.path / "index.lock"
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._load()
+
+    def _load(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        meta_file = self.path / "meta.json"
+        if meta_file.exists():
+            meta = json.loads(meta_file.read_text())
+            if meta["dim"] != self.dim or meta["embedder"] != self.embedder_name:
+                raise ValueError(
+                    f"Index at {self.path} was built with {meta['embedder']}/{meta['dim']}, "
+                    f"not {self.embedder_name}/{self.dim}"
+                )
+        else:
+            meta_file.write_text(json.dumps({"dim": self.dim, "embedder": self.embedder_name}))
+
+        with file_lock(str(self._lock_file)):
+            self._sync()
+        self._remap()
+
+    def _sync(self) -> None:
+        """Read the ids on disk and repair a torn append (call with the file lock held).
+
+        Vectors are written before ids, so an interrupted append leaves vectors,
+        or part of one, without an id, and possibly a partial last id line. Later
+        appends would land after them and pair every new id with the wrong row,
+        so both files are cut back to the rows they have in common.
+        """
+        raw = self._ids_file.read_text() if self._ids_file.exists() else ""
+        # Only newline-terminated ids are complete
+        ids = raw.split("\n")[:-1]
+        row_bytes = 4 * self.dim
+        vector_bytes = self._vectors_file.stat().st_size if self._vectors_file.exists() else 0
+        ids = ids[: vector_bytes // row_bytes]
+
+        if vector_bytes != len(ids) * row_bytes:
+            logger.warning(f"Truncating torn append in {self._vectors_file} to {len(ids)} rows")
+            os.truncate(self._vectors_file, len(ids) * row_bytes)
+        complete = "".join(f"{item_id}\n" for item_id in ids)
+        if len(raw) != len(complete):
+            self._ids_file.write_text(complete)
+        self._ids = ids
+        self._rows = {item_id: row for row, item_id in enumerate(ids)}
+
+    def _remap(self) -> None:
+        rows = len(self._ids)
+        if rows == 0:
+            self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        else:
+            self._matrix = np.memmap(self._vectors_file, dtype=np.float32, mode="r", shape=(rows, self.dim))
+
+    def refresh(self) -> None:
+        """Pick up vectors appended by another process (e.g. the pipeline while the API serves)."""
+        stored_rows = self._vectors_file.stat().st_size // (4 * self.dim) if self._vectors_file.exists() else 0
+        if stored_rows != len(self._ids):
+            with self._lock:
+                self._load()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> int:
+        """Append vectors for ids not already in the index.
+
+        Returns:
+            Number of vectors added
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        with self._lock, file_lock(str(self._lock_file)):
+            # Another process may have appended since this one last looked
+            self._sync()
+            fresh = [row for row, item_id in enumerate(ids) if item_id not in self._rows]
+            # Drop repeats within the batch too, keeping the first occurrence
+            seen = set()
+            fresh = [row for row in fresh if not (ids[row] in seen or seen.add(ids[row]))]
+            if not fresh:
+                self._remap()
+                return 0
+
+            with open(self._vectors_file, "ab") as handle:
+                handle.write(np.ascontiguousarray(vectors[fresh]).tobytes())
+            with open(self._ids_file, "a") as handle:
+                handle.write("".join(f"{ids[row]}\n" for row in fresh))
+
+            for row in fresh:
+                self._rows[ids[row]] = len(self._ids)
+                self._ids.append(ids[row])
+            self._remap()
+            return len(fresh)
+
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        """Return the stored vector for an id, or None."""
+        row = self._rows.get(item_id)
+        return None if row is None else np.array(self._matrix[row])
+
+    def search(
+        self, queries: np.ndarray, k: int = 10, exclude: Optional[Sequence[set]] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """Return the top-k (id, cosine score) pairs for each query vector.
+
+        Args:
+            queries: (m, dim) array of unit vectors
+            k: Number of results per query
+            exclude: Optional per-query sets of ids to leave out (e.g. the query's own id)
+
+        Returns:
+            One list of (id, score) pairs per query, best first
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        matrix = self._matrix
+        total = matrix.shape[0]
+        if total == 0:
+            return [[] for _ in range(len(queries))]
+
+        extra = max((len(excluded) for excluded in exclude), default=0) if exclude else 0
+        want = min(k + extra, total)
+
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, total, SEARCH_CHUNK_ROWS):
+            chunk = matrix[start : start + SEARCH_CHUNK_ROWS]
+            scores = queries @ chunk.T
+            take = min(want, scores.shape[1])
+            top = np.argpartition(-scores, take - 1, axis=1)[:, :take]
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            best_rows = np.concatenate([best_rows, top + start], axis=1)
+            if best_scores.shape[1] > want:
+                keep = np.argpartition(-best_scores, want - 1, axis=1)[:, :want]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        results = []
+        for query_index in range(len(queries)):
+            excluded = exclude[query_index] if exclude else set()
+            hits = []
+            for position in order[query_index]:
+                item_id = self._ids[best_rows[query_index, position]]
+                if item_id in excluded:
+                    continue
+                hits.append((item_id, float(best_scores[query_index, position])))
+                if len(hits) == k:
+                    break
+            results.append(hits)
+        return results
+
+    def related(self, item_id: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Return the k nearest neighbours of a stored item, excluding itself."""
+        vector = self.get(item_id)
+        if vector is None:
+            return []
+        return self.search(vector[None, :], k=k, exclude=[{item_id}])[0]
+
+
+@lru_cache(maxsize=None)
+def get_embedding_index() -> EmbeddingIndex:
+    """Return the process-wide digest embedding index (EMBEDDING_INDEX_DIR)."""
+    embedder = get_embedder()
+    path = Path(os.getenv("EMBEDDING_INDEX_DIR", str(DEFAULT_INDEX_DIR)))
+    return EmbeddingIndex(path, dim=embedder.dim, embedder_name=embedder.name)
+
+
+def index_new_digests(repo, digests, index: Optional[EmbeddingIndex] = None, embedder=None) -> dict:
+    """Embed digests missing from the index and link semantic near-duplicates.
+
+    Each digest is compared with everything indexed before it, including the
+    digests ahead of it in `digests`; a match above SEMANTIC_DUPLICATE_THRESHOLD
+    moves it into the match's near-duplicate cluster, catching rewrites that
+    share too few shingles for MinHash. Digests are handled INDEX_BATCH_ROWS
+    at a time: one batched search of the index, one similarity matrix within
+    the batch, one cluster lookup and one append.
+
+    Args:
+        repo: Repository used to read and update near-duplicate clusters
+        digests: Digest rows to index
+        index: Embedding index (default: the process-wide index)
+        embedder: Embedder matching the index (default: from EMBEDDING_BACKEND)
+
+    Returns:
+        Dictionary with stats: indexed, semantic_duplicates
+    """
+    index = get_embedding_index() if index is None else index
+    embedder = get_embedder() if embedder is None else embedder
+    fresh = [digest for digest in digests if digest.id not in index]
+    if not fresh:
+        return {"indexed": 0, "semantic_duplicates": 0}
+
+    semantic_duplicates = 0
+    for start in range(0, len(fresh), INDEX_BATCH_ROWS):
+        semantic_duplicates += _index_batch(repo, index, embedder, fresh[start : start + INDEX_BATCH_ROWS])
+
+    repo.session.commit()
+    return {"indexed": len(fresh), "semantic_duplicates": semantic_duplicates}
+
+
+def _index_batch(repo, index: EmbeddingIndex, embedder, digests) -> int:
+    """Index one batch of new digests; returns how many joined another cluster."""
+    ids = [digest.id for digest in digests]
+    vectors = embedder.embed([digest_text(digest.title, digest.summary) for digest in digests])
+    hits = index.search(vectors, k=1)
+    # Similarity of each digest to those before it in the batch
+    in_batch = vectors @ vectors.T
+    in_batch[np.triu_indices(len(ids))] = -np.inf
+    earlier = in_batch.argmax(axis=1)
+
+    matches = {}
+    for row, item_id in enumerate(ids):
+        candidates = hits[row][:1] + ([(ids[earlier[row]], float(in_batch[row, earlier[row]]))] if row else [])
+        match = max(candidates, key=lambda candidate: candidate[1], default=None)
+        if match is not None and match[1] >= SEMANTIC_DUPLICATE_THRESHOLD:
+            matches[item_id] = match
+
+    clusters = repo.get_cluster_ids(list(set(ids).union(match_id for match_id, _ in matches.values())))
+    semantic_duplicates = 0
+    for item_id, (match_id, score) in matches.items():
+        if item_id not in clusters:
+            continue
+        # Earlier digests of the batch may have moved already, so read their cluster from `clusters`
+        match_cluster = clusters.get(match_id, match_id)
+        if match_cluster != clusters[item_id]:
+            repo.assign_cluster(item_id, match_cluster)
+            clusters[item_id] = match_cluster
+            semantic_duplicates += 1
+            logger.info(f"Semantic near-duplicate: {item_id} joins cluster {match_cluster} ({score:.2f})")
+
+    index.add(ids, vectors)
+    return semantic_duplicates
+
+
+def digest_text(title: str, summary: str) -> str:
+    """Text embedded for a digest."""
+    return f"{title}\n{summary}"
+
+
+def profile_text(profile: dict) -> str:
+    """Text embedded for a user profile: background plus interests."""
+    interests = "\n".join(profile.get("interests", []))
+    return f"{profile.get('title', '')}\n{profile.get('background', '')}\n{interests}"
+
+
+def embed_digests(digests: List[dict], embedder=None) -> np.ndarray:
+    """Embed digest dictionaries (title + summary) in one batch."""
+    embedder = get_embedder() if embedder is None else embedder
+    return embedder.embed([digest_text(d.get("title", ""), d.get("summary", "")) for d in digests])
+
+
+def prerank_digests(
+    digests: List[dict], profile: dict, limit: int, embedder=None, digest_vectors: Optional[np.ndarray] = None
+) -> List[dict]:
+    """Keep the `limit` digests most similar to the profile, preserving their input order.
+
+    Cuts the curator prompt (and LLM cost) when there are many candidates. Returns
+    the input unchanged when it already fits. Pass `digest_vectors` from
+    `embed_digests` to share one embedding pass across several profiles.
+    """
+    if len(digests) <= limit:
+        return digests
+    embedder = get_embedder() if embedder is None else embedder
+    vectors = embed_digests(digests, embedder) if digest_vectors is None else digest_vectors
+    profile_vector = embedder.embed([profile_text(profile)])[0]
+    scores = vectors @ profile_vector
+    keep = set(np.argpartition(-scores, limit - 1)[:limit].tolist())
+    logger.info(f"Pre-ranked {len(digests)} digests down to {limit} by profile similarity")
+    return [digest for index, digest in enumerate(digests) if index in keep]
+
+
+if __name__ == "__main__":
+    # Backfill the index from every stored digest
+    from app.database.connection import session_scope
+    from app.database.repository import Repository
+
+    logging.basicConfig(level=logging.INFO)
+    with session_scope() as session:
+        repo = Repository(session=session)
+        stats = index_new_digests(repo, repo.get_latest_digests(limit=None, columns=("id", "title", "summary")))
+    print(f"Indexed {stats['indexed']} digests ({stats['semantic_duplicates']} semantic near-duplicates)")
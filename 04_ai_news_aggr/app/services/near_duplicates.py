@@ -0,0 +1,279 @@
+"""Near-duplicate detection across sources.
+
+The same announcement often shows up in several feeds. Every stored item gets a
+MinHash signature over word shingles of its normalised title and content, and
+locality-sensitive hashing (LSH) bands point it at likely duplicates with an
+indexed lookup instead of a scan. Items whose estimated Jaccard similarity
+clears the threshold join the existing cluster, so only one representative per
+cluster is digested and ranked.
+
+Items are fingerprinted when the scrape stores them (app.runner), from the
+title and feed description. Content fetched later (transcripts, article pages)
+is not fingerprinted, so for those sources clusters rest on title and blurb.
+"""
+import hashlib
+import logging
+import random
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.database.repository import Repository
+
+logger = logging.getLogger(__name__)
+
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 32  # 32 bands x 4 rows: ~50% chance of becoming a candidate at Jaccard 0.42
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_TAG_RE = re.compile(r"<[^>]+>")
+_URL_RE = re.compile(r"https?://\S+")
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalise(title: str, content: Optional[str]) -> List[str]:
+    """Lowercase title + content and strip markup and URLs, returning word tokens."""
+    text = f"{title or ''} {content or ''}".lower()
+    text = _URL_RE.sub(" ", _TAG_RE.sub(" ", text))
+    return _WORD_RE.findall(text)
+
+
+def shingles(tokens: List[str], size: int = SHINGLE_SIZE) -> Set[str]:
+    """Return the set of word n-grams (falling back to single words for short texts)."""
+    if len(tokens) < size:
+        return set(tokens)
+    return {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+
+
+class MinHasher:
+    """MinHash signatures using universal hashing (a*x + b) mod p."""
+
+    def __init__(self, num_perm: int = NUM_PERMUTATIONS, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, items: Iterable[str]) -> List[int]:
+        """Compute the MinHash signature of a set of shingles."""
+        hashes = [
+            int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "little") % _MERSENNE_PRIME
+            for item in items
+        ]
+        if not hashes:
+            return [_MERSENNE_PRIME] * self.num_perm
+        return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self.params]
+
+
+def estimate_jaccard(first: List[int], second: List[int]) -> float:
+    """Estimate Jaccard similarity as the fraction of matching signature slots."""
+    return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+
+def band_keys(signature: List[int], bands: int = NUM_BANDS) -> List[str]:
+    """Split a signature into LSH bands and hash each band into a bucket key."""
+    rows = len(signature) // bands
+    keys = []
+    for band in range(bands):
+        chunk = array("Q", signature[band * rows : (band + 1) * rows]).tobytes()
+        keys.append(f"{band}:{hashlib.blake2b(chunk, digest_size=8).hexdigest()}")
+    return keys
+
+
+def pack_signature(signature: List[int]) -> bytes:
+    return array("Q", signature).tobytes()
+
+
+def unpack_signature(data: bytes) -> List[int]:
+    signature = array("Q")
+    signature.frombytes(data)
+    return signature.tolist()
+
+
+class NearDuplicateIndex:
+    """Incrementally clusters items as they are stored, backed by the fingerprint tables."""
+
+    def __init__(self, repo: Repository, threshold: float = SIMILARITY_THRESHOLD, bands: int = NUM_BANDS):
+        self.repo = repo
+        self.threshold = threshold
+        self.bands = bands
+        self.hasher = MinHasher()
+
+    def add(self, article_type: str, article_id: str, title: str, content: Optional[str]) -> str:
+        """Fingerprint one item and assign it to a cluster (see `add_batch`).
+
+        Returns:
+            The cluster id: the item key of the first item seen in the cluster
+        """
+        return self.add_batch(article_type, [(article_id, title, content)])[f"{article_type}:{article_id}"]
+
+    def add_batch(self, article_type: str, items: Sequence[Tuple[str, str, Optional[str]]]) -> Dict[str, str]:
+        """Fingerprint new items and assign each to a cluster (committed by the caller).
+
+        Candidates for the whole batch come from one lookup of its band keys;
+        items of the batch are candidates for those after them, so copies
+        arriving together cluster too. Fingerprints and bands are written
+        with one executemany each.
+
+        Args:
+            article_type: Source name of the items
+            items: (article_id, title, content) of items not fingerprinted yet
+
+        Returns:
+            Cluster id by item key, in input order
+        """
+        keys = [f"{article_type}:{article_id}" for article_id, _, _ in items]
+        signatures = [self.hasher.signature(shingles(normalise(title, content))) for _, title, content in items]
+        bands = [band_keys(signature, self.bands) for signature in signatures]
+
+        members = self.repo.get_band_members(sorted({key for item_bands in bands for key in item_bands}))
+        stored = {key for item_keys in members.values() for key in item_keys}
+        known: Dict[str, Tuple[List[int], str]] = {
+            fingerprint.item_key: (unpack_signature(fingerprint.signature), fingerprint.cluster_id)
+            for fingerprint in self.repo.get_fingerprints(sorted(stored))
+        }
+
+        clusters: Dict[str, str] = {}
+        rows = []
+        for key, (article_id, _, _), signature, item_bands in zip(keys, items, signatures, bands):
+            # Candidates share at least one band bucket; confirm with the signature estimate
+            candidates = {candidate for band in item_bands for candidate in members.get(band, ())}
+            candidates.discard(key)
+            best_cluster, best_score = key, 0.0
+            for candidate in sorted(candidates.intersection(known)):
+                candidate_signature, candidate_cluster = known[candidate]
+                score = estimate_jaccard(signature, candidate_signature)
+                if score >= self.threshold and score > best_score:
+                    best_cluster, best_score = candidate_cluster, score
+
+            clusters[key] = best_cluster
+            known[key] = (signature, best_cluster)
+            for band in item_bands:
+                members.setdefault(band, []).append(key)
+            rows.append(
+                {
+                    "item_key": key,
+                    "article_type": article_type,
+                    "article_id": article_id,
+                    "signature": pack_signature(signature),
+                    "cluster_id": best_cluster,
+                    "band_keys": item_bands,
+                }
+            )
+
+        self.repo.bulk_create_fingerprints(rows)
+        return clusters
+
+    def add_many(self, article_type: str, items: List[dict], id_field: str, content_field: str) -> dict:
+        """Fingerprint newly stored items, skipping ones already indexed.
+
+        Args:
+            article_type: Source name of the items
+            items: Item dictionaries as passed to `bulk_create_content_items`
+            id_field: Key holding the item id ("external_id")
+            content_field: Key holding the text to fingerprint alongside the title
+
+        Returns:
+            Dictionary with stats: indexed, duplicates
+        """
+        keys = [f"{article_type}:{item[id_field]}" for item in items]
+        known = {fingerprint.item_key for fingerprint in self.repo.get_fingerprints(keys)}
+
+        fresh = []
+        for key, item in zip(keys, items):
+            if key not in known:
+                known.add(key)
+                fresh.append((item[id_field], item.get("title", ""), item.get(content_field)))
+
+        clusters = self.add_batch(article_type, fresh)
+        duplicates = 0
+        for key, cluster_id in clusters.items():
+            if cluster_id != key:
+                duplicates += 1
+                logger.info(f"Near-duplicate: {key} joins cluster {cluster_id}")
+
+        self.repo.session.commit()
+        return {"indexed": len(clusters), "duplicates": duplicates}
+
+
+def select_representatives(repo: Repository, articles: List[dict]) -> Tuple[List[dict], List[dict]]:
+    """Keep one pending item per near-duplicate cluster.
+
+    An item is skipped when another member of its cluster already has a digest
+    or appears earlier in `articles`. Items without a fingerprint pass through.
+
+    Args:
+        repo: Repository used to look up clusters and digests
+        articles: Pending items from `get_articles_without_digest`
+
+    Returns:
+        Tuple of (items to digest, skipped duplicates). Each duplicate is a copy
+        with "duplicate_of" set to the item key of its cluster's representative
+    """
+    keys = [f"{article['type']}:{article['id']}" for article in articles]
+    clusters: Dict[str, str] = repo.get_cluster_ids(keys)
+    claimed = repo.get_cluster_digests(set(clusters.values()))
+
+    representatives = []
+    duplicates = []
+    for key, article in zip(keys, articles):
+        cluster_id = clusters.get(key)
+        if cluster_id is None:
+            representatives.append(article)
+        elif cluster_id in claimed:
+            duplicates.append({**article, "duplicate_of": claimed[cluster_id]})
+        else:
+            claimed[cluster_id] = key
+            representatives.append(article)
+    return representatives, duplicates
+
+
+def link_duplicates(repo: Repository, duplicates: List[dict]) -> int:
+    """Record skipped duplicates whose representative now has a digest.
+
+    Linked items leave the pending queue and become eligible for retention.
+    Duplicates of a representative whose digest failed stay pending, so a
+    later run can digest one of them instead.
+
+    Args:
+        repo: Repository to write through
+        duplicates: Skipped items from `select_representatives`
+
+    Returns:
+        Number of items linked
+    """
+    keys = {article["duplicate_of"] for article in duplicates}
+    digested = {digest.id for digest in repo.get_digests_by_ids(list(keys), columns=("id",))}
+    links = {
+        f"{article['type']}:{article['id']}": article["duplicate_of"]
+        for article in duplicates
+        if article["duplicate_of"] in digested
+    }
+    repo.mark_duplicates(links)
+    repo.session.commit()
+    return len(links)
+
+
+def collapse_clusters(repo: Repository, digests: List[dict]) -> List[dict]:
+    """Keep the first digest of each near-duplicate cluster, preserving order.
+
+    Args:
+        repo: Repository used to look up clusters
+        digests: Digest dictionaries with an "id" key (the item key)
+
+    Returns:
+        Digests with later members of an already-seen cluster removed
+    """
+    clusters = repo.get_cluster_ids([digest["id"] for digest in digests])
+    seen: Set[str] = set()
+    kept = []
+    for digest in digests:
+        cluster_id = clusters.get(digest["id"], digest["id"])
+        if cluster_id in seen:
+            continue
+        seen.add(cluster_id)
+        kept.append(digest)
+    return kept
@@ -0,0 +1,104 @@
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.scrapers.registry import FetchedContent, Source, load_sources
+from app.database.connection import session_scope
+from app.database.repository import UNAVAILABLE_MARKER, UPDATE_CHUNK, Repository
+
+
+def process_source_content(source: Source, limit: Optional[int] = None) -> dict:
+    """Fetch content (transcripts, page markdown) for stored items of one source.
+
+    Items whose content is not available are left to retry on the next run,
+    or marked with UNAVAILABLE_MARKER for sources that set `mark_unavailable`.
+    Items whose fetch raised (a request failure or an open circuit breaker)
+    count as failed and always stay pending.
+    Transcript segment timing returned in a `FetchedContent` is stored in
+    `transcript_segments`.
+
+    Args:
+        source: Source that fetches content separately from its feed
+        limit: Maximum number of items to process
+
+    Returns:
+        Dictionary with stats: total, processed, unavailable, failed
+    """
+    with session_scope() as session:
+        repo = Repository(session=session)
+
+        # Fetch items without content
+        items = repo.get_items_without_content(source.name, limit, columns=("external_id", "title", "url"))
+
+        contents = {}
+        segments = {}
+        processed = 0
+        unavailable = 0
+        failed = 0
+
+        try:
+            for item in items:
+                try:
+                    content = source.fetch_content(item)
+                except Exception as e:
+                    print(f"Error processing {source.name} item {item.external_id}: {e}")
+                    failed += 1
+                    continue
+
+                if isinstance(content, FetchedContent):
+                    if content.text and content.segments is not None:
+                        segments[item.external_id] = content.segments.to_row()
+                    content = content.text
+
+                if content:
+                    contents[item.external_id] = content
+                    processed += 1
+                elif source.mark_unavailable:
+                    contents[item.external_id] = UNAVAILABLE_MARKER
+                    unavailable += 1
+                else:
+                    print(f"No content fetched for {source.name} item {item.external_id}: {item.title}")
+                    failed += 1
+
+                if len(contents) >= UPDATE_CHUNK:
+                    repo.bulk_save_transcript_segments(source.name, segments)
+                    repo.bulk_update_content(source.name, contents)
+                    contents, segments = {}, {}
+        finally:
+            # Keep what was fetched even if the loop is interrupted
+            repo.bulk_save_transcript_segments(source.name, segments)
+            repo.bulk_update_content(source.name, contents)
+
+    return {
+        "total": len(items),
+        "processed": processed,
+        "unavailable": unavailable,
+        "failed": failed,
+    }
+
+
+def process_content(sources: Optional[List[Source]] = None, limit: Optional[int] = None) -> Dict[str, dict]:
+    """Fetch content for every configured source that fetches it separately.
+
+    Args:
+        sources: Sources to process (default: all configured sources)
+        limit: Maximum number of items to process per source
+
+    Returns:
+        Stats from `process_source_content` by source name
+    """
+    sources = sources if sources is not None else load_sources()
+    return {source.name: process_source_content(source, limit) for source in sources if source.fetches_content}
+
+
+if __name__ == "__main__":
+    for name, stats in process_content().items():
+        print(f"{name} Content Processing Stats:")
+        print(f"  Total: {stats['total']}")
+        print(f"  Processed: {stats['processed']}")
+        print(f"  Unavailable: {stats['unavailable']}")
+        print(f"  Failed: {stats['failed']}")
@@ -9,9 +9,12 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 load_dotenv()
 
-from app.agents.curator_agent import CuratorAgent
+from app.agents.curator_agent import CURATOR_CANDIDATE_LIMIT, CuratorAgent
 from app.profiles.user_profile import USER_PROFILE
-from app.database.repository import Repository
+from app.database.connection import session_scope
+from app.database.repository import DIGEST_CANDIDATE_COLUMNS, Repository
+from app.services.embeddings import prerank_digests
+from app.services.near_duplicates import collapse_clusters
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +25,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+
 def curate_digests(hours: int = 24) -> dict:
     """Curate and rank digests based on user profile.
 
@@ -32,26 +36,32 @@ def curate_digests(hours: int = 24) -> dict:
         Dictionary with stats: total, ranked, and articles list
     """
     curator = CuratorAgent(USER_PROFILE)
-    repo = Repository()
-
-    # Fetch recent digests
-    digests = repo.get_recent_digests(hours=hours)
-
-    if not digests:
-        logger.warning(f"No digests found in the last {hours} hours")
-        return {"total": 0, "ranked": 0, "articles": []}
-
-    # Convert digests to dict format for curator
-    digest_dicts = [
-        {
-            "id": digest.id,
-            "title": digest.title,
-            "summary": digest.summary,
-            "type": digest.article_type,
-            "url": digest.url,
-        }
-        for digest in digests
-    ]
+
+    with session_scope() as session:
+        repo = Repository(session=session)
+
+        # Fetch recent digests
+        digests = repo.get_recent_digests(hours=hours, columns=DIGEST_CANDIDATE_COLUMNS)
+
+        if not digests:
+            logger.warning(f"No digests found in the last {hours} hours")
+            return {"total": 0, "ranked": 0, "articles": []}
+
+        # Convert digests to dict format for curator
+        digest_dicts = [
+            {
+                "id": digest.id,
+                "title": digest.title,
+                "summary": digest.summary,
+                "type": digest.article_type,
+                "url": digest.url,
+            }
+            for digest in digests
+        ]
+        digest_dicts = collapse_clusters(repo, digest_dicts)
+
+    # Only the candidates closest to the profile go to the LLM curator
+    digest_dicts = prerank_digests(digest_dicts, USER_PROFILE, limit=CURATOR_CANDIDATE_LIMIT)
 
     user_name = USER_PROFILE.get("name", "User")
     user_background = USER_PROFILE.get("background", "N/A")
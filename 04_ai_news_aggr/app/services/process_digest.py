@@ -8,7 +8,10 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from app.agents.digest_agent import DigestAgent
+from app.database.connection import session_scope
 from app.database.repository import Repository
+from app.services.embeddings import index_new_digests
+from app.services.near_duplicates import link_duplicates, select_representatives
 
 # Configure logging
 logging.basicConfig(
@@ -26,47 +29,72 @@ def process_digests(limit: Optional[int] = None) -> dict:
         limit: Maximum number of items to process
 
     Returns:
-        Dictionary with stats: total, processed, failed
+        Dictionary with stats: total, processed, failed, duplicates, semantic_duplicates
     """
     agent = DigestAgent()
-    repo = Repository()
 
-    articles = repo.get_articles_without_digest(limit=limit)
+    with session_scope() as session:
+        repo = Repository(session=session)
 
-    logger.info(f"Starting digest generation for {len(articles)} items")
+        pending = repo.get_articles_without_digest(limit=limit)
 
-    processed = 0
-    failed = 0
+        # Only one item per near-duplicate cluster is worth an LLM call
+        articles, duplicates = select_representatives(repo, pending)
+        if duplicates:
+            logger.info(f"Skipping {len(duplicates)} near-duplicates of items already digested or queued")
 
-    for idx, article in enumerate(articles, 1):
-        try:
-            title_display = article.get("title", "Unknown")[:60]
-            logger.info(f"[{idx}/{len(articles)}] Processing: {title_display}")
+        logger.info(f"Starting digest generation for {len(articles)} items")
+
+        processed = 0
+        failed = 0
+        created = []
 
-            digest_output = agent.generate_digest(
-                title=article.get("title", ""),
-                content=article.get("content", ""),
-                article_type=article.get("type", "unknown"),
-            )
+        for idx, article in enumerate(articles, 1):
+            try:
+                title_display = article.get("title", "Unknown")[:60]
+                logger.info(f"[{idx}/{len(articles)}] Processing: {title_display}")
 
-            if digest_output:
-                repo.create_digest(
+                digest_output = agent.generate_digest(
+                    title=article.get("title", ""),
+                    content=article.get("content", ""),
                     article_type=article.get("type", "unknown"),
-                    article_id=article.get("id", ""),
-                    url=article.get("url", ""),
-                    title=digest_output.title,
-                    summary=digest_output.summary,
-                    published_at=article.get("published_at"),
                 )
-                processed += 1
-                logger.info(f"✓ Digest created: {digest_output.title}")
-            else:
+
+                if digest_output:
+                    digest = repo.create_digest(
+                        article_type=article.get("type", "unknown"),
+                        article_id=article.get("id", ""),
+                        url=article.get("url", ""),
+                        title=digest_output.title,
+                        summary=digest_output.summary,
+                        published_at=article.get("published_at"),
+                    )
+                    created.append(digest)
+                    processed += 1
+                    logger.info(f"✓ Digest created: {digest_output.title}")
+                else:
+                    failed += 1
+                    logger.warning(f"✗ Failed to generate digest for: {title_display}")
+
+            except Exception as e:
+                session.rollback()
                 failed += 1
-                logger.warning(f"✗ Failed to generate digest for: {title_display}")
+                logger.error(f"✗ Error processing article: {e}")
 
+        # Duplicates of a now-digested representative are done with; the email links them as extra sources
+        try:
+            link_duplicates(repo, duplicates)
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Failed to link near-duplicates: {e}")
+
+        # Semantic check catches rewrites MinHash misses; they are collapsed before ranking
+        semantic_duplicates = 0
+        try:
+            semantic_duplicates = index_new_digests(repo, created)["semantic_duplicates"]
         except Exception as e:
-            failed += 1
-            logger.error(f"✗ Error processing article: {e}")
+            session.rollback()
+            logger.error(f"Failed to update embedding index: {e}")
 
     logger.info(f"Digest processing completed. Processed: {processed}, Failed: {failed}")
 
@@ -74,6 +102,8 @@ def process_digests(limit: Optional[int] = None) -> dict:
         "total": len(articles),
         "processed": processed,
         "failed": failed,
+        "duplicates": len(duplicates),
+        "semantic_duplicates": semantic_duplicates,
     }
 
 
@@ -83,3 +113,5 @@ if __name__ == "__main__":
     print(f"  Total: {stats['total']}")
     print(f"  Processed: {stats['processed']}")
     print(f"  Failed: {stats['failed']}")
+    print(f"  Near-duplicates skipped: {stats['duplicates']}")
+    print(f"  Semantic near-duplicates: {stats['semantic_duplicates']}")
@@ -1,6 +1,9 @@
 import logging
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional
 
 from dotenv import load_dotenv
 
@@ -9,11 +12,18 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 load_dotenv()
 
+from openai import OpenAI
+
 from app.agents.email_agent import EmailAgent, RankedArticleDetail, EmailDigestResponse
-from app.agents.curator_agent import CuratorAgent
+from app.agents.curator_agent import CURATOR_CANDIDATE_LIMIT, CuratorAgent
+from app.profiles.subscribers import ranking_profile, seed_default_subscribers
 from app.profiles.user_profile import USER_PROFILE
-from app.database.repository import Repository
-from app.services.email import send_email, digest_to_html
+from app.database.connection import session_scope
+from app.database.repository import DIGEST_CANDIDATE_COLUMNS, Repository
+from app.services.embeddings import embed_digests, prerank_digests
+from app.services.near_duplicates import collapse_clusters
+from app.services.email import OutgoingMessage, SMTPMailer
+from app.services.templates import DigestRenderer
 
 # Configure logging
 logging.basicConfig(
@@ -23,55 +33,86 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+PROFILE_WORKERS = int(os.getenv("PROFILE_WORKERS", "8"))
+
+
+def load_digest_candidates(hours: int = 24) -> List[dict]:
+    """Fetch recent digests as dictionaries, one per near-duplicate cluster.
+
+    Each carries "also_covered_by": the other sources of its cluster, shown in the email.
+
+    Raises:
+        ValueError: If no digests were created in the window
+    """
+    with session_scope() as session:
+        repo = Repository(session=session)
+
+        # Fetch recent digests
+        digests = repo.get_recent_digests(hours=hours, columns=DIGEST_CANDIDATE_COLUMNS)
+        if not digests:
+            raise ValueError(f"No digests found in the last {hours} hours")
+
+        # Convert to dict format
+        digest_dicts = [
+            {
+                "id": digest.id,
+                "title": digest.title,
+                "summary": digest.summary,
+                "type": digest.article_type,
+                "url": digest.url,
+            }
+            for digest in digests
+        ]
+        digest_dicts = collapse_clusters(repo, digest_dicts)
 
-def generate_email_digest(hours: int = 24, top_n: int = 10) -> EmailDigestResponse:
-    """Generate email digest from curated content.
+        linked = repo.get_linked_sources([digest["id"] for digest in digest_dicts])
+        for digest in digest_dicts:
+            digest["also_covered_by"] = [
+                {"source": row.source, "title": row.title, "url": row.url} for row in linked.get(digest["id"], [])
+            ]
+        return digest_dicts
+
+
+def build_email_digest(
+    digest_dicts: List[dict],
+    profile: dict,
+    top_n: int = 10,
+    client: Optional[OpenAI] = None,
+    digest_vectors=None,
+) -> EmailDigestResponse:
+    """Rank candidate digests for one profile and write its introduction.
 
     Args:
-        hours: Number of hours to look back
+        digest_dicts: Candidate digests from `load_digest_candidates`
+        profile: Interest profile to rank against
         top_n: Number of top articles to include
+        client: OpenAI client shared across profiles
+        digest_vectors: Precomputed digest embeddings shared across profiles
 
     Returns:
         EmailDigestResponse object
 
     Raises:
-        ValueError: If no digests or ranked articles found
+        ValueError: If the curator returns no ranked articles
     """
-    curator = CuratorAgent(USER_PROFILE)
-    email_agent = EmailAgent(USER_PROFILE)
-    repo = Repository()
-
-    # Fetch recent digests
-    digests = repo.get_recent_digests(hours=hours)
-    if not digests:
-        raise ValueError(f"No digests found in the last {hours} hours")
-
-    # Convert to dict format
-    digest_dicts = [
-        {
-            "id": digest.id,
-            "title": digest.title,
-            "summary": digest.summary,
-            "type": digest.article_type,
-            "url": digest.url,
-        }
-        for digest in digests
-    ]
+    curator = CuratorAgent(profile, client=client)
+    email_agent = EmailAgent(profile, client=client)
+
+    # Only the candidates closest to the profile go to the LLM curator
+    candidates = prerank_digests(
+        digest_dicts, profile, limit=CURATOR_CANDIDATE_LIMIT, digest_vectors=digest_vectors
+    )
 
     # Rank digests
-    ranked_articles = curator.rank_digests(digest_dicts)
+    ranked_articles = curator.rank_digests(candidates)
     if not ranked_articles:
         raise ValueError("No ranked articles returned from curator")
 
     # Reconstruct RankedArticleDetail objects with full information
+    by_id = {d["id"]: d for d in candidates}
     ranked_article_details = []
     for ranked_article in ranked_articles:
-        # Find matching digest
-        matching_digest = next(
-            (d for d in digest_dicts if d["id"] == ranked_article.digest_id),
-            None,
-        )
-
+        matching_digest = by_id.get(ranked_article.digest_id)
         if matching_digest:
             detail = RankedArticleDetail(
                 digest_id=ranked_article.digest_id,
@@ -82,16 +123,34 @@ def generate_email_digest(hours: int = 24, top_n: int = 10) -> EmailDigestRespon
                 url=matching_digest["url"],
                 article_type=matching_digest["type"],
                 reasoning=ranked_article.reasoning,
+                also_covered_by=matching_digest.get("also_covered_by", []),
             )
             ranked_article_details.append(detail)
 
     # Generate email digest response
-    response = email_agent.create_email_digest_response(
+    return email_agent.create_email_digest_response(
         ranked_article_details,
         total_ranked=len(ranked_articles),
         limit=top_n,
     )
 
+
+def generate_email_digest(hours: int = 24, top_n: int = 10, profile: dict = USER_PROFILE) -> EmailDigestResponse:
+    """Generate email digest from curated content for a single profile.
+
+    Args:
+        hours: Number of hours to look back
+        top_n: Number of top articles to include
+        profile: Interest profile to rank against (default: USER_PROFILE)
+
+    Returns:
+        EmailDigestResponse object
+
+    Raises:
+        ValueError: If no digests or ranked articles found
+    """
+    response = build_email_digest(load_digest_candidates(hours), profile, top_n=top_n)
+
     logger.info(f"Email digest generated:")
     logger.info(f"  Greeting: {response.introduction.greeting}")
     logger.info(f"  Articles included: {len(response.articles)}/{response.total_ranked}")
@@ -99,8 +158,55 @@ def generate_email_digest(hours: int = 24, top_n: int = 10) -> EmailDigestRespon
     return response
 
 
+def build_profile_digests(
+    digest_dicts: List[dict], profiles: Dict[str, dict], top_n: int = 10, max_workers: int = PROFILE_WORKERS
+) -> Dict[str, Optional[EmailDigestResponse]]:
+    """Rank the same candidates for each unique profile concurrently.
+
+    Digest embeddings and the OpenAI client are computed once and shared by
+    every worker. A profile whose ranking fails maps to None.
+
+    Args:
+        digest_dicts: Candidate digests from `load_digest_candidates`
+        profiles: Profiles keyed by profile hash
+        top_n: Number of top articles per email
+        max_workers: Number of profiles ranked in parallel
+
+    Returns:
+        EmailDigestResponse (or None) per profile hash
+    """
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    digest_vectors = embed_digests(digest_dicts) if len(digest_dicts) > CURATOR_CANDIDATE_LIMIT else None
+
+    def build(item):
+        key, profile = item
+        try:
+            return key, build_email_digest(digest_dicts, profile, top_n, client=client, digest_vectors=digest_vectors)
+        except Exception as e:
+            logger.error(f"Failed to build digest for profile {key}: {e}")
+            return key, None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(profiles)))) as pool:
+        return dict(pool.map(build, profiles.items()))
+
+
+def personal_greeting(response: EmailDigestResponse, name: str) -> str:
+    """Rewrite a shared profile digest's greeting for one subscriber, keeping any " - " suffix."""
+    greeting = response.introduction.greeting
+    suffix = greeting[greeting.index(" - ") :] if " - " in greeting else ""
+    return f"Hey {name}!{suffix}"
+
+
+def email_subject(response: EmailDigestResponse) -> str:
+    """Build the subject line from the digest date."""
+    return f"Daily AI News Digest - {response.digest_date.strftime('%B %d, %Y')}"
+
+
 def send_digest_email(hours: int = 24, top_n: int = 10) -> dict:
-    """Generate and send digest email.
+    """Generate and send digest emails to every active subscriber.
+
+    Ranking runs once per unique profile; emails are rendered per recipient
+    and sent over one SMTP connection.
 
     Args:
         hours: Number of hours to look back
@@ -110,31 +216,47 @@ def send_digest_email(hours: int = 24, top_n: int = 10) -> dict:
         Dictionary with success status and metadata
     """
     try:
-        # Generate digest
-        digest_response = generate_email_digest(hours=hours, top_n=top_n)
+        with session_scope() as session:
+            repo = Repository(session=session)
+            seed_default_subscribers(repo)
+            subscribers = [(s.email, s.name, s.profile_hash, s.profile) for s in repo.get_active_subscribers()]
+        if not subscribers:
+            raise ValueError("No active subscribers")
 
-        # Convert to markdown and HTML
-        markdown_body = digest_response.to_markdown()
-        html_body = digest_to_html(digest_response)
+        # Rankings and introductions are shared across a profile, so they must not mention a name
+        profiles = {key: ranking_profile(profile) for _, _, key, profile in subscribers}
+        logger.info(f"Building digests for {len(subscribers)} subscribers across {len(profiles)} profiles")
 
-        # Extract date for subject line
-        # Parse from greeting (e.g., "Hey Ouskä! - January 15, 2025")
-        greeting = digest_response.introduction.greeting
-        date_part = "Today"
-        if " - " in greeting:
-            date_part = greeting.split(" - ")[-1]
+        digest_dicts = load_digest_candidates(hours)
+        responses = build_profile_digests(digest_dicts, profiles, top_n=top_n)
 
-        subject = f"Daily AI News Digest - {date_part}"
+        # Article lists are rendered once per profile; each subscriber only re-renders the greeting
+        renderers = {key: DigestRenderer(response) for key, response in responses.items() if response is not None}
+        messages = []
+        skipped = []
+        for email, name, key, _ in subscribers:
+            if key not in renderers:
+                skipped.append(email)
+                continue
+            body_text, body_html = renderers[key].render(greeting=personal_greeting(responses[key], name))
+            messages.append(OutgoingMessage(email, email_subject(responses[key]), body_text, body_html))
+        if not messages:
+            raise ValueError("No digest could be built for any profile")
 
-        # Send email
-        send_email(subject, markdown_body, body_html=html_body)
+        with SMTPMailer.from_env() as mailer:
+            report = mailer.send_batch(messages)
 
-        logger.info(f"Digest email sent successfully!")
+        logger.info(f"Digest email sent to {len(report.sent)} recipient(s)")
+        if report.failed:
+            logger.warning(f"Digest email failed for: {', '.join(report.failed)}")
 
         return {
-            "success": True,
-            "subject": subject,
-            "articles_count": len(digest_response.articles),
+            "success": bool(report.sent),
+            "subject": messages[0].subject,
+            "articles_count": len(next(r for r in responses.values() if r is not None).articles),
+            "profiles": len(profiles),
+            "sent": report.sent,
+            "failed_recipients": {**report.failed, **{email: "ranking failed" for email in skipped}},
         }
 
     except Exception as e:
@@ -0,0 +1,174 @@
+"""Retention job for raw item content (transcripts, markdown, descriptions).
+
+Once an item has a digest, its raw content is only needed to re-digest it.
+Items older than the retention window have their content moved into
+`archived_content` as zstd-compressed payloads, leaving `ARCHIVED_MARKER` in
+`content_items`, and the tables are vacuumed and analyzed afterwards so the
+freed space and new statistics take effect. `restore_raw_content` brings
+an item back on demand.
+
+Usage:
+    python -m app.services.retention                  # archive with RETENTION_DAYS
+    python -m app.services.retention --days 7 --no-vacuum
+    python -m app.services.retention --restore youtube:abc123 anthropic:https://...
+"""
+import argparse
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.database.compression import compress_text, decompress_text
+from app.database.connection import get_engine, session_scope
+from app.database.repository import Repository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetentionPolicy:
+    """Which digested raw content to archive.
+
+    Attributes:
+        min_age_days: Archive items stored at least this many days ago
+        sources: Source names to archive; empty archives every stored source
+        batch_size: Items compressed and committed per batch
+    """
+
+    min_age_days: int = 30
+    sources: Tuple[str, ...] = ()
+    batch_size: int = 500
+
+    @classmethod
+    def from_env(cls) -> "RetentionPolicy":
+        """Build a policy from RETENTION_DAYS, RETENTION_SOURCES and RETENTION_BATCH_SIZE."""
+        sources = [s.strip() for s in os.getenv("RETENTION_SOURCES", "").split(",") if s.strip()]
+        return cls(
+            min_age_days=int(os.getenv("RETENTION_DAYS", "30")),
+            sources=tuple(sources),
+            batch_size=int(os.getenv("RETENTION_BATCH_SIZE", "500")),
+        )
+
+
+@dataclass
+class ArchiveStats:
+    archived: Dict[str, int] = field(default_factory=dict)
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "archived": self.archived,
+            "raw_bytes": self.raw_bytes,
+            "stored_bytes": self.stored_bytes,
+            "ratio": round(self.raw_bytes / self.stored_bytes, 2) if self.stored_bytes else None,
+        }
+
+
+def archive_raw_content(repo: Repository, policy: Optional[RetentionPolicy] = None) -> ArchiveStats:
+    """Move digested raw content older than the policy window into the archive."""
+    policy = policy or RetentionPolicy.from_env()
+    cutoff = datetime.utcnow() - timedelta(days=policy.min_age_days)
+    stats = ArchiveStats()
+
+    for source in policy.sources or repo.get_content_sources():
+        stats.archived[source] = 0
+        while True:
+            rows = repo.get_archivable_content(source, cutoff, policy.batch_size)
+            if not rows:
+                break
+            entries = []
+            for external_id, content in rows:
+                raw = content.encode("utf-8")
+                payload = compress_text(content)
+                entries.append({"external_id": external_id, "payload": payload, "raw_bytes": len(raw)})
+                stats.raw_bytes += len(raw)
+                stats.stored_bytes += len(payload)
+            repo.archive_content(source, entries)
+            stats.archived[source] += len(entries)
+            if len(rows) < policy.batch_size:
+                break
+
+    return stats
+
+
+def restore_raw_content(repo: Repository, item_keys: List[str]) -> Dict[str, str]:
+    """Restore archived content to `content_items`, e.g. before re-digesting.
+
+    Args:
+        repo: Repository to read and write through
+        item_keys: Keys in Digest.id form ("{source}:{external_id}")
+
+    Returns:
+        Restored content by item key (keys without an archive row are skipped)
+    """
+    restored = {}
+    for archived in repo.get_archived_content(item_keys):
+        content = decompress_text(archived.payload)
+        repo.restore_content(archived, content)
+        restored[archived.item_key] = content
+    return restored
+
+
+def vacuum_tables(engine: Engine, tables: List[str]) -> None:
+    """Reclaim space and refresh planner statistics after archiving.
+
+    VACUUM cannot run inside a transaction, so this uses an autocommit connection.
+    SQLite has no per-table VACUUM and rewrites the whole file.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if engine.dialect.name == "postgresql":
+            for table in tables:
+                conn.execute(text(f"VACUUM (ANALYZE) {table}"))
+        else:
+            conn.execute(text("VACUUM"))
+            for table in tables:
+                conn.execute(text(f"ANALYZE {table}"))
+
+
+def run_retention(policy: Optional[RetentionPolicy] = None, vacuum: bool = True) -> dict:
+    """Archive per the policy, then vacuum/analyze the affected tables.
+
+    Returns:
+        Dictionary with per-source archived counts and byte totals
+    """
+    policy = policy or RetentionPolicy.from_env()
+    with session_scope() as session:
+        stats = archive_raw_content(Repository(session=session), policy)
+
+    if vacuum and any(stats.archived.values()):
+        vacuum_tables(get_engine(), ["content_items", "archived_content"])
+
+    result = stats.to_dict()
+    logger.info(f"Retention: archived {result['archived']}, {result['raw_bytes']} -> {result['stored_bytes']} bytes")
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Archive or restore raw item content")
+    parser.add_argument("--days", type=int, help="Archive digested items older than this (default: RETENTION_DAYS)")
+    parser.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM/ANALYZE after archiving")
+    parser.add_argument("--restore", nargs="+", metavar="ITEM_KEY", help="Restore these items instead of archiving")
+    args = parser.parse_args()
+
+    if args.restore:
+        with session_scope() as session:
+            restored = restore_raw_content(Repository(session=session), args.restore)
+        print(f"Restored {len(restored)} of {len(args.restore)} items")
+    else:
+        policy = RetentionPolicy.from_env()
+        if args.days is not None:
+            policy.min_age_days = args.days
+        print(run_retention(policy, vacuum=not args.no_vacuum))
@@ -0,0 +1,114 @@
+"""Jinja2 templates for digest emails.
+
+Templates are compiled once per process and cached by the environment, so
+rendering an email per subscriber is a context build plus two compiled
+template calls. The HTML and plain-text parts render from the same context,
+and `DigestRenderer` renders the shared article list once per profile.
+"""
+from functools import cached_property, lru_cache
+from pathlib import Path
+from datetime import date
+from typing import List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template, select_autoescape
+from markupsafe import Markup
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates" / "email"
+
+
+@lru_cache(maxsize=None)
+def get_environment() -> Environment:
+    """Return the shared template environment (HTML autoescaped, text left raw)."""
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(enabled_extensions=("html.j2",), default_for_string=False),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True,
+        undefined=StrictUndefined,
+        # Templates ship with the code; skip the per-render mtime check
+        auto_reload=False,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> Template:
+    """Return a compiled template by file name."""
+    return get_environment().get_template(name)
+
+
+def digest_context(digest_response) -> dict:
+    """Build the template context shared by the HTML and text parts of a digest email."""
+    return {
+        "greeting": digest_response.introduction.greeting,
+        "introduction": digest_response.introduction.introduction,
+        "articles": digest_response.articles,
+    }
+
+
+class DigestRenderer:
+    """Renders one digest for many recipients.
+
+    The article list is identical for every subscriber sharing a profile, so
+    it is rendered once; each recipient only pays for the greeting frame.
+    """
+
+    def __init__(self, digest_response):
+        self.context = digest_context(digest_response)
+
+    @cached_property
+    def text_articles(self) -> str:
+        return get_template("_articles.txt.j2").render(self.context)
+
+    @cached_property
+    def html_articles(self) -> Markup:
+        return Markup(get_template("_articles.html.j2").render(self.context))
+
+    def render_text(self, greeting: Optional[str] = None) -> str:
+        """Render the markdown/plain-text part, optionally with another greeting."""
+        return get_template("digest.txt.j2").render(
+            self.context, greeting=greeting or self.context["greeting"], articles_block=self.text_articles
+        )
+
+    def render_html(self, greeting: Optional[str] = None) -> str:
+        """Render the HTML part, optionally with another greeting."""
+        return get_template("digest.html.j2").render(
+            self.context, greeting=greeting or self.context["greeting"], articles_block=self.html_articles
+        )
+
+    def render(self, greeting: Optional[str] = None) -> Tuple[str, str]:
+        """Render both parts from one context.
+
+        Returns:
+            Tuple of (plain text body, HTML body)
+        """
+        return self.render_text(greeting), self.render_html(greeting)
+
+
+def render_digest_text(digest_response) -> str:
+    """Render the markdown/plain-text part of a digest email."""
+    return DigestRenderer(digest_response).render_text()
+
+
+def render_digest_html(digest_response) -> str:
+    """Render the HTML part of a digest email."""
+    return DigestRenderer(digest_response).render_html()
+
+
+def render_digest_email(digest_response) -> Tuple[str, str]:
+    """Render both parts of a digest email from one context.
+
+    Returns:
+        Tuple of (plain text body, HTML body)
+    """
+    return DigestRenderer(digest_response).render()
+
+
+def render_introduction(articles: List[dict], digest_date: date) -> str:
+    """Render the deterministic introduction used instead of an LLM call."""
+    return get_template("introduction.txt.j2").render(articles=articles, digest_date=digest_date).strip()
+
+
+def render_markdown_page(html_content: str) -> str:
+    """Wrap already-converted markdown HTML in the styled email page."""
+    return get_template("markdown.html.j2").render(content=html_content)
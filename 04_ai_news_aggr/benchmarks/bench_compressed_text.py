@@ -0,0 +1,116 @@
+"""Benchmark for compressed transcript/markdown storage.
+
+Seeds N transcript-like documents into a temporary SQLite database three ways
+(plain `Text`, `CompressedText` without a dictionary, and `CompressedText`
+with a dictionary trained on a sample of the same corpus) and reports the
+stored size, database file size and read/write throughput of each.
+
+The generated documents draw on a small vocabulary, so absolute ratios are
+higher than on real transcripts; run `python -m app.database.compression
+train` against production data for representative dictionary gains.
+
+Usage:
+    uv run python -m benchmarks.bench_compressed_text --rows 50000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import Column, LargeBinary, MetaData, String, Table, Text, create_engine, func, select
+
+from app.database import compression
+from app.database.compression import CompressedText, save_dictionary, train_dictionary
+
+TOPICS = ["agents", "retrieval", "evaluation", "fine-tuning", "inference", "safety", "multimodal", "reasoning"]
+VOCABULARY = [
+    f"{stem}{suffix}"
+    for stem in (
+        "model train data latency bench release develop product context token pipeline agent research result "
+        "deploy scale memory eval prompt vector search reason plan tool price weight open cluster serve"
+    ).split()
+    for suffix in ("", "s", "ed", "ing", "er")
+]
+
+
+def make_document(rng: random.Random) -> str:
+    """Build a transcript-like document of 2-20 KB."""
+    sentences = []
+    for _ in range(rng.randint(25, 250)):
+        words = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(6, 18)))
+        sentences.append(f"{words.capitalize()} for {rng.choice(TOPICS)} at {rng.randint(1, 999)}.")
+    return " ".join(sentences)
+
+
+def run_variant(label: str, column_type, documents, workdir: Path, batch: int = 1000) -> dict:
+    path = workdir / f"{label.replace(' ', '_')}.db"
+    engine = create_engine(f"sqlite:///{path}")
+    table = Table("documents", MetaData(), Column("id", String, primary_key=True), Column("body", column_type))
+    table.create(engine)
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        for start in range(0, len(documents), batch):
+            conn.execute(
+                table.insert(),
+                [{"id": f"doc{i:07d}", "body": documents[i]} for i in range(start, min(start + batch, len(documents)))],
+            )
+    write_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        read_chars = sum(len(body) for body in conn.execute(select(table.c.body)).scalars())
+    read_seconds = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        stored = conn.execute(select(func.sum(func.length(func.cast(table.c.body, LargeBinary))))).scalar()
+    engine.dispose()
+    return {
+        "label": label,
+        "stored": stored,
+        "file": path.stat().st_size,
+        "write": write_seconds,
+        "read": read_seconds,
+        "read_chars": read_chars,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000, help="Documents to store")
+    parser.add_argument("--dictionary-samples", type=int, default=2000, help="Documents to train the dictionary on")
+    parser.add_argument("--dictionary-size", type=int, default=112_640, help="Dictionary size in bytes")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    documents = [make_document(rng) for _ in range(args.rows)]
+    raw_bytes = sum(len(document.encode("utf-8")) for document in documents)
+    print(f"{args.rows} documents, {raw_bytes / 2**20:.1f} MiB of UTF-8")
+
+    with tempfile.TemporaryDirectory(prefix="bench-compressed-") as tmp:
+        workdir = Path(tmp)
+        results = [run_variant("plain text", Text, documents, workdir)]
+        with patch.object(compression, "DICTIONARY_DIR", workdir / "dictionaries"):
+            results.append(run_variant("zstd", CompressedText, documents, workdir))
+
+            started = time.perf_counter()
+            dictionary = train_dictionary(rng.sample(documents, args.dictionary_samples), size=args.dictionary_size)
+            save_dictionary(dictionary)
+            print(f"Trained {args.dictionary_size // 1024} KiB dictionary in {time.perf_counter() - started:.1f}s")
+            with patch.dict("os.environ", {"ZSTD_DICTIONARY_ID": str(dictionary.dict_id())}):
+                results.append(run_variant("zstd + dictionary", CompressedText, documents, workdir))
+
+    baseline = results[0]
+    print(f"{'':<18} {'stored MiB':>10} {'file MiB':>9} {'ratio':>6} {'write MiB/s':>12} {'read MiB/s':>11}")
+    for result in results:
+        print(
+            f"{result['label']:<18} {result['stored'] / 2**20:>10.1f} {result['file'] / 2**20:>9.1f} "
+            f"{baseline['file'] / result['file']:>6.2f} {raw_bytes / 2**20 / result['write']:>12.1f} "
+            f"{raw_bytes / 2**20 / result['read']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
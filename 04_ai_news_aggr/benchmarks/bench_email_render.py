@@ -0,0 +1,74 @@
+"""Benchmark for per-subscriber digest email rendering.
+
+Renders the HTML and text parts of a personalised digest for N subscribers
+through the compiled Jinja2 templates, reporting the one-off compile cost
+and throughput both when every email is rendered from scratch and when the
+article list is rendered once per profile (`DigestRenderer`, as the fan-out does).
+
+Usage:
+    uv run python -m benchmarks.bench_email_render --emails 10000 --articles 10
+"""
+import argparse
+import time
+
+from app.agents.email_agent import EmailDigestResponse, EmailIntroduction, RankedArticleDetail
+from app.services.process_email import personal_greeting
+from app.services.templates import DigestRenderer, get_template
+
+
+def build_response(articles: int) -> EmailDigestResponse:
+    """Build a representative digest with the given number of articles."""
+    return EmailDigestResponse(
+        introduction=EmailIntroduction(
+            greeting="Hey there! - January 15, 2025",
+            introduction="Today's digest covers new models, agent tooling and a few research results worth a look.",
+        ),
+        articles=[
+            RankedArticleDetail(
+                digest_id=f"openai:{i}",
+                rank=i + 1,
+                relevance_score=9.0 - i * 0.3,
+                title=f"Article {i}: shipping <agents> & evals to production",
+                summary="A summary of two to three sentences describing what was released and why it matters. " * 2,
+                url=f"https://example.com/articles/{i}?utm_source=digest&ref=email",
+                article_type="openai",
+                reasoning="Matches the reader's interest in production LLM systems.",
+            )
+            for i in range(articles)
+        ],
+        total_ranked=articles,
+        top_n=articles,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=10_000, help="Number of personalised emails to render")
+    parser.add_argument("--articles", type=int, default=10, help="Articles per email")
+    args = parser.parse_args()
+
+    response = build_response(args.articles)
+
+    started = time.perf_counter()
+    get_template("digest.txt.j2")
+    get_template("digest.html.j2")
+    compile_seconds = time.perf_counter() - started
+
+    print(f"Compile (once):  {compile_seconds * 1000:.1f} ms")
+
+    for label, shared in (("Full render", False), ("Shared articles", True)):
+        total_bytes = 0
+        renderer = DigestRenderer(response)
+        started = time.perf_counter()
+        for i in range(args.emails):
+            if not shared:
+                renderer = DigestRenderer(response)
+            body_text, body_html = renderer.render(greeting=personal_greeting(response, f"Subscriber {i}"))
+            total_bytes += len(body_text) + len(body_html)
+        seconds = time.perf_counter() - started
+        print(f"{label + ':':<16} {args.emails} emails x {args.articles} articles in {seconds:.2f}s, "
+              f"{args.emails / seconds:.0f} emails/s ({total_bytes / args.emails / 1024:.1f} KiB/email)")
+
+
+if __name__ == "__main__":
+    main()
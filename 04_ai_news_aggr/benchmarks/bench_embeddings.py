@@ -0,0 +1,63 @@
+"""Benchmark for the digest embedding index.
+
+Builds an index of random unit vectors in batches (as the pipeline appends
+digests), then measures single-query and batched top-k search latency and
+the on-disk footprint of the memory-mapped matrix.
+
+Usage:
+    uv run python -m benchmarks.bench_embeddings --vectors 100000 --dim 256 --k 10
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.embeddings import EmbeddingIndex, normalize
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=100_000, help="Number of indexed vectors")
+    parser.add_argument("--dim", type=int, default=256, help="Vector dimension")
+    parser.add_argument("--batch", type=int, default=10_000, help="Vectors appended per add() call")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--queries", type=int, default=200, help="Number of search queries")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as path:
+        index = EmbeddingIndex(path, dim=args.dim, embedder_name="benchmark")
+
+        started = time.perf_counter()
+        for start in range(0, args.vectors, args.batch):
+            count = min(args.batch, args.vectors - start)
+            vectors = normalize(rng.standard_normal((count, args.dim), dtype=np.float32))
+            index.add([f"bench:{start + i}" for i in range(count)], vectors)
+        add_seconds = time.perf_counter() - started
+
+        queries = normalize(rng.standard_normal((args.queries, args.dim), dtype=np.float32))
+        index.search(queries[:1], k=args.k)  # warm the page cache
+
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query[None, :], k=args.k)
+            latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        index.search(queries, k=args.k)
+        batched_seconds = time.perf_counter() - started
+
+        size_mb = args.vectors * args.dim * 4 / 1_000_000
+        print(f"Index: {args.vectors} x {args.dim} float32 ({size_mb:.1f} MB on disk)")
+        print(f"Add:            {args.vectors / add_seconds:>10.0f} vectors/s ({add_seconds:.2f}s total)")
+        print(f"Single query:   p50 {statistics.median(latencies) * 1000:.2f} ms, "
+              f"max {max(latencies) * 1000:.2f} ms")
+        print(f"Batched ({args.queries}): {batched_seconds * 1000:.1f} ms total, "
+              f"{batched_seconds / args.queries * 1000:.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Memory benchmark for repository read patterns.
+
+Seeds a temporary SQLite database with N pending videos, N pending Anthropic
+articles (content items without content) and N recent digests, then fetches each access pattern three ways:
+full ORM objects, ORM objects with `load_only` of the columns the caller
+reads, and the repository's `columns=` projection (lightweight rows). Reports
+peak and retained traced memory, scaled to 10k rows, and fetch time.
+
+Usage:
+    uv run python -m benchmarks.bench_repository_memory --rows 10000
+"""
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import load_only, sessionmaker
+
+from app.database.models import Base, ContentItem, Digest
+from app.database.repository import DIGEST_CANDIDATE_COLUMNS, Repository
+
+# (label, model, repository method, method arguments, filter, columns the pipeline reads)
+PATTERNS = [
+    (
+        "videos without transcript",
+        ContentItem,
+        "get_items_without_content",
+        ("youtube",),
+        ContentItem.source == "youtube",
+        ("external_id",),
+    ),
+    (
+        "articles without markdown",
+        ContentItem,
+        "get_items_without_content",
+        ("anthropic",),
+        ContentItem.source == "anthropic",
+        ("external_id", "title", "url"),
+    ),
+    ("recent digests (ranking)", Digest, "get_recent_digests", (), True, DIGEST_CANDIDATE_COLUMNS),
+    ("recent digests (ids)", Digest, "get_recent_digests", (), True, ("id",)),
+]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(f"word{rng.randrange(5000)}" for _ in range(words))
+
+
+def seed(session, rows: int) -> None:
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    for i in range(rows):
+        session.add(
+            ContentItem(
+                source="youtube",
+                external_id=f"video{i}",
+                title=f"Video {i}: {_text(rng, 8)}",
+                url=f"https://www.youtube.com/watch?v=video{i}",
+                published_at=now,
+                description=_text(rng, 150),
+                extra={"channel_id": "channel"},
+            )
+        )
+        session.add(
+            ContentItem(
+                source="anthropic",
+                external_id=f"https://www.anthropic.com/news/{i}",
+                title=f"Article {i}: {_text(rng, 8)}",
+                url=f"https://www.anthropic.com/news/{i}",
+                published_at=now,
+                description=_text(rng, 150),
+                category="news",
+            )
+        )
+        session.add(
+            Digest(
+                id=f"openai:{i}",
+                article_type="openai",
+                article_id=str(i),
+                url=f"https://openai.com/index/{i}",
+                title=f"Digest {i}: {_text(rng, 8)}",
+                summary=_text(rng, 90),
+                published_at=now - timedelta(minutes=i),
+            )
+        )
+    session.commit()
+
+
+def measure(factory, fetch) -> tuple:
+    """Return (peak bytes, retained bytes, seconds) of one fetch in a fresh session."""
+    session = factory()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    result = fetch(session)
+    seconds = time.perf_counter() - started
+    retained = tracemalloc.get_traced_memory()[0] - before
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    del result
+    session.close()
+    return peak, retained, seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="Rows per table")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-memory-") as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+        with factory() as session:
+            seed(session, args.rows)
+
+        scale = 10_000 / args.rows
+        print(f"{args.rows} rows per table; memory in MiB per 10k rows")
+        print(f"{'pattern':<27} {'strategy':<12} {'peak':>7} {'retained':>9} {'ms':>7}")
+        for label, model, method, method_args, criterion, columns in PATTERNS:
+            strategies = {
+                "full ORM": lambda s: getattr(Repository(session=s), method)(*method_args),
+                # Every seeded row of the source matches the pattern, so only the source is filtered here
+                "load_only": lambda s: s.query(model)
+                .filter(criterion)
+                .options(load_only(*[getattr(model, c) for c in columns]))
+                .all(),
+                "columns=": lambda s: getattr(Repository(session=s), method)(*method_args, columns=columns),
+            }
+            for strategy, fetch in strategies.items():
+                peak, retained, seconds = measure(factory, fetch)
+                print(
+                    f"{label:<27} {strategy:<12} {peak * scale / 2**20:>7.1f} "
+                    f"{retained * scale / 2**20:>9.1f} {seconds * 1000:>7.0f}"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark for the streaming RSS parser against feedparser.
+
+Writes a local RSS 2.0 fixture of N entries (multi-MB at the default size)
+sorted newest first and spread over `--days`, then reads the last 24 hours of
+it three ways: feedparser, the stream parser reading the whole feed, and the
+stream parser stopping at the cutoff. Reports wall time, peak traced memory
+and the number of items kept, which must match across variants.
+
+Usage:
+    uv run python -m benchmarks.bench_rss_parsing --items 20000 --days 30
+"""
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from app.scrapers.rss import RSSSource
+
+WORDS = "model agent release research inference benchmark safety context token pipeline open weights eval".split()
+
+
+def write_feed(path: Path, items: int, days: int, seed: int = 0) -> int:
+    """Write a newest-first RSS feed with `items` entries; returns its size in bytes."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    step = timedelta(days=days) / items
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel><title>Fixture</title>')
+        for i in range(items):
+            summary = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+            f.write(
+                f"<item><title>Post {i}: {rng.choice(WORDS)}</title>"
+                f"<link>https://example.com/posts/{i}</link><guid>https://example.com/posts/{i}</guid>"
+                f"<pubDate>{format_datetime(now - step * i)}</pubDate><category>{rng.choice(WORDS)}</category>"
+                f"<description>{escape(f'<p>{summary}</p>')}</description></item>"
+            )
+        f.write("</channel></rss>")
+    return path.stat().st_size
+
+
+def run_variant(label: str, source: RSSSource, path: Path, cutoff: datetime) -> dict:
+    """Time one untraced read, then measure peak memory on a second, traced read."""
+    started = time.perf_counter()
+    items = source.feed_items(str(path), cutoff)
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    source.feed_items(str(path), cutoff)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"label": label, "seconds": seconds, "peak_mib": peak / 2**20, "items": len(items)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=20000, help="Entries in the fixture feed")
+    parser.add_argument("--days", type=int, default=30, help="Days the entries are spread over")
+    parser.add_argument("--hours", type=int, default=24, help="Scraping window")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / "feed.xml"
+        size = write_feed(path, args.items, args.days)
+        print(f"{args.items} entries, {size / 2**20:.1f} MiB, last {args.hours}h of {args.days} days\n")
+
+        variants = [
+            ("feedparser", RSSSource("bench", [], parser="feedparser")),
+            ("stream, full read", RSSSource("bench", [], sorted_by_date=False)),
+            ("stream, stop at cutoff", RSSSource("bench", [])),
+        ]
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=args.hours)
+        results = [run_variant(label, source, path, cutoff) for label, source in variants]
+
+    print(f"{'variant':<26}{'seconds':>10}{'peak MiB':>10}{'items':>8}")
+    for r in results:
+        print(f"{r['label']:<26}{r['seconds']:>10.3f}{r['peak_mib']:>10.1f}{r['items']:>8}")
+    if len({r["items"] for r in results}) != 1:
+        raise SystemExit("Variants kept different items")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Load test for the `/digests` endpoint.
+
+Fires concurrent requests at one or more running API instances and reports
+requests per second and latency percentiles for each concurrency level, so a
+build with async handlers can be compared against a sync one.
+
+Usage:
+    uv run python -m benchmarks.load_test_digests \
+        --url http://localhost:8000 --url http://localhost:8001 \
+        --concurrency 1,10,50,100 --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile (nearest-rank) of the samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_level(base_url: str, path: str, concurrency: int, total_requests: int) -> dict:
+    """Issue total_requests GETs with at most `concurrency` in flight."""
+    latencies: List[float] = []
+    errors = 0
+    remaining = total_requests
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+
+        async def worker() -> None:
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        # Warm up connections before measuring
+        await asyncio.gather(*(client.get(path) for _ in range(concurrency)), return_exceptions=True)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def main(urls: List[str], path: str, levels: List[int], total_requests: int) -> None:
+    print(f"{'target':<32} {'conc':>5} {'reqs':>6} {'err':>4} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for url in urls:
+        for concurrency in levels:
+            stats = await run_level(url, path, concurrency, total_requests)
+            print(
+                f"{url:<32} {stats['concurrency']:>5} {stats['requests']:>6} {stats['errors']:>4} "
+                f"{stats['rps']:>9.1f} {stats['p50_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the /digests endpoint")
+    parser.add_argument("--url", action="append", help="API base URL (repeat to compare builds)")
+    parser.add_argument("--path", default="/digests?limit=50", help="Request path")
+    parser.add_argument("--concurrency", default="1,10,50,100", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per concurrency level")
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(
+            urls=args.url or ["http://localhost:8000"],
+            path=args.path,
+            levels=[int(level) for level in args.concurrency.split(",")],
+            total_requests=args.requests,
+        )
+    )
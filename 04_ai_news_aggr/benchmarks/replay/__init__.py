@@ -0,0 +1 @@
+"""Offline replay harness for the full daily pipeline."""
@@ -0,0 +1,88 @@
+"""Replay benchmark for the full daily pipeline.
+
+Replays recorded (or generated) RSS feeds, article pages, transcripts and
+canned LLM responses through `run_daily_pipeline`, with simulated latency,
+and reports time, SQL statements and peak memory per stage at each scale.
+
+Usage:
+    uv run python -m benchmarks.replay --scales 100,1000,10000
+    uv run python -m benchmarks.replay --scales 1000 --json results.json
+    uv run python -m benchmarks.replay --baseline results.json --max-regression 0.2
+    uv run python -m benchmarks.replay --corpus captured/ --database-url postgresql://localhost/replay
+    uv run python -m benchmarks.replay --save-corpus corpus-1k/ --scales 1000
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.replay.corpus import generate_corpus, load_corpus, save_corpus
+from benchmarks.replay.fakes import Latency
+from benchmarks.replay.harness import compare_to_baseline, format_report, quiet_pipeline_logs, run_replay
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="100,1000,10000", help="Comma-separated corpus sizes in items")
+    parser.add_argument("--corpus", type=Path, help="Replay a saved corpus directory instead of generating one")
+    parser.add_argument("--save-corpus", type=Path, help="Write each generated corpus to DIR/<items>/")
+    parser.add_argument("--database-url", help="Dedicated benchmark database (default: temporary SQLite file)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated feed/page/transcript latency")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated LLM call latency")
+    parser.add_argument("--smtp-latency-ms", type=float, default=0.0, help="Simulated per-message SMTP latency")
+    parser.add_argument("--intro-mode", default="template", help="EMAIL_INTRO_MODE for the run")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (it slows Python code down)")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--baseline", type=Path, help="Fail if results regress against this results file")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed relative regression")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own logging")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        quiet_pipeline_logs()
+
+    latency = Latency(
+        network=args.latency_ms / 1000, llm=args.llm_latency_ms / 1000, smtp=args.smtp_latency_ms / 1000
+    )
+    if args.corpus:
+        corpora = [load_corpus(args.corpus)]
+    else:
+        corpora = [generate_corpus(int(scale)) for scale in args.scales.split(",")]
+
+    results = []
+    for corpus in corpora:
+        if args.save_corpus and not args.corpus:
+            save_corpus(corpus, args.save_corpus / str(corpus.items))
+        result = run_replay(
+            corpus,
+            latency=latency,
+            database_url=args.database_url,
+            intro_mode=args.intro_mode,
+            trace_memory=not args.no_memory,
+        )
+        print(format_report(result))
+        print()
+        results.append(result.to_dict())
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, default=str))
+
+    failed = [result["items"] for result in results if not result["success"]]
+    if failed:
+        print(f"Pipeline failed at scale(s): {failed}")
+        return 1
+
+    if args.baseline:
+        regressions = compare_to_baseline(
+            results, json.loads(args.baseline.read_text()), max_regression=args.max_regression
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.max_regression:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Replay corpus: the external inputs of one pipeline run.
+
+A corpus holds RSS feeds by URL, article HTML pages by URL and transcripts by
+video id. `generate_corpus` synthesises one at a given scale (with a share of
+cross-posted near-duplicates, as real feeds have); `save_corpus` and
+`load_corpus` round-trip it through a directory so captured production feeds
+can be replayed in its place.
+
+Directory layout:
+    manifest.json        {"feeds": {url: file}, "pages": {url: file}, "channels": [...]}
+    feeds/*.xml          RSS/Atom documents
+    pages/*.html         Article pages
+    transcripts.json     {video_id: [{"text", "start", "duration"}, ...]}
+"""
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from pathlib import Path
+from typing import Dict, List
+
+OPENAI_FEED = "https://openai.com/news/rss.xml"
+ANTHROPIC_FEEDS = [
+    "https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_anthropic_news.xml",
+    "https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_anthropic_research.xml",
+    "https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_anthropic_engineering.xml",
+]
+YOUTUBE_FEED = "https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+
+TOPICS = [
+    "reasoning models", "retrieval augmented generation", "agent frameworks", "tool use", "evaluation suites",
+    "interpretability", "multimodal models", "inference cost", "fine-tuning", "safety research",
+    "long context", "coding assistants", "speech models", "robotics", "model distillation",
+]
+WORDS = (
+    "model training data latency throughput benchmark release developers production context tokens "
+    "pipeline agents research results accuracy deployment scaling inference memory evaluation safety "
+    "prompt retrieval embeddings vector search reasoning planning tools api pricing open weights"
+).split()
+
+
+@dataclass
+class Corpus:
+    feeds: Dict[str, str] = field(default_factory=dict)
+    pages: Dict[str, str] = field(default_factory=dict)
+    transcripts: Dict[str, List[dict]] = field(default_factory=dict)
+    channels: List[str] = field(default_factory=list)
+
+    @property
+    def items(self) -> int:
+        return sum(feed.count("<item>") + feed.count("<entry>") for feed in self.feeds.values())
+
+
+def _paragraph(rng: random.Random, topic: str, words: int) -> str:
+    body = " ".join(rng.choice(WORDS) for _ in range(words))
+    return f"This update on {topic} covers {body}."
+
+
+def _rss(title: str, items: List[str]) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+        f"<title>{escape(title)}</title><link>https://example.com</link><description>{escape(title)}</description>"
+        + "".join(items)
+        + "</channel></rss>"
+    )
+
+
+def _rss_item(title: str, link: str, guid: str, published: datetime, summary: str, category: str) -> str:
+    return (
+        f"<item><title>{escape(title)}</title><link>{escape(link)}</link><guid>{escape(guid)}</guid>"
+        f"<pubDate>{format_datetime(published)}</pubDate><description>{escape(summary)}</description>"
+        f"<category>{escape(category)}</category></item>"
+    )
+
+
+def _youtube_feed(channel_id: str, entries: List[str]) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" '
+        'xmlns="http://www.w3.org/2005/Atom">'
+        f"<yt:channelId>{channel_id}</yt:channelId><title>Channel {channel_id}</title>" + "".join(entries) + "</feed>"
+    )
+
+
+def _youtube_entry(video_id: str, channel_id: str, title: str, published: datetime, summary: str) -> str:
+    return (
+        f"<entry><id>yt:video:{video_id}</id><yt:videoId>{video_id}</yt:videoId><yt:channelId>{channel_id}</yt:channelId>"
+        f"<title>{escape(title)}</title><link rel=\"alternate\" href=\"https://www.youtube.com/watch?v={video_id}\"/>"
+        f"<published>{published.isoformat()}</published><updated>{published.isoformat()}</updated>"
+        f"<media:group><media:title>{escape(title)}</media:title><media:description>{escape(summary)}</media:description>"
+        f"</media:group></entry>"
+    )
+
+
+def generate_corpus(items: int, hours: int = 24, duplicate_rate: float = 0.05, seed: int = 0) -> Corpus:
+    """Synthesise a corpus with `items` feed entries published within the last `hours`.
+
+    Roughly a quarter of the items are YouTube videos, a quarter OpenAI posts
+    and half Anthropic posts spread over its three feeds. `duplicate_rate` of
+    the Anthropic posts repeat an OpenAI post, to exercise near-duplicate detection.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    corpus = Corpus(channels=[f"UCreplay{index:02d}" for index in range(max(1, items // 400))])
+
+    def published() -> datetime:
+        return (now - timedelta(seconds=rng.randrange(60, hours * 3600 - 60))).replace(microsecond=0)
+
+    video_count = items // 4
+    openai_count = items // 4
+    anthropic_count = items - video_count - openai_count
+
+    # YouTube
+    entries: Dict[str, List[str]] = {channel: [] for channel in corpus.channels}
+    for index in range(video_count):
+        channel = corpus.channels[index % len(corpus.channels)]
+        video_id = f"vid{index:07d}"
+        topic = rng.choice(TOPICS)
+        entries[channel].append(
+            _youtube_entry(video_id, channel, f"Video {index}: {topic}", published(), _paragraph(rng, topic, 30))
+        )
+        if rng.random() < 0.9:
+            corpus.transcripts[video_id] = [
+                {"text": _paragraph(rng, topic, 25), "start": position * 10.0, "duration": 10.0}
+                for position in range(40)
+            ]
+    for channel, channel_entries in entries.items():
+        corpus.feeds[YOUTUBE_FEED.format(channel_id=channel)] = _youtube_feed(channel, channel_entries)
+
+    # OpenAI
+    openai_posts = []
+    openai_items = []
+    for index in range(openai_count):
+        topic = rng.choice(TOPICS)
+        post = (f"OpenAI post {index}: {topic}", _paragraph(rng, topic, 60))
+        openai_posts.append(post)
+        link = f"https://openai.com/index/post-{index}"
+        openai_items.append(_rss_item(post[0], link, link, published(), post[1], topic))
+    corpus.feeds[OPENAI_FEED] = _rss("OpenAI News", openai_items)
+
+    # Anthropic, with pages for markdown conversion
+    feed_items: Dict[str, List[str]] = {url: [] for url in ANTHROPIC_FEEDS}
+    for index in range(anthropic_count):
+        if openai_posts and rng.random() < duplicate_rate:
+            title, summary = rng.choice(openai_posts)
+            topic = "cross-post"
+        else:
+            topic = rng.choice(TOPICS)
+            title, summary = f"Anthropic post {index}: {topic}", _paragraph(rng, topic, 60)
+        link = f"https://www.anthropic.com/news/post-{index}"
+        feed_items[ANTHROPIC_FEEDS[index % len(ANTHROPIC_FEEDS)]].append(
+            _rss_item(title, link, link, published(), summary, topic)
+        )
+        paragraphs = "".join(f"<p>{escape(_paragraph(rng, topic, 80))}</p>" for _ in range(8))
+        corpus.pages[link] = (
+            f"<html><head><title>{escape(title)}</title></head><body><nav>Menu</nav>"
+            f"<article><h1>{escape(title)}</h1>{paragraphs}</article><footer>Footer</footer></body></html>"
+        )
+    for url, entries_for_feed in feed_items.items():
+        corpus.feeds[url] = _rss("Anthropic", entries_for_feed)
+
+    return corpus
+
+
+def save_corpus(corpus: Corpus, path: Path) -> None:
+    """Write a corpus to a directory in the layout `load_corpus` reads."""
+    path = Path(path)
+    (path / "feeds").mkdir(parents=True, exist_ok=True)
+    (path / "pages").mkdir(parents=True, exist_ok=True)
+    manifest = {"feeds": {}, "pages": {}, "channels": corpus.channels}
+    for index, (url, document) in enumerate(corpus.feeds.items()):
+        manifest["feeds"][url] = f"feeds/{index:04d}.xml"
+        (path / manifest["feeds"][url]).write_text(document)
+    for index, (url, document) in enumerate(corpus.pages.items()):
+        manifest["pages"][url] = f"pages/{index:06d}.html"
+        (path / manifest["pages"][url]).write_text(document)
+    (path / "transcripts.json").write_text(json.dumps(corpus.transcripts))
+    (path / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+
+def load_corpus(path: Path) -> Corpus:
+    """Read a corpus saved by `save_corpus` (or captured in the same layout)."""
+    path = Path(path)
+    manifest = json.loads((path / "manifest.json").read_text())
+    transcripts_file = path / "transcripts.json"
+    return Corpus(
+        feeds={url: (path / name).read_text() for url, name in manifest["feeds"].items()},
+        pages={url: (path / name).read_text() for url, name in manifest.get("pages", {}).items()},
+        transcripts=json.loads(transcripts_file.read_text()) if transcripts_file.exists() else {},
+        channels=manifest.get("channels", []),
+    )
@@ -0,0 +1,224 @@
+"""Stand-ins for the pipeline's external services, serving a replay corpus.
+
+Only the network edges are replaced: feeds and pages are served through the
+real HTTP client by a transport adapter and parsed as in production, pages
+still go through `url_to_markdown` (with markdownify standing in for docling),
+and the LLM agents still build their prompts and consume typed
+`output_parsed` results.
+Every fake sleeps for a configurable latency so the timings stay
+representative of a real run.
+"""
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Iterator, List
+from unittest.mock import patch
+
+from markdownify import markdownify
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from app import config as app_config
+from app.agents.curator_agent import RankedArticle, RankedDigestList
+from app.agents.digest_agent import DigestOutput
+from app.agents.email_agent import EmailIntroduction
+from app.scrapers.http_client import HttpClient
+from app.services.email import DeliveryReport
+
+from benchmarks.replay.corpus import Corpus
+
+
+@dataclass
+class Latency:
+    """Simulated round-trip times, in seconds."""
+
+    network: float = 0.0
+    llm: float = 0.0
+    smtp: float = 0.0
+
+    @staticmethod
+    def wait(seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter serving recorded feeds and pages by URL.
+
+    Mounted on a real `HttpClient`, so requests still go through its
+    streaming, decoding, per-host caps and transfer counters.
+    """
+
+    def __init__(self, corpus: Corpus, latency: Latency):
+        super().__init__()
+        self.corpus = corpus
+        self.latency = latency
+        self.requests = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        self.latency.wait(self.latency.network)
+        if request.url in self.corpus.feeds:
+            body, content_type, status = self.corpus.feeds[request.url], "application/rss+xml", 200
+        elif request.url in self.corpus.pages:
+            body, content_type, status = self.corpus.pages[request.url], "text/html", 200
+        else:
+            body, content_type, status = "Not Found", "text/plain", 404
+        data = body.encode("utf-8")
+        raw = HTTPResponse(
+            body=BytesIO(data),
+            headers={"Content-Type": f"{content_type}; charset=utf-8", "Content-Length": str(len(data))},
+            status=status,
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+class ReplayConverter:
+    """DocumentConverter replacement converting fetched HTML to markdown."""
+
+    @staticmethod
+    def document_stream(response) -> SimpleNamespace:
+        """Stand-in for `app.scrapers.rss.document_stream`, which imports docling."""
+        return SimpleNamespace(name=response.url, stream=BytesIO(response.content))
+
+    def convert(self, source):
+        html = source.stream.getvalue().decode("utf-8")
+        markdown = markdownify(html, heading_style="ATX").strip()
+        return SimpleNamespace(document=SimpleNamespace(export_to_markdown=lambda: markdown))
+
+
+class ReplayTranscriptApi:
+    """YouTubeTranscriptApi replacement serving recorded transcript segments.
+
+    Patched in for the class, so constructing it (with any proxy or HTTP
+    client) returns this instance.
+    """
+
+    def __init__(self, corpus: Corpus, latency: Latency):
+        self.corpus = corpus
+        self.latency = latency
+
+    def __call__(self, *args, **kwargs) -> "ReplayTranscriptApi":
+        return self
+
+    def fetch(self, video_id: str, languages=("en",), preserve_formatting: bool = False):
+        from youtube_transcript_api import FetchedTranscript, FetchedTranscriptSnippet, NoTranscriptFound
+
+        self.latency.wait(self.latency.network)
+        if video_id not in self.corpus.transcripts:
+            raise NoTranscriptFound(video_id, list(languages), None)
+        snippets = [FetchedTranscriptSnippet(**segment) for segment in self.corpus.transcripts[video_id]]
+        return FetchedTranscript(snippets, video_id, "English", "en", is_generated=False)
+
+
+class FakeResponses:
+    """`client.responses` with canned, structurally valid parsed outputs."""
+
+    _ID_LINE = re.compile(r"^ID: (.+)$", re.MULTILINE)
+    _TITLE_LINE = re.compile(r"Title: (.*?) \n", re.DOTALL)
+
+    def __init__(self, latency: Latency):
+        self.latency = latency
+        self.calls = 0
+
+    def parse(self, *, text_format, input: str = "", **kwargs):
+        self.calls += 1
+        self.latency.wait(self.latency.llm)
+        return SimpleNamespace(output_parsed=self._output(text_format, input))
+
+    def _output(self, text_format, prompt: str):
+        if text_format is DigestOutput:
+            match = self._TITLE_LINE.search(prompt)
+            title = match.group(1).strip() if match else "Untitled"
+            return DigestOutput(title=title[:120], summary=f"Summary of {title}. " + prompt[-300:].strip())
+        if text_format is RankedDigestList:
+            ids = self._ID_LINE.findall(prompt)
+            return RankedDigestList(
+                articles=[
+                    RankedArticle(
+                        digest_id=digest_id,
+                        relevance_score=round(10.0 - 10.0 * rank / max(len(ids), 1), 2),
+                        rank=rank + 1,
+                        reasoning="Replayed ranking.",
+                    )
+                    for rank, digest_id in enumerate(ids)
+                ]
+            )
+        if text_format is EmailIntroduction:
+            return EmailIntroduction(greeting="Hey there!", introduction="Here are today's replayed highlights.")
+        raise TypeError(f"No canned response for {text_format!r}")
+
+
+class FakeOpenAI:
+    """OpenAI client replacement; all instances share one response recorder."""
+
+    responses: FakeResponses = None
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class FakeMailer:
+    """SMTPMailer replacement that counts messages instead of delivering them."""
+
+    def __init__(self, latency: Latency):
+        self.latency = latency
+        self.sent = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def send_batch(self, messages) -> DeliveryReport:
+        recipients = []
+        for message in messages:
+            self.latency.wait(self.latency.smtp)
+            recipients.append(message.recipient)
+        self.sent += len(recipients)
+        return DeliveryReport(sent=recipients, connections=1)
+
+
+@contextmanager
+def replay_services(corpus: Corpus, latency: Latency) -> Iterator[SimpleNamespace]:
+    """Patch every external service the pipeline touches to serve `corpus`.
+
+    Yields:
+        Namespace of the fakes, for reading request/call counters afterwards
+    """
+    network = ReplayAdapter(corpus, latency)
+    http_client = HttpClient()
+    http_client.session.mount("http://", network)
+    http_client.session.mount("https://", network)
+    converter = ReplayConverter()
+    transcripts = ReplayTranscriptApi(corpus, latency)
+    mailer = FakeMailer(latency)
+    llm = FakeResponses(latency)
+    client = type("ReplayOpenAI", (FakeOpenAI,), {"responses": llm})
+
+    with ExitStack() as stack:
+        for module in ("app.scrapers.feed_stream", "app.scrapers.rss", "app.daily_runner"):
+            stack.enter_context(patch(f"{module}.get_http_client", return_value=http_client))
+        stack.enter_context(patch("app.scrapers.rss.RSSSource.converter", converter))
+        stack.enter_context(patch("app.scrapers.rss.document_stream", converter.document_stream))
+        stack.enter_context(patch("app.scrapers.youtube.YouTubeTranscriptApi", transcripts))
+        for module in (
+            "app.agents.digest_agent",
+            "app.agents.curator_agent",
+            "app.agents.email_agent",
+            "app.services.process_email",
+        ):
+            stack.enter_context(patch(f"{module}.OpenAI", client))
+        stack.enter_context(patch("app.services.process_email.SMTPMailer.from_env", return_value=mailer))
+        sources = [
+            dict(config, channels=corpus.channels) if config["type"] == "youtube" else config
+            for config in app_config.SOURCES
+        ]
+        stack.enter_context(patch.object(app_config, "SOURCES", sources))
+        yield SimpleNamespace(network=network, http=http_client, llm=llm, mailer=mailer)
@@ -0,0 +1,239 @@
+"""Run the real daily pipeline against a replay corpus and measure each stage.
+
+`run_daily_pipeline` is executed unmodified; its stage functions are wrapped
+in place to record wall time, the number of SQL statements issued and the
+peak traced memory of each stage. Results compare against a saved baseline
+so a change that makes a stage slower or chattier fails before deploy.
+"""
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from unittest.mock import patch
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from app import daily_runner
+from app.database.connection import SessionLocal, create_db_engine
+from app.database.create_tables import LEGACY_SOURCE_TABLES, upgrade_schema
+from app.database.models import Base
+from app.services.embeddings import get_embedding_index
+
+from benchmarks.replay.corpus import Corpus
+from benchmarks.replay.fakes import Latency, replay_services
+
+# Pipeline steps as named in app.daily_runner, in execution order
+STAGES = [
+    "run_scrapers",
+    "process_content",
+    "process_digests",
+    "send_digest_email",
+]
+
+
+@dataclass
+class StageResult:
+    seconds: float = 0.0
+    queries: int = 0
+    peak_mb: float = 0.0
+
+
+@dataclass
+class ReplayResult:
+    items: int
+    success: bool
+    stages: Dict[str, StageResult] = field(default_factory=dict)
+    llm_calls: int = 0
+    emails_sent: int = 0
+    n_plus_one: List[dict] = field(default_factory=list)
+    pipeline: dict = field(default_factory=dict)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(stage.seconds for stage in self.stages.values())
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "total_seconds": self.total_seconds}
+
+
+class StageRecorder:
+    """Attributes SQL statements, time and memory to the stage currently running."""
+
+    def __init__(self, engine: Engine, trace_memory: bool = True):
+        self.engine = engine
+        self.trace_memory = trace_memory
+        self.current: Optional[str] = None
+        self.stages: Dict[str, StageResult] = {}
+
+    def _count_query(self, *args) -> None:
+        if self.current is not None:
+            self.stages[self.current].queries += 1
+
+    def wrap(self, name: str, function):
+        def stage(*args, **kwargs):
+            result = self.stages.setdefault(name, StageResult())
+            self.current = name
+            if self.trace_memory:
+                tracemalloc.reset_peak()
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                result.seconds += time.perf_counter() - started
+                if self.trace_memory:
+                    result.peak_mb = max(result.peak_mb, tracemalloc.get_traced_memory()[1] / 2**20)
+                self.current = None
+
+        return stage
+
+    @contextmanager
+    def installed(self) -> Iterator["StageRecorder"]:
+        event.listen(self.engine, "before_cursor_execute", self._count_query)
+        if self.trace_memory:
+            tracemalloc.start()
+        try:
+            with ExitStack() as stack:
+                for name in STAGES:
+                    stack.enter_context(patch.object(daily_runner, name, self.wrap(name, getattr(daily_runner, name))))
+                yield self
+        finally:
+            if self.trace_memory:
+                tracemalloc.stop()
+            event.remove(self.engine, "before_cursor_execute", self._count_query)
+
+
+@contextmanager
+def replay_database(database_url: Optional[str], workdir: Path) -> Iterator[Engine]:
+    """Bind the application sessions to a fresh benchmark database.
+
+    Without a URL a SQLite file in `workdir` is used. A Postgres URL must point
+    at a dedicated database: its tables are dropped and recreated.
+    """
+    url = database_url or f"sqlite:///{workdir / 'replay.db'}"
+    engine = create_db_engine(url, name="replay")
+    Base.metadata.drop_all(engine)
+    with engine.begin() as conn:
+        # Left over from older runs; upgrade_schema would copy their rows in
+        for table, *_ in LEGACY_SOURCE_TABLES:
+            conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    Base.metadata.create_all(engine)
+    upgrade_schema(engine)
+
+    previous_bind = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    try:
+        yield engine
+    finally:
+        SessionLocal.configure(bind=previous_bind)
+        engine.dispose()
+
+
+@contextmanager
+def replay_environment(workdir: Path, intro_mode: str) -> Iterator[None]:
+    """Point email recipients and the embedding index at throwaway values, with query stats on."""
+    overrides = {
+        "MY_EMAIL": "replay@example.com",
+        "EMAIL_RECIPIENTS": "",
+        "EMBEDDING_INDEX_DIR": str(workdir / "embeddings"),
+        "EMAIL_INTRO_MODE": intro_mode,
+        "DB_QUERY_STATS": "1",
+        # Sources come from app.config.SOURCES, patched by replay_services
+        "SOURCES_CONFIG": "",
+    }
+    with patch.dict(os.environ, overrides):
+        get_embedding_index.cache_clear()
+        try:
+            yield
+        finally:
+            get_embedding_index.cache_clear()
+
+
+def run_replay(
+    corpus: Corpus,
+    latency: Latency = Latency(),
+    database_url: Optional[str] = None,
+    hours: int = 24,
+    top_n: int = 10,
+    intro_mode: str = "template",
+    trace_memory: bool = True,
+) -> ReplayResult:
+    """Run `run_daily_pipeline` once over `corpus` and measure every stage."""
+    with tempfile.TemporaryDirectory(prefix="replay-") as tmp:
+        workdir = Path(tmp)
+        with replay_environment(workdir, intro_mode), replay_database(database_url, workdir) as engine, \
+                replay_services(corpus, latency) as services, \
+                StageRecorder(engine, trace_memory=trace_memory).installed() as recorder:
+            pipeline = daily_runner.run_daily_pipeline(hours=hours, top_n=top_n)
+
+    return ReplayResult(
+        items=corpus.items,
+        success=pipeline["success"],
+        stages={name: recorder.stages.get(name, StageResult()) for name in STAGES},
+        llm_calls=services.llm.calls,
+        emails_sent=services.mailer.sent,
+        n_plus_one=pipeline.get("queries", {}).get("n_plus_one", []),
+        pipeline={key: value for key, value in pipeline.items() if key not in ("email", "queries")},
+    )
+
+
+def compare_to_baseline(
+    results: List[dict],
+    baseline: List[dict],
+    max_regression: float = 0.2,
+    min_seconds: float = 0.05,
+) -> List[str]:
+    """List stages that got slower or issue more queries than the baseline.
+
+    Args:
+        results: `ReplayResult.to_dict()` per scale point
+        baseline: Results of a previous run in the same format
+        max_regression: Allowed relative increase (0.2 = 20%)
+        min_seconds: Stages faster than this in the baseline are too noisy to time-check
+
+    Returns:
+        Human-readable regression descriptions (empty if none)
+    """
+    previous = {entry["items"]: entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        reference = previous.get(entry["items"])
+        if reference is None:
+            continue
+        for name, stage in entry["stages"].items():
+            before = reference["stages"].get(name)
+            if before is None:
+                continue
+            if before["queries"] and stage["queries"] > before["queries"] * (1 + max_regression):
+                regressions.append(
+                    f"{entry['items']} items / {name}: {stage['queries']} queries (baseline {before['queries']})"
+                )
+            if before["seconds"] >= min_seconds and stage["seconds"] > before["seconds"] * (1 + max_regression):
+                regressions.append(
+                    f"{entry['items']} items / {name}: {stage['seconds']:.2f}s (baseline {before['seconds']:.2f}s)"
+                )
+    return regressions
+
+
+def format_report(result: ReplayResult) -> str:
+    """Render one scale point as a per-stage table."""
+    lines = [
+        f"{result.items} items - {'ok' if result.success else 'FAILED'}, "
+        f"{result.total_seconds:.2f}s total, {result.llm_calls} LLM calls, {result.emails_sent} emails",
+        f"  {'stage':<30} {'seconds':>9} {'queries':>9} {'peak MiB':>9}",
+    ]
+    for name, stage in result.stages.items():
+        lines.append(f"  {name:<30} {stage.seconds:>9.2f} {stage.queries:>9} {stage.peak_mb:>9.1f}")
+    for pattern in result.n_plus_one:
+        lines.append(f"  possible N+1 in {pattern['operation']}: {pattern['count']}x {pattern['statement']}")
+    return "\n".join(lines)
+
+
+def quiet_pipeline_logs() -> None:
+    """Keep the pipeline's logging out of the benchmark report, which lists N+1 patterns itself."""
+    logging.getLogger().setLevel(logging.ERROR)
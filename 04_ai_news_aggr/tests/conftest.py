@@ -1,22 +1,32 @@
+import asyncio
+
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.database.models import Base
 
 
 @pytest.fixture(scope="function")
-def test_db():
-    """Create an in-memory SQLite database for testing.
+def test_db(tmp_path):
+    """Create a temporary SQLite database for testing.
 
     This fixture:
-    1. Creates an in-memory SQLite database
+    1. Creates a SQLite database file in a temporary directory
     2. Creates all tables defined in models
     3. Yields a session for tests to use
     4. Tears down the database after the test
+
+    A file (rather than `:memory:`) lets the async engine used by the API
+    see the same data as the sync session used to seed it.
     """
-    # Create in-memory SQLite database
-    engine = create_engine("sqlite:///:memory:")
+    # Create file-backed SQLite database
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+    )
 
     # Create all tables
     Base.metadata.create_all(engine)
@@ -31,3 +41,20 @@ def test_db():
     # Cleanup
     session.close()
     Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def async_session_factory(test_db):
+    """Create an aiosqlite session factory bound to the `test_db` database.
+
+    NullPool keeps no connections between sessions, so nothing is tied to the
+    event loop that happened to open it. The engine is disposed after the test
+    so no aiosqlite connection or worker thread outlives it.
+    """
+    url = test_db.get_bind().url.set(drivername="sqlite+aiosqlite")
+    engine = create_async_engine(url, poolclass=NullPool)
+    yield async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    # Cleanup
+    asyncio.run(engine.dispose())
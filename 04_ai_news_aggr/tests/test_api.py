@@ -8,10 +8,11 @@ from app.database.repository import Repository
 
 
 @pytest.fixture
-def override_get_db(test_db):
+def override_get_db(async_session_factory):
     """Override the get_db dependency to use the test database."""
-    def _get_test_db():
-        yield test_db
+    async def _get_test_db():
+        async with async_session_factory() as session:
+            yield session
 
     return _get_test_db
 
@@ -170,3 +171,173 @@ class TestDigests:
         assert isinstance(digest["article_type"], str)
         assert isinstance(digest["published_at"], str)  # ISO format datetime
         assert isinstance(digest["created_at"], str)  # ISO format datetime
+
+
+class TestDigestPagination:
+    """Test cursor pagination and ETag revalidation of the digests endpoint."""
+
+    def test_cursor_pages_cover_every_digest_once(self, client, test_db):
+        """Test that following X-Next-Cursor walks all digests newest first without repeats."""
+        repo = Repository(session=test_db)
+        published_at = datetime(2025, 1, 15, tzinfo=timezone.utc)
+        for i in range(7):
+            # Ties on published_at are broken by id
+            repo.create_digest("test", f"article_{i}", f"https://example.com/{i}", f"Title {i}", "Summary", published_at)
+
+        ids, cursor, pages = [], None, 0
+        while True:
+            response = client.get("/digests", params={"limit": 3, **({"cursor": cursor} if cursor else {})})
+            assert response.status_code == 200
+            ids += [digest["id"] for digest in response.json()]
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        assert pages == 3
+        assert ids == sorted((f"test:article_{i}" for i in range(7)), reverse=True)
+
+    def test_etag_revalidation_returns_304_until_digests_change(self, client, test_db):
+        """Test that If-None-Match with the current ETag gets 304 and a new digest changes the ETag."""
+        repo = Repository(session=test_db)
+        repo.create_digest("test", "a", "https://example.com/a", "A", "Summary", datetime.now(timezone.utc))
+
+        etag = client.get("/digests").headers["ETag"]
+        cached = client.get("/digests", headers={"If-None-Match": etag})
+        assert (cached.status_code, cached.content) == (304, b"")
+
+        repo.create_digest("test", "b", "https://example.com/b", "B", "Summary", datetime.now(timezone.utc))
+        fresh = client.get("/digests", headers={"If-None-Match": etag})
+        assert fresh.status_code == 200
+        assert fresh.headers["ETag"] != etag
+        assert len(fresh.json()) == 2
+
+    def test_if_none_match_compares_whole_tags(self, client, test_db):
+        """Test that only a whole listed tag (weak or strong) or * gets 304, not a prefix of the ETag."""
+        repo = Repository(session=test_db)
+        repo.create_digest("test", "a", "https://example.com/a", "A", "Summary", datetime.now(timezone.utc))
+        etag = client.get("/digests").headers["ETag"]
+
+        def status(if_none_match):
+            return client.get("/digests", headers={"If-None-Match": if_none_match}).status_code
+
+        assert status(etag[:-2]) == 200
+        assert status(f'{etag[:-1]}0"') == 200
+        assert status(f'W/"x", {etag.removeprefix("W/")}') == 304
+        assert status("*") == 304
+
+    def test_invalid_cursor_returns_400(self, client):
+        """Test GET /digests rejects a malformed cursor."""
+        response = client.get("/digests", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+
+class TestSearch:
+    """Test full-text search endpoint."""
+
+    def test_search_returns_ranked_results(self, client, test_db):
+        """Test GET /search returns matching digests with rank and pagination metadata."""
+        repo = Repository(session=test_db)
+        for i, title in enumerate(["RAG systems in production", "Vision models", "RAG evaluation"]):
+            repo.create_digest(
+                article_type="openai",
+                article_id=f"search_{i}",
+                url=f"https://openai.com/news/search-{i}",
+                title=title,
+                summary=f"Summary {i}",
+                published_at=datetime.now(timezone.utc),
+            )
+
+        response = client.get("/search", params={"q": "rag", "limit": 1})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["query"] == "rag"
+        assert body["total"] == 2
+        assert body["limit"] == 1
+        assert body["offset"] == 0
+        assert len(body["results"]) == 1
+        assert "rank" in body["results"][0]
+        assert "RAG" in body["results"][0]["title"]
+
+    def test_search_requires_query(self, client):
+        """Test GET /search without q is rejected."""
+        response = client.get("/search")
+        assert response.status_code == 422
+
+
+class TestRelatedDigests:
+    """Test embedding-based related digests endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def embedding_index_dir(self, tmp_path, monkeypatch):
+        """Point the process-wide embedding index at a temporary directory."""
+        from app.services.embeddings import get_embedding_index
+
+        monkeypatch.setenv("EMBEDDING_INDEX_DIR", str(tmp_path / "embeddings"))
+        monkeypatch.setenv("EMBEDDING_BACKEND", "hashing")
+        get_embedding_index.cache_clear()
+        yield
+        get_embedding_index.cache_clear()
+
+    def test_related_returns_most_similar_first(self, client, test_db):
+        """Test GET /digests/{id}/related ranks neighbours by similarity and excludes the digest itself."""
+        from app.services.embeddings import index_new_digests
+
+        repo = Repository(session=test_db)
+        digests = [
+            repo.create_digest(
+                article_type="openai",
+                article_id=f"related_{i}",
+                url=f"https://openai.com/news/related-{i}",
+                title=title,
+                summary=summary,
+                published_at=datetime.now(timezone.utc),
+            )
+            for i, (title, summary) in enumerate(
+                [
+                    ("RAG in production", "Retrieval augmented generation pipelines at scale"),
+                    ("Scaling RAG", "Retrieval augmented generation pipelines with rerankers"),
+                    ("Robot hands", "Dexterous manipulation research"),
+                ]
+            )
+        ]
+        index_new_digests(repo, digests)
+
+        response = client.get("/digests/openai:related_0/related", params={"k": 2})
+        assert response.status_code == 200
+        body = response.json()
+        assert [item["id"] for item in body] == ["openai:related_1", "openai:related_2"]
+        assert body[0]["score"] > body[1]["score"]
+
+    def test_related_unknown_digest_returns_404(self, client):
+        """Test GET /digests/{id}/related for a digest that is not indexed."""
+        response = client.get("/digests/openai:missing/related")
+        assert response.status_code == 404
+
+
+class TestTranscriptChunks:
+    """Test transcript chunks endpoint."""
+
+    def test_transcript_chunks_link_to_timestamps(self, client, test_db):
+        """Test GET /items/{source}/{id}/transcript returns time chunks with jump links."""
+        from app.scrapers.transcripts import TranscriptSegments
+
+        text, segments = TranscriptSegments.from_segments(
+            [("Intro.", 0.0, 4.0), ("Main topic.", 200.0, 5.0), ("Outro.", 420.0, 3.0)], language="en"
+        )
+        repo = Repository(session=test_db)
+        repo.create_content_item("youtube", "vid", "Video", "https://www.youtube.com/watch?v=vid", datetime(2025, 1, 15))
+        repo.bulk_update_content("youtube", {"vid": text})
+        repo.bulk_save_transcript_segments("youtube", {"vid": segments.to_row()})
+
+        response = client.get("/items/youtube/vid/transcript", params={"chunk_seconds": 300})
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["language"], body["segments"]) == ("en", 3)
+        assert [(c["start"], c["text"]) for c in body["chunks"]] == [(0.0, "Intro. Main topic."), (420.0, "Outro.")]
+        assert body["chunks"][1]["url"] == "https://www.youtube.com/watch?v=vid&t=420s"
+
+    def test_transcript_without_segments_returns_404(self, client):
+        """Test GET /items/{source}/{id}/transcript returns 404 for unknown items."""
+        response = client.get("/items/youtube/missing/transcript")
+        assert response.status_code == 404
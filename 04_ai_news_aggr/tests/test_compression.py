@@ -0,0 +1,107 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.database import compression
+from app.database.compression import INCOMPRESSIBLE, RAW, ZSTD, decode_text, encode_text, save_dictionary, train_dictionary
+from app.database.create_tables import backfill_compressed_columns
+from app.database.models import ContentItem
+from app.database.repository import Repository
+
+WORDS = "model agents retrieval evaluation latency release research context tokens inference safety".split()
+
+
+def _document(rng: random.Random, words: int = 300) -> str:
+    return "Transcript: " + " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+@pytest.fixture
+def dictionary_dir(tmp_path, monkeypatch):
+    """Point dictionary storage at an empty temporary directory."""
+    monkeypatch.setattr(compression, "DICTIONARY_DIR", tmp_path / "dictionaries")
+    monkeypatch.delenv("ZSTD_DICTIONARY_ID", raising=False)
+    yield tmp_path / "dictionaries"
+    compression._local.__dict__.pop("decompressors", None)
+
+
+class TestEncoding:
+    """Test the header-byte text encoding."""
+
+    def test_short_values_stored_raw_and_long_values_compressed(self, dictionary_dir):
+        """Test that markers stay raw (and deterministic) while documents are compressed."""
+        document = _document(random.Random(0))
+
+        assert encode_text("__UNAVAILABLE__") == RAW + b"__UNAVAILABLE__"
+        encoded = encode_text(document)
+        assert encoded[:1] == ZSTD
+        assert len(encoded) * 3 < len(document)
+        assert decode_text(encoded) == document
+        assert decode_text(memoryview(encoded)) == document
+        assert decode_text("legacy plain text") == "legacy plain text"
+
+    def test_long_values_that_do_not_compress_are_marked(self, dictionary_dir):
+        """Test that incompressible long values get their own header, distinct from never-tried raw values."""
+        rng = random.Random(2)
+        value = "".join(rng.choice("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789") for _ in range(140))
+
+        encoded = encode_text(value)
+
+        assert encoded == INCOMPRESSIBLE + value.encode("utf-8")
+        assert decode_text(encoded) == value
+
+    def test_dictionary_round_trip(self, dictionary_dir, monkeypatch):
+        """Test that values compressed with a trained dictionary decode and come out smaller."""
+        rng = random.Random(1)
+        dictionary = train_dictionary([_document(rng, 60) for _ in range(500)], size=16_384)
+        save_dictionary(dictionary)
+        document = _document(rng, 60)
+        plain = encode_text(document)
+
+        monkeypatch.setenv("ZSTD_DICTIONARY_ID", str(dictionary.dict_id()))
+        with_dictionary = encode_text(document)
+
+        assert len(with_dictionary) < len(plain)
+        assert decode_text(with_dictionary) == document
+
+
+class TestCompressedColumns:
+    """Test item content stored through CompressedText."""
+
+    def test_orm_round_trip_and_marker_filters(self, test_db):
+        """Test that values are compressed at rest and marker comparisons still work in SQL."""
+        repo = Repository(session=test_db)
+        transcript = _document(random.Random(2))
+        published = datetime(2025, 1, 15, tzinfo=timezone.utc)
+        for video_id, value in (("ok", transcript), ("missing", "__UNAVAILABLE__"), ("pending", None)):
+            repo.create_content_item("youtube", video_id, video_id, f"https://youtube.com/watch?v={video_id}", published,
+                                     content=value)
+
+        stored = test_db.execute(text("SELECT length(content) FROM content_items WHERE external_id = 'ok'")).scalar()
+        assert stored * 3 < len(transcript)
+        assert [v.external_id for v in repo.get_items_without_content("youtube")] == ["pending"]
+        assert [item["id"] for item in repo.get_articles_without_digest()] == ["ok"]
+        assert repo.get_articles_without_digest()[0]["content"] == transcript
+
+    def test_backfill_converts_plain_text_rows(self, test_db):
+        """Test that rows written as plain text before the migration are rewritten once."""
+        transcript = _document(random.Random(3))
+        test_db.execute(
+            text(
+                "INSERT INTO content_items (source, external_id, title, url, published_at, content) "
+                "VALUES ('youtube', :id, 't', 'u', '2025-01-15 00:00:00', :content)"
+            ),
+            [{"id": "long", "content": transcript}, {"id": "marker", "content": "__UNAVAILABLE__"}],
+        )
+        test_db.commit()
+        engine = test_db.get_bind()
+
+        assert backfill_compressed_columns(engine, batch_size=1) == 2
+        assert backfill_compressed_columns(engine) == 0
+
+        test_db.expire_all()
+        assert test_db.get(ContentItem, ("youtube", "long")).content == transcript
+        types = test_db.execute(text("SELECT DISTINCT typeof(content) FROM content_items")).scalars().all()
+        assert types == ["blob"]
+        assert Repository(session=test_db).get_items_without_content("youtube") == []
@@ -0,0 +1,251 @@
+import socket
+from email import message_from_bytes
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from app.services.email import OutgoingMessage, SMTPMailer
+
+
+class RecordingHandler:
+    """aiosmtpd handler that stores delivered messages and refuses blocked recipients."""
+
+    def __init__(self, blocked=()):
+        self.blocked = set(blocked)
+        self.messages = []
+        self.logins = 0
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.blocked:
+            return "550 mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos, message_from_bytes(envelope.content)))
+        return "250 Message accepted"
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data):
+        self.logins += 1
+        return AuthResult(success=auth_data.login == b"digest" and auth_data.password == b"secret")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    """Run a local SMTP server that requires AUTH over plain connections."""
+    handler = RecordingHandler(blocked={"bounce@example.com"})
+    controller = Controller(
+        handler,
+        hostname="127.0.0.1",
+        port=_free_port(),
+        authenticator=handler.authenticate,
+        auth_require_tls=False,
+    )
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def _mailer(controller, **kwargs) -> SMTPMailer:
+    return SMTPMailer(
+        host=controller.hostname,
+        port=controller.port,
+        security="none",
+        username="digest",
+        password="secret",
+        sender="digest@example.com",
+        **kwargs,
+    )
+
+
+def _messages(*recipients):
+    return [
+        OutgoingMessage(recipient, "Daily digest", f"Hello {recipient}", f"<p>Hello {recipient}</p>")
+        for recipient in recipients
+    ]
+
+
+class TestSMTPMailer:
+    """Test batched delivery against a local SMTP server."""
+
+    def test_batch_reuses_one_authenticated_connection(self, smtp_server):
+        """Test that each recipient gets their own message over a single login."""
+        controller, handler = smtp_server
+
+        with _mailer(controller) as mailer:
+            report = mailer.send_batch(_messages("a@example.com", "b@example.com", "c@example.com"))
+
+        assert report.ok
+        assert report.sent == ["a@example.com", "b@example.com", "c@example.com"]
+        assert report.connections == 1
+        assert handler.logins == 1
+        assert [(rcpts, msg["To"]) for rcpts, msg in handler.messages] == [
+            (["a@example.com"], "a@example.com"),
+            (["b@example.com"], "b@example.com"),
+            (["c@example.com"], "c@example.com"),
+        ]
+
+    def test_refused_recipient_is_reported_without_aborting(self, smtp_server):
+        """Test that one rejected address does not stop the rest of the batch."""
+        controller, handler = smtp_server
+
+        with _mailer(controller) as mailer:
+            report = mailer.send_batch(_messages("a@example.com", "bounce@example.com", "c@example.com"))
+
+        assert report.sent == ["a@example.com", "c@example.com"]
+        assert list(report.failed) == ["bounce@example.com"]
+        assert len(handler.messages) == 2
+
+    def test_reconnects_after_dropped_connection(self, smtp_server):
+        """Test that a connection closed mid-batch is re-established transparently."""
+        controller, handler = smtp_server
+
+        with _mailer(controller) as mailer:
+            mailer.send(_messages("a@example.com")[0])
+            mailer._server.sock.shutdown(socket.SHUT_RDWR)
+            report = mailer.send_batch(_messages("b@example.com"))
+
+        assert report.sent == ["b@example.com"]
+        assert report.connections == 1
+        assert handler.logins == 2
+
+    def test_sends_are_throttled_to_rate(self, smtp_server):
+        """Test that consecutive sends are spaced by 1 / rate_per_second."""
+        controller, _ = smtp_server
+        waits = []
+
+        with _mailer(controller, rate_per_second=2, sleep=waits.append) as mailer:
+            mailer.send_batch(_messages("a@example.com", "b@example.com", "c@example.com"))
+
+        assert len(waits) == 2
+        assert all(0 < wait <= 0.5 for wait in waits)
+
+
+class TestTemplates:
+    """Test digest rendering through the compiled templates."""
+
+    @staticmethod
+    def _response():
+        from app.agents.email_agent import EmailDigestResponse, EmailIntroduction, RankedArticleDetail
+
+        article = RankedArticleDetail(
+            digest_id="openai:1",
+            rank=1,
+            relevance_score=9.0,
+            title="Agents <in> production & more",
+            summary="Summary",
+            url="https://example.com/a?x=1&y=2",
+            article_type="openai",
+            reasoning="Relevant",
+        )
+        return EmailDigestResponse(
+            introduction=EmailIntroduction(greeting="Hey Ada! - January 15, 2025", introduction="Intro"),
+            articles=[article],
+            total_ranked=1,
+            top_n=10,
+        )
+
+    def test_html_is_escaped_and_text_is_not(self):
+        """Test that only the HTML part escapes article fields."""
+        from app.services.templates import render_digest_email
+
+        body_text, body_html = render_digest_email(self._response())
+
+        assert "## 1. Agents <in> production & more" in body_text
+        assert "Agents &lt;in&gt; production &amp; more" in body_html
+        assert 'href="https://example.com/a?x=1&amp;y=2"' in body_html
+
+    def test_renderer_reuses_articles_across_greetings(self):
+        """Test that one renderer produces per-recipient greetings over the same article block."""
+        from app.services.templates import DigestRenderer
+
+        renderer = DigestRenderer(self._response())
+        first_text, first_html = renderer.render(greeting="Hey Ada!")
+        second_text, second_html = renderer.render(greeting="Hey Lin!")
+
+        assert first_text.startswith("Hey Ada!\n") and second_text.startswith("Hey Lin!\n")
+        assert "<h1>Hey Lin!</h1>" in second_html
+        assert first_text.split("---", 1)[1] == second_text.split("---", 1)[1]
+        assert self._response().to_markdown() == renderer.render_text()
+
+    def test_linked_sources_are_listed(self):
+        """Test that near-duplicate sources of an article are linked in both parts."""
+        from app.agents.email_agent import LinkedSource
+        from app.services.templates import render_digest_email
+
+        response = self._response()
+        response.articles[0].also_covered_by = [
+            LinkedSource(source="anthropic", title="Agents", url="https://anthropic.com/a"),
+            LinkedSource(source="youtube", title="Agents", url="https://youtube.com/watch?v=a"),
+        ]
+        body_text, body_html = render_digest_email(response)
+
+        assert "Also covered by: [anthropic](https://anthropic.com/a), [youtube](https://youtube.com/watch?v=a)" in body_text
+        assert '<a href="https://anthropic.com/a">anthropic</a>' in body_html
+        assert "Also covered by" not in render_digest_email(self._response())[0]
+
+
+class TestIntroductionModes:
+    """Test how digest introductions are written."""
+
+    ARTICLES = [
+        {"digest_id": "openai:1", "title": "Agents in production", "relevance_score": 9.0},
+        {"digest_id": "openai:2", "title": "Long-context evals", "relevance_score": 8.0},
+    ]
+
+    @staticmethod
+    def _agent(mode, intro="Generated intro"):
+        from unittest.mock import MagicMock
+
+        from app.agents.email_agent import EmailAgent, EmailIntroduction
+
+        client = MagicMock()
+        client.responses.parse.return_value.output_parsed = EmailIntroduction(greeting="Hey Ada!", introduction=intro)
+        return EmailAgent({"name": "Ada", "interests": ["agents"]}, client=client, intro_mode=mode), client
+
+    def test_template_mode_makes_no_llm_call(self):
+        """Test that template introductions are deterministic and skip the model."""
+        from datetime import date
+
+        agent, client = self._agent("template")
+
+        intro = agent.generate_introduction(self.ARTICLES, digest_date=date(2025, 1, 15))
+
+        assert intro.greeting == "Hey Ada!"
+        assert "January 15, 2025" in intro.introduction
+        assert '"Agents in production"' in intro.introduction
+        client.responses.parse.assert_not_called()
+
+    def test_cached_mode_calls_once_per_profile_date_and_articles(self):
+        """Test that repeated introductions hit the cache until the top articles change."""
+        from datetime import date
+
+        from app.agents.email_agent import introduction_cache
+
+        introduction_cache._entries.clear()
+        agent, client = self._agent("cached")
+        day = date(2025, 1, 15)
+
+        first = agent.generate_introduction(self.ARTICLES, digest_date=day)
+        second = agent.generate_introduction(self.ARTICLES, digest_date=day)
+        agent.generate_introduction(self.ARTICLES[:1], digest_date=day)
+
+        assert first == second
+        assert client.responses.parse.call_count == 2
+
+    def test_subject_uses_structured_digest_date(self):
+        """Test that the subject date comes from the response, not the greeting text."""
+        from datetime import date
+
+        from app.services.process_email import email_subject
+
+        response = TestTemplates._response().model_copy(update={"digest_date": date(2025, 3, 2)})
+
+        assert email_subject(response) == "Daily AI News Digest - March 02, 2025"
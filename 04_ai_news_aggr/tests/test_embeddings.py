@@ -0,0 +1,218 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.database.repository import Repository
+from app.services import embeddings
+from app.services.embeddings import (
+    EmbeddingIndex,
+    HashingEmbedder,
+    index_new_digests,
+    normalize,
+    prerank_digests,
+)
+from app.services.near_duplicates import NearDuplicateIndex, collapse_clusters
+
+
+def _digest(repo: Repository, article_id: str, title: str, summary: str):
+    return repo.create_digest(
+        article_type="openai",
+        article_id=article_id,
+        url=f"https://example.com/{article_id}",
+        title=title,
+        summary=summary,
+        published_at=datetime.now(timezone.utc),
+    )
+
+
+class TestHashingEmbedder:
+    """Test the offline embedder."""
+
+    def test_embeddings_are_deterministic_unit_vectors(self):
+        """Test that the same text always maps to the same normalised vector."""
+        first = HashingEmbedder().embed(["Agents that write code"])
+        second = HashingEmbedder().embed(["Agents that write code"])
+
+        assert np.array_equal(first, second)
+        assert np.linalg.norm(first[0]) == pytest.approx(1.0, abs=1e-5)
+
+    def test_related_texts_score_higher(self):
+        """Test that overlapping texts are closer than unrelated ones."""
+        vectors = HashingEmbedder().embed(
+            [
+                "New reasoning model with long context window",
+                "A reasoning model with a long context window is released",
+                "Warehouse robots learn to stack boxes",
+            ]
+        )
+
+        assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+class TestEmbeddingIndex:
+    """Test the memory-mapped index."""
+
+    def test_search_matches_brute_force_across_chunks(self, tmp_path, monkeypatch):
+        """Test that chunked top-k returns the same neighbours as a full sort."""
+        monkeypatch.setattr(embeddings, "SEARCH_CHUNK_ROWS", 7)
+        rng = np.random.default_rng(1)
+        vectors = normalize(rng.standard_normal((50, 16), dtype=np.float32))
+        queries = normalize(rng.standard_normal((3, 16), dtype=np.float32))
+        index = EmbeddingIndex(tmp_path, dim=16)
+        index.add([f"id{i}" for i in range(50)], vectors)
+
+        results = index.search(queries, k=5)
+
+        expected = np.argsort(-(queries @ vectors.T), axis=1)[:, :5]
+        for hits, rows in zip(results, expected):
+            assert [item_id for item_id, _ in hits] == [f"id{row}" for row in rows]
+
+    def test_adds_are_incremental_and_persisted(self, tmp_path):
+        """Test that known ids are skipped and a reopened index sees every vector."""
+        vectors = HashingEmbedder(dim=32).embed(["a", "b", "c"])
+        index = EmbeddingIndex(tmp_path, dim=32)
+
+        assert index.add(["a", "b"], vectors[:2]) == 2
+        assert index.add(["b", "c"], vectors[1:]) == 1
+
+        reopened = EmbeddingIndex(tmp_path, dim=32)
+        assert len(reopened) == 3
+        assert np.allclose(reopened.get("c"), vectors[2])
+        assert reopened.related("a", k=5)[0][0] in {"b", "c"}
+        assert "a" not in {item_id for item_id, _ in reopened.related("a", k=5)}
+
+    def test_refresh_sees_vectors_added_by_another_process(self, tmp_path):
+        """Test that a long-lived reader picks up appends from another index instance."""
+        vectors = HashingEmbedder(dim=32).embed(["a", "b"])
+        reader = EmbeddingIndex(tmp_path, dim=32)
+        EmbeddingIndex(tmp_path, dim=32).add(["a", "b"], vectors)
+
+        reader.refresh()
+
+        assert "b" in reader
+
+    def test_torn_append_is_repaired_before_the_next_add(self, tmp_path):
+        """Test that vectors and a partial id left by an interrupted append do not shift later ids."""
+        vectors = HashingEmbedder(dim=32).embed(["a", "b", "c"])
+        EmbeddingIndex(tmp_path, dim=32).add(["a"], vectors[:1])
+        # Crash after writing b's vector and half its id
+        with open(tmp_path / "vectors.f32", "ab") as handle:
+            handle.write(vectors[1].tobytes() + b"\0\0")
+        with open(tmp_path / "ids.txt", "a") as handle:
+            handle.write("b")
+
+        index = EmbeddingIndex(tmp_path, dim=32)
+        assert index.add(["c"], vectors[2:]) == 1
+
+        reopened = EmbeddingIndex(tmp_path, dim=32)
+        assert (tmp_path / "ids.txt").read_text() == "a\nc\n"
+        assert np.allclose(reopened.get("c"), vectors[2])
+        assert "b" not in reopened
+
+    def test_concurrent_writers_keep_ids_and_vectors_aligned(self, tmp_path):
+        """Test that two index instances appending at once serialise on the lock file."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        texts = [f"story {i}" for i in range(40)]
+        vectors = HashingEmbedder(dim=32).embed(texts)
+        writers = [EmbeddingIndex(tmp_path, dim=32) for _ in range(2)]
+
+        def append(writer, offset):
+            for row in range(offset, len(texts), 2):
+                writer.add([texts[row]], vectors[row : row + 1])
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(append, writers, [0, 1]))
+
+        reopened = EmbeddingIndex(tmp_path, dim=32)
+        assert len(reopened) == len(texts)
+        for row, text in enumerate(texts):
+            assert np.allclose(reopened.get(text), vectors[row])
+            # A writer's own ids point at its own vectors, wherever the other's appends put them
+            assert np.allclose(writers[row % 2].get(text), vectors[row])
+
+    def test_mismatched_dimension_is_rejected(self, tmp_path):
+        """Test that an index cannot be reopened with a different embedder shape."""
+        EmbeddingIndex(tmp_path, dim=32)
+
+        with pytest.raises(ValueError):
+            EmbeddingIndex(tmp_path, dim=64)
+
+
+class TestSimilarityUses:
+    """Test semantic near-duplicates and profile pre-ranking."""
+
+    def test_semantic_duplicate_joins_cluster(self, test_db, tmp_path):
+        """Test that a near-identical digest is collapsed into the earlier one's cluster."""
+        repo = Repository(session=test_db)
+        NearDuplicateIndex(repo).add_many(
+            "openai",
+            [
+                {"guid": "a", "title": "Model launch", "description": "Launch post"},
+                {"guid": "b", "title": "Launch recap", "description": "Unrelated wording entirely"},
+                {"guid": "c", "title": "Robotics", "description": "Boxes"},
+            ],
+            id_field="guid",
+            content_field="description",
+        )
+        summary = "A new reasoning model ships with a longer context window and cheaper pricing."
+        digests = [
+            _digest(repo, "a", "New reasoning model", summary),
+            _digest(repo, "b", "New reasoning model", summary + " Available today."),
+            _digest(repo, "c", "Robots stack boxes", "Warehouse robots learned to stack irregular boxes."),
+        ]
+        index = EmbeddingIndex(tmp_path, dim=256)
+
+        stats = index_new_digests(repo, digests, index=index, embedder=HashingEmbedder())
+
+        assert stats == {"indexed": 3, "semantic_duplicates": 1}
+        kept = collapse_clusters(repo, [{"id": digest.id} for digest in digests])
+        assert [digest["id"] for digest in kept] == ["openai:a", "openai:c"]
+
+    def test_batches_search_append_and_look_up_clusters_once(self, test_db, tmp_path, monkeypatch):
+        """Test that each batch makes one search, cluster lookup and append, and duplicates chain across batches."""
+        from unittest.mock import patch
+
+        repo = Repository(session=test_db)
+        NearDuplicateIndex(repo).add_many(
+            "openai",
+            [{"guid": key, "title": f"Unrelated title {key}", "description": f"Words {key} " * 3} for key in "abcde"],
+            id_field="guid",
+            content_field="description",
+        )
+        summary = "A new reasoning model ships with a longer context window and cheaper pricing."
+        digests = [
+            _digest(repo, "a", "New reasoning model", summary),
+            _digest(repo, "b", "New reasoning model", summary + " Available today."),  # Same batch as a
+            _digest(repo, "c", "Robots stack boxes", "Warehouse robots learned to stack irregular boxes."),
+            _digest(repo, "d", "New reasoning model", summary + " Pricing below."),  # Matches a in the index
+            _digest(repo, "e", "Robots stack boxes", "Warehouse robots learned to stack irregular boxes today."),
+        ]
+        index = EmbeddingIndex(tmp_path, dim=256)
+        monkeypatch.setattr(embeddings, "INDEX_BATCH_ROWS", 2)
+
+        with patch.object(index, "add", wraps=index.add) as add, \
+                patch.object(index, "search", wraps=index.search) as search, \
+                patch.object(repo, "get_cluster_ids", wraps=repo.get_cluster_ids) as get_cluster_ids:
+            stats = index_new_digests(repo, digests, index=index, embedder=HashingEmbedder())
+
+        assert stats == {"indexed": 5, "semantic_duplicates": 3}
+        assert (add.call_count, search.call_count, get_cluster_ids.call_count) == (3, 3, 3)
+        clusters = repo.get_cluster_ids([digest.id for digest in digests])
+        assert clusters["openai:b"] == clusters["openai:d"] == clusters["openai:a"]
+        assert clusters["openai:e"] == clusters["openai:c"] != clusters["openai:a"]
+
+    def test_prerank_keeps_profile_matches_in_order(self):
+        """Test that pre-ranking drops the least profile-relevant digests only."""
+        profile = {"title": "ML engineer", "background": "LLM agents", "interests": ["LLM agents for coding"]}
+        digests = [
+            {"id": "1", "title": "LLM agents for coding", "summary": "Agents write code"},
+            {"id": "2", "title": "Cooking pasta", "summary": "Boil water"},
+            {"id": "3", "title": "Coding agents with LLM tools", "summary": "LLM agents"},
+        ]
+
+        kept = prerank_digests(digests, profile, limit=2, embedder=HashingEmbedder())
+
+        assert [digest["id"] for digest in kept] == ["1", "3"]
+        assert prerank_digests(digests, profile, limit=5) is digests
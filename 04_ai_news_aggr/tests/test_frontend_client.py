@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from app.api.main import app, get_db
+from app.database.repository import Repository
+from app.frontend.api_client import ApiClient
+
+
+class _AppAdapter(BaseAdapter):
+    """Transport adapter handing requests to the FastAPI app in-process, recording each one."""
+
+    def __init__(self, client: TestClient):
+        super().__init__()
+        self.client = client
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        reply = self.client.request(request.method, request.url, headers=dict(request.headers), content=request.body)
+        self.sent.append((request, reply.status_code))
+        response = requests.Response()
+        response.status_code = reply.status_code
+        response.headers = CaseInsensitiveDict(reply.headers)
+        response._content = reply.content
+        response.url, response.request = request.url, request
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def api(async_session_factory):
+    """Route an ApiClient session to the API app backed by the test database."""
+    async def _get_test_db():
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_test_db
+    adapter = _AppAdapter(TestClient(app))
+    session = requests.Session()
+    session.mount("http://", adapter)
+    yield session, adapter
+    app.dependency_overrides.clear()
+
+
+def _create_digests(test_db, count: int, start: int = 0) -> None:
+    repo = Repository(session=test_db)
+    published_at = datetime(2025, 1, 15, tzinfo=timezone.utc)
+    for i in range(start, start + count):
+        repo.create_digest("test", f"article_{i}", f"https://example.com/{i}", f"Title {i}", "Summary", published_at)
+
+
+class TestApiClient:
+    """Test the frontend's paging and ETag revalidation against the API."""
+
+    def test_pages_follow_cursors_to_the_end(self, api, test_db):
+        """Test that fetch_digest_page walks every digest through X-Next-Cursor."""
+        session, _ = api
+        _create_digests(test_db, 5)
+        client = ApiClient("http://testserver/", session=session)
+
+        ids, cursor = [], None
+        for _ in range(3):
+            digests, cursor = client.fetch_digest_page(cursor, limit=2)
+            ids += [digest["id"] for digest in digests]
+
+        assert cursor is None
+        assert ids == sorted((f"test:article_{i}" for i in range(5)), reverse=True)
+
+    def test_repeated_requests_revalidate_and_reuse_the_body(self, api, test_db):
+        """Test that a repeat sends the stored ETag and reuses the body on 304, and new digests are fetched."""
+        session, adapter = api
+        _create_digests(test_db, 1)
+        client = ApiClient("http://testserver", session=session)
+
+        first = client.fetch_digest_page(None, limit=10)
+        assert client.fetch_digest_page(None, limit=10) == first
+        assert "If-None-Match" not in adapter.sent[0][0].headers
+        request, status = adapter.sent[-1]
+        assert status == 304 and request.headers["If-None-Match"].startswith('W/"')
+
+        _create_digests(test_db, 1, start=1)
+        digests, _ = client.fetch_digest_page(None, limit=10)
+        assert adapter.sent[-1][1] == 200
+        assert len(digests) == 2
+
+    def test_validated_responses_are_capped(self, api, test_db):
+        """Test that only the most recently used max_validated requests keep an ETag."""
+        session, adapter = api
+        _create_digests(test_db, 1)
+        client = ApiClient("http://testserver", max_validated=2, session=session)
+
+        for limit in (1, 2, 3, 1):
+            client.fetch_digest_page(None, limit=limit)
+        assert [status for _, status in adapter.sent] == [200, 200, 200, 200]
+        client.fetch_digest_page(None, limit=3)
+        client.fetch_digest_page(None, limit=2)
+
+        assert [status for _, status in adapter.sent[4:]] == [304, 200]
+        assert len(client._validated) == 2
+
+    def test_errors_raise(self, api):
+        """Test that HTTP error statuses surface as requests.HTTPError."""
+        session, _ = api
+        client = ApiClient("http://testserver", session=session)
+
+        with pytest.raises(requests.HTTPError):
+            client.fetch_digest_page("not-a-cursor", limit=10)
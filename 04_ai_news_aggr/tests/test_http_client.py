@@ -0,0 +1,287 @@
+import gzip
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from app.scrapers.http_client import CircuitBreaker, CircuitOpenError, HttpClient
+
+BODY = b"<rss>" + b"<item>entry</item>" * 5000 + b"</rss>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if self.path == "/slow":
+                time.sleep(0.05)
+            if self.path == "/missing":
+                self._send(404, b"missing")
+            elif self.path == "/down":
+                self._send(503, b"down")
+            elif self.path == "/truncated":
+                # Promise the whole feed, send part of it and hang up
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(BODY)))
+                self.end_headers()
+                self.wfile.write(BODY[:1000])
+                self.close_connection = True
+            elif "gzip" in self.headers.get("Accept-Encoding", ""):
+                self._send(200, gzip.compress(BODY), {"Content-Encoding": "gzip"})
+            else:
+                self._send(200, BODY)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    do_POST = do_GET
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local HTTP/1.1 server serving a gzip-compressible feed."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.lock, httpd.hits, httpd.active, httpd.max_active = threading.Lock(), 0, 0, 0
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestHttpClient:
+    """Test connection reuse, compression and instrumentation of the shared client."""
+
+    def test_reuses_connections_and_decodes_gzip(self, server):
+        """Test that repeated fetches share one connection and count wire vs decoded bytes."""
+        _, url = server
+        client = HttpClient()
+
+        for _ in range(3):
+            assert client.get(f"{url}/feed").content == BODY
+
+        stats = client.stats.snapshot()
+        assert (stats["requests"], stats["connections"], stats["reused"]) == (3, 1, 2)
+        assert stats["bytes_decoded"] == 3 * len(BODY)
+        assert stats["bytes_received"] < stats["bytes_decoded"] / 10
+        assert list(stats["by_host"]) == [url.removeprefix("http://")]
+
+    def test_stream_counts_only_what_was_read(self, server):
+        """Test that leaving a stream early records the partial transfer."""
+        _, url = server
+        client = HttpClient()
+
+        with client.stream(f"{url}/feed", headers={"Accept-Encoding": "identity"}) as response:
+            assert response.raw.read(100) == BODY[:100]
+
+        stats = client.stats.snapshot()
+        assert stats["requests"] == 1
+        assert 100 <= stats["bytes_received"] < len(BODY)
+
+    def test_errors_raise_and_are_counted(self, server):
+        """Test that HTTP error statuses raise and count as failures."""
+        _, url = server
+        client = HttpClient(retries=0)
+        before = client.stats.snapshot()
+
+        with pytest.raises(requests.HTTPError):
+            client.get(f"{url}/missing")
+        with pytest.raises(requests.HTTPError):
+            with client.stream(f"{url}/missing"):
+                pass
+
+        assert client.stats.since(before)["failures"] == 2
+
+    def test_per_host_concurrency_cap(self, server):
+        """Test that no more than max_per_host requests run against one host at once."""
+        httpd, url = server
+        client = HttpClient(max_per_host=2)
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(lambda _: client.get(f"{url}/slow"), range(6)))
+
+        assert httpd.max_active == 2
+
+    def test_library_session_is_separate_but_instrumented(self, server):
+        """Test that a library's session keeps its own headers yet shares the pool, timeouts, breakers and stats."""
+        from app.scrapers.youtube import YouTubeScraper
+
+        httpd, url = server
+        client = HttpClient(retries=0, breaker_failures=1, clock=FakeClock())
+        with patch("app.scrapers.youtube.get_http_client", return_value=client):
+            session = YouTubeScraper().api._fetcher._http_client
+
+        assert session.headers["Accept-Language"] == "en-US"
+        assert "Accept-Language" not in client.session.headers
+        with patch.object(requests.Session, "send", autospec=True, side_effect=requests.Session.send) as send:
+            assert session.get(f"{url}/feed").content == BODY
+        assert send.call_args.kwargs["timeout"] == (client.connect_timeout, client.read_timeout)
+        with pytest.raises(requests.HTTPError):
+            session.post(f"{url}/down")
+        with pytest.raises(CircuitOpenError):
+            session.get(f"{url}/feed")
+
+        assert httpd.hits == 2
+        assert client.stats.snapshot()["requests"] == 1
+        assert client.breaker(url.removeprefix("http://")).state == "open"
+
+    def test_feedparser_fallback_reports_unreachable_feeds(self):
+        """Test that parse_with_feedparser returns an empty bozo result like feedparser.parse(url)."""
+        from app.scrapers.feed_stream import parse_with_feedparser
+
+        with patch("app.scrapers.feed_stream.get_http_client", return_value=HttpClient(retries=0)):
+            feed = parse_with_feedparser("http://127.0.0.1:1/feed.xml")
+
+        assert feed.entries == [] and feed.bozo
+
+
+class TestTruncatedFeeds:
+    """Test feeds whose body breaks off after the response started."""
+
+    def test_stream_raises_feed_read_error_and_source_falls_back(self, server):
+        """Test that a mid-body disconnect becomes FeedReadError and the rss source retries without streaming."""
+        from app.scrapers.feed_stream import FeedReadError, stream_feed_items
+        from app.scrapers.rss import RSSSource
+
+        httpd, url = server
+        cutoff = datetime.now(timezone.utc)
+        with patch("app.scrapers.feed_stream.get_http_client", return_value=HttpClient(retries=0)):
+            with pytest.raises(FeedReadError):
+                stream_feed_items(f"{url}/truncated", cutoff)
+
+            httpd.hits = 0
+            assert RSSSource("blog", feeds=[f"{url}/truncated"]).get_items(hours=24) == []
+            assert httpd.hits == 2  # Streamed, then fetched whole by the feedparser fallback
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test per-host circuit breakers and latency-based read timeouts."""
+
+    def test_opens_after_repeated_failures_and_skips_host(self, server):
+        """Test that consecutive 5xx responses open the breaker and later requests are not sent."""
+        httpd, url = server
+        client = HttpClient(retries=0, breaker_failures=3, clock=FakeClock())
+
+        for _ in range(3):
+            with pytest.raises(requests.HTTPError):
+                client.get(f"{url}/down")
+        with pytest.raises(CircuitOpenError):
+            client.get(f"{url}/feed")
+        with pytest.raises(CircuitOpenError):
+            with client.stream(f"{url}/feed"):
+                pass
+
+        assert httpd.hits == 3
+        state = client.breaker_states()[url.removeprefix("http://")]
+        assert (state["state"], state["trips"], state["skipped"]) == ("open", 1, 2)
+        assert client.stats.snapshot()["skipped"] == 2
+
+    def test_failures_while_streaming_the_body_trip(self, server):
+        """Test that streams whose body keeps breaking off open the breaker even though headers arrived."""
+        import urllib3
+
+        httpd, url = server
+        client = HttpClient(retries=0, breaker_failures=3, clock=FakeClock())
+
+        for _ in range(3):
+            with pytest.raises(urllib3.exceptions.ProtocolError):
+                with client.stream(f"{url}/truncated") as response:
+                    response.raw.read()
+        with pytest.raises(CircuitOpenError):
+            with client.stream(f"{url}/truncated"):
+                pass
+
+        assert httpd.hits == 3
+        assert client.breaker_states()[url.removeprefix("http://")]["state"] == "open"
+        assert client.stats.snapshot()["failures"] == 3
+
+    def test_half_open_trial_doubles_cooldown_or_closes(self, server):
+        """Test that a failed trial after the cool-down reopens for twice as long and a successful one closes."""
+        httpd, url = server
+        clock = FakeClock()
+        client = HttpClient(retries=0, breaker_failures=1, breaker_cooldown=10, clock=clock)
+        breaker = client.breaker(url.removeprefix("http://"))
+
+        with pytest.raises(requests.HTTPError):
+            client.get(f"{url}/down")
+        clock.now = 10
+        with pytest.raises(requests.HTTPError):
+            client.get(f"{url}/down")
+        assert (breaker.state, breaker.cooldown) == ("open", 20)
+
+        clock.now = 25
+        with pytest.raises(CircuitOpenError):
+            client.get(f"{url}/feed")
+        clock.now = 30
+        assert client.get(f"{url}/feed").content == BODY
+        assert (breaker.state, breaker.cooldown, breaker.failures) == ("closed", 10, 0)
+        assert httpd.hits == 3
+
+    def test_client_errors_do_not_trip(self, server):
+        """Test that 404s count as failed requests but show the host is up."""
+        _, url = server
+        client = HttpClient(retries=0, breaker_failures=2)
+
+        for _ in range(3):
+            with pytest.raises(requests.HTTPError):
+                client.get(f"{url}/missing")
+
+        assert client.breaker(url.removeprefix("http://")).state == "closed"
+
+    def test_unreachable_host_opens_breaker(self):
+        """Test that connection errors trip the breaker and the feed fallback still returns bozo."""
+        from app.scrapers.feed_stream import parse_with_feedparser
+
+        client = HttpClient(retries=0, breaker_failures=2)
+        with patch("app.scrapers.feed_stream.get_http_client", return_value=client):
+            feeds = [parse_with_feedparser("http://127.0.0.1:1/feed.xml") for _ in range(3)]
+
+        assert all(feed.bozo and feed.entries == [] for feed in feeds)
+        assert isinstance(feeds[-1].bozo_exception, CircuitOpenError)
+        assert client.breaker("127.0.0.1:1").state == "open"
+
+    def test_read_timeout_follows_latency(self):
+        """Test that the read timeout is a multiple of the average latency, within its bounds."""
+        breaker = CircuitBreaker()
+        assert breaker.read_timeout(30, 5, 10) == 30
+
+        breaker.record_success(0.2)
+        assert breaker.read_timeout(30, 5, 10) == 5
+        for _ in range(20):
+            breaker.record_success(2.0)
+        assert 19 < breaker.read_timeout(30, 5, 10) <= 20
+        breaker.record_success(60.0)
+        assert breaker.read_timeout(30, 5, 10) == 30
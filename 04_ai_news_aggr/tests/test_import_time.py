@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Scraping and ML stacks that only the pipeline needs
+HEAVY_PACKAGES = {"docling", "torch", "transformers", "openai", "youtube_transcript_api", "feedparser", "numpy"}
+
+# Cumulative import time budget for the API module, in milliseconds.
+# Measured at ~0.8s locally (mostly FastAPI); override on slow CI runners.
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2000"))
+
+
+def measure_import(module: str) -> dict:
+    """Import a module in a fresh interpreter under `-X importtime`.
+
+    Returns:
+        Mapping of imported module name to cumulative import time in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+@pytest.mark.parametrize("module", ["app.api.main", "app.database.repository"])
+def test_module_does_not_import_heavy_stacks(module):
+    """Test that serving the API doesn't import the scraping and LLM stacks."""
+    timings = measure_import(module)
+    heavy = sorted(name for name in timings if name.split(".")[0] in HEAVY_PACKAGES)
+    assert heavy == []
+
+
+def test_api_import_time_within_budget():
+    """Test that importing the API stays within the import time budget."""
+    timings = measure_import("app.api.main")
+    elapsed_ms = timings["app.api.main"] / 1000
+    assert elapsed_ms < IMPORT_BUDGET_MS, f"app.api.main took {elapsed_ms:.0f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)"
+
+
+def test_importing_database_creates_no_engine():
+    """Test that importing app.database.connection has no engine side effects."""
+    code = (
+        "import app.database.connection as c; "
+        "assert c.get_engine.cache_info().currsize == 0; "
+        "assert c.SessionLocal.kw.get('bind') is None"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True)
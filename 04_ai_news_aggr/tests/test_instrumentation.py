@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+from app.database.instrumentation import operation, record_queries
+from app.database.models import ContentItem
+from app.database.repository import Repository
+
+
+def _videos(count: int, start: int = 0) -> list:
+    return [
+        {
+            "external_id": f"video{i}",
+            "title": f"Video {i}",
+            "url": f"https://youtube.com/watch?v=video{i}",
+            "extra": {"channel_id": "channel"},
+            "published_at": datetime(2025, 1, 15, tzinfo=timezone.utc),
+            "description": "Description",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+class TestQueryBudgets:
+    """Test statement counts of repository bulk operations."""
+
+    def test_bulk_insert_1000_rows_under_budget(self, test_db):
+        """Test that a 1000-row bulk insert uses fewer than 10 statements."""
+        repo = Repository(session=test_db)
+
+        with record_queries(test_db.get_bind()) as queries:
+            added = repo.bulk_create_content_items("youtube", _videos(1000))
+
+        assert added == 1000
+        assert queries.count < 10
+        assert queries.n_plus_one() == []
+        assert test_db.query(ContentItem).count() == 1000
+
+    def test_bulk_insert_skips_existing_and_repeated_keys(self, test_db):
+        """Test that stored keys and keys repeated within the batch are inserted once."""
+        repo = Repository(session=test_db)
+        repo.bulk_create_content_items("youtube", _videos(5))
+
+        with record_queries(test_db.get_bind()) as queries:
+            added = repo.bulk_create_content_items("youtube", _videos(10) + _videos(3, start=8))
+
+        assert added == 6
+        assert queries.count < 5
+        assert test_db.query(ContentItem).count() == 11
+
+
+class TestQueryRecorder:
+    """Test statement attribution and N+1 detection."""
+
+    def test_statements_labelled_by_method_and_stage(self, test_db):
+        """Test that statements are grouped by Repository method and enclosing stage."""
+        repo = Repository(session=test_db)
+
+        with record_queries(test_db.get_bind()) as queries:
+            with operation("scraping"):
+                repo.bulk_create_content_items("youtube", _videos(3))
+            repo.get_items_without_content("youtube")
+
+        assert set(queries.by_operation()) == {
+            "Repository.bulk_create_content_items",
+            "Repository.get_items_without_content",
+        }
+        assert set(queries.by_stage()) == {"scraping", "Repository.get_items_without_content"}
+
+    def test_per_row_lookups_flagged(self, test_db):
+        """Test that a per-row update loop is reported as an N+1 pattern."""
+        repo = Repository(session=test_db)
+        repo.bulk_create_content_items("youtube", _videos(12))
+
+        with record_queries(test_db.get_bind(), n_plus_one_threshold=10) as queries:
+            for i in range(12):
+                repo.update_item_content("youtube", f"video{i}", "Transcript")
+
+        flagged = {(pattern["operation"], pattern["count"]) for pattern in queries.n_plus_one()}
+        assert ("Repository.update_item_content", 12) in flagged
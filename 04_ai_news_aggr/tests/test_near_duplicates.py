@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+
+from app.database.repository import Repository
+from app.services.near_duplicates import (
+    MinHasher,
+    NearDuplicateIndex,
+    estimate_jaccard,
+    normalise,
+    link_duplicates,
+    select_representatives,
+    shingles,
+)
+
+ANNOUNCEMENT = (
+    "Today we are releasing a new family of reasoning models that are faster and cheaper, "
+    "with a 1M token context window and improved tool use for agentic coding workflows."
+)
+
+
+def _article(guid: str, title: str, description: str) -> dict:
+    return {
+        "guid": guid,
+        "title": title,
+        "url": f"https://example.com/{guid}",
+        "description": description,
+        "published_at": datetime.now(timezone.utc),
+    }
+
+
+class TestMinHash:
+    """Test signature similarity estimates."""
+
+    def test_similar_texts_have_high_estimated_jaccard(self):
+        """Test that light rewording keeps signatures close while unrelated texts diverge."""
+        hasher = MinHasher()
+        original = hasher.signature(shingles(normalise("New reasoning models", ANNOUNCEMENT)))
+        reworded = hasher.signature(
+            shingles(normalise("New reasoning models!", "<p>" + ANNOUNCEMENT + " Read more at https://x.io</p>"))
+        )
+        unrelated = hasher.signature(
+            shingles(normalise("Robotics update", "Our warehouse robots learned to stack irregular boxes."))
+        )
+
+        assert estimate_jaccard(original, reworded) > 0.8
+        assert estimate_jaccard(original, unrelated) < 0.2
+
+
+class TestNearDuplicateIndex:
+    """Test incremental clustering and representative selection."""
+
+    def test_cross_source_copies_share_a_cluster(self, test_db):
+        """Test that the same announcement in two feeds lands in one cluster."""
+        repo = Repository(session=test_db)
+        index = NearDuplicateIndex(repo)
+
+        openai_items = [_article("oa_1", "New reasoning models", ANNOUNCEMENT)]
+        anthropic_items = [
+            _article("an_1", "New reasoning models", ANNOUNCEMENT + " Available today."),
+            _article("an_2", "Interpretability research", "We trace circuits inside a small transformer."),
+        ]
+
+        assert index.add_many("openai", openai_items, "guid", "description") == {"indexed": 1, "duplicates": 0}
+        assert index.add_many("anthropic", anthropic_items, "guid", "description") == {"indexed": 2, "duplicates": 1}
+
+        # Re-indexing the same items is a no-op
+        assert index.add_many("anthropic", anthropic_items, "guid", "description") == {"indexed": 0, "duplicates": 0}
+
+        clusters = repo.get_cluster_ids(["openai:oa_1", "anthropic:an_1", "anthropic:an_2"])
+        assert clusters["anthropic:an_1"] == "openai:oa_1"
+        assert clusters["anthropic:an_2"] == "anthropic:an_2"
+        assert repo.get_linked_sources(["openai:oa_1", "anthropic:an_2"]) == {}  # Not stored as content items
+
+    def test_select_representatives_digests_one_per_cluster(self, test_db):
+        """Test that only one member per cluster is queued, and none once a digest exists."""
+        repo = Repository(session=test_db)
+        index = NearDuplicateIndex(repo)
+        index.add_many("openai", [_article("oa_1", "New reasoning models", ANNOUNCEMENT)], "guid", "description")
+        index.add_many("anthropic", [_article("an_1", "New reasoning models", ANNOUNCEMENT)], "guid", "description")
+
+        pending = [
+            {"type": "openai", "id": "oa_1", "title": "New reasoning models"},
+            {"type": "anthropic", "id": "an_1", "title": "New reasoning models"},
+            {"type": "youtube", "id": "unindexed", "title": "Not fingerprinted"},
+        ]
+
+        representatives, duplicates = select_representatives(repo, pending)
+        assert [a["id"] for a in representatives] == ["oa_1", "unindexed"]
+        assert [(a["id"], a["duplicate_of"]) for a in duplicates] == [("an_1", "openai:oa_1")]
+
+        repo.create_digest(
+            article_type="openai",
+            article_id="oa_1",
+            url="https://example.com/oa_1",
+            title="Digest",
+            summary="Summary",
+            published_at=datetime.now(timezone.utc),
+        )
+        representatives, duplicates = select_representatives(repo, pending[1:])
+        assert [a["id"] for a in representatives] == ["unindexed"]
+        assert [a["id"] for a in duplicates] == ["an_1"]
+
+    def test_linked_duplicates_leave_the_queue_and_show_as_sources(self, test_db):
+        """Test that duplicates of a digested item stop being pending and are listed as its other sources."""
+        repo = Repository(session=test_db)
+        index = NearDuplicateIndex(repo)
+        published_at = datetime(2025, 1, 15)
+        for day, source, guid in ((15, "openai", "oa_1"), (16, "anthropic", "an_1")):
+            url = f"https://{source}.com/{guid}"
+            repo.create_content_item(source, guid, "New reasoning models", url, datetime(2025, 1, day))
+            repo.bulk_update_content(source, {guid: ANNOUNCEMENT})
+            index.add_many(source, [_article(guid, "New reasoning models", ANNOUNCEMENT)], "guid", "description")
+
+        articles, duplicates = select_representatives(repo, repo.get_articles_without_digest())
+        assert link_duplicates(repo, duplicates) == 0  # Representative not digested yet: stays pending
+        repo.create_digest("openai", "oa_1", "https://openai.com/oa_1", "Digest", "Summary", published_at)
+        assert link_duplicates(repo, duplicates) == 1
+
+        assert repo.get_articles_without_digest() == []
+        linked = repo.get_linked_sources(["openai:oa_1"])
+        assert [(row.source, row.url) for row in linked["openai:oa_1"]] == [("anthropic", "https://anthropic.com/an_1")]
+
+    def test_batch_clusters_within_itself_in_few_statements(self, test_db):
+        """Test that a scraped batch is fingerprinted with batched lookups and inserts, copies in it included."""
+        from app.database.instrumentation import record_queries
+
+        repo = Repository(session=test_db)
+        index = NearDuplicateIndex(repo)
+        index.add_many("openai", [_article("oa_1", "New reasoning models", ANNOUNCEMENT)], "guid", "description")
+        items = [_article(f"an_{i}", f"Research note {i}", f"Topic {i} " + "words " * i) for i in range(200)]
+        items += [
+            _article("an_copy", "New reasoning models", ANNOUNCEMENT + " Available today."),
+            _article("an_new", "Robotics update", "Our warehouse robots learned to stack irregular boxes."),
+            _article("an_new_copy", "Robotics update", "Our warehouse robots learned to stack irregular boxes!"),
+        ]
+
+        with record_queries(test_db.get_bind()) as queries:
+            stats = index.add_many("anthropic", items, "guid", "description")
+
+        assert stats == {"indexed": 203, "duplicates": 2}
+        assert queries.count < 25
+        assert queries.n_plus_one() == []
+        clusters = repo.get_cluster_ids(["anthropic:an_copy", "anthropic:an_new_copy"])
+        assert clusters == {"anthropic:an_copy": "openai:oa_1", "anthropic:an_new_copy": "anthropic:an_new"}
@@ -0,0 +1,35 @@
+from benchmarks.replay.corpus import generate_corpus, load_corpus, save_corpus
+from benchmarks.replay.harness import STAGES, compare_to_baseline, run_replay
+
+
+class TestReplayHarness:
+    """Test the offline pipeline replay benchmark."""
+
+    def test_corpus_round_trip(self, tmp_path):
+        """Test that a saved corpus loads back unchanged."""
+        corpus = generate_corpus(40)
+        save_corpus(corpus, tmp_path)
+
+        assert load_corpus(tmp_path) == corpus
+        assert corpus.items == 40
+
+    def test_pipeline_replays_every_stage(self):
+        """Test that the real pipeline runs end to end on a small corpus."""
+        result = run_replay(generate_corpus(40), trace_memory=False)
+
+        assert result.success is True
+        assert list(result.stages) == STAGES
+        assert all(stage.queries > 0 for stage in result.stages.values())
+        assert result.pipeline["scraping"] == {"youtube": 10, "openai": 10, "anthropic": 20}
+        assert result.pipeline["digests"]["processed"] > 0
+        assert result.emails_sent == 1
+
+    def test_query_regression_detected(self):
+        """Test that more queries than the baseline allows is reported."""
+        baseline = [{"items": 100, "stages": {"run_scrapers": {"seconds": 0.01, "queries": 100}}}]
+        results = [{"items": 100, "stages": {"run_scrapers": {"seconds": 0.01, "queries": 150}}}]
+
+        assert compare_to_baseline(results, baseline, max_regression=0.2) == [
+            "100 items / run_scrapers: 150 queries (baseline 100)"
+        ]
+        assert compare_to_baseline(results, baseline, max_regression=0.6) == []
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+from app.database.models import ContentItem
+from app.database.repository import ARCHIVED_MARKER, Repository
+from app.services.retention import RetentionPolicy, archive_raw_content, restore_raw_content, vacuum_tables
+
+TRANSCRIPT = "We talk about retrieval augmented generation and evaluation. " * 200
+
+
+def _seed(repo: Repository) -> None:
+    old = datetime.utcnow() - timedelta(days=60)
+    published = datetime(2025, 1, 15, tzinfo=timezone.utc)
+    for video_id, created_at, digested in (
+        ("old-digested", old, True),
+        ("old-pending", old, False),
+        ("new-digested", datetime.utcnow(), True),
+    ):
+        repo.session.add(
+            ContentItem(
+                source="youtube",
+                external_id=video_id,
+                title=video_id,
+                url=f"https://youtube.com/watch?v={video_id}",
+                published_at=published,
+                content=TRANSCRIPT,
+                created_at=created_at,
+            )
+        )
+        if digested:
+            repo.create_digest("youtube", video_id, "https://youtube.com", video_id, "Summary", published_at=published)
+    repo.session.add(
+        ContentItem(
+            source="anthropic",
+            external_id="post",
+            title="Post",
+            url="https://anthropic.com/post",
+            published_at=published,
+            content="# Post\n\nBody " * 100,
+            created_at=old,
+        )
+    )
+    repo.create_digest("anthropic", "post", "https://anthropic.com/post", "Post", "Summary", published_at=published)
+    repo.session.commit()
+
+
+class TestRetention:
+    """Test archiving and restoring raw item content."""
+
+    def test_archives_only_old_digested_content(self, test_db):
+        """Test that old digested content is compressed into the archive and marked in place."""
+        repo = Repository(session=test_db)
+        _seed(repo)
+
+        stats = archive_raw_content(repo, RetentionPolicy(min_age_days=30))
+
+        assert stats.archived == {"youtube": 1, "anthropic": 1}
+        assert stats.stored_bytes * 10 < stats.raw_bytes
+        transcripts = {item.external_id: item.content for item in test_db.query(ContentItem).filter_by(source="youtube")}
+        assert transcripts == {
+            "old-digested": ARCHIVED_MARKER,
+            "old-pending": TRANSCRIPT,
+            "new-digested": TRANSCRIPT,
+        }
+        assert test_db.get(ContentItem, ("anthropic", "post")).content == ARCHIVED_MARKER
+        assert repo.get_archive_stats()["items"] == 2
+        # A second run has nothing left to do
+        assert archive_raw_content(repo, RetentionPolicy(min_age_days=30)).archived == {"youtube": 0, "anthropic": 0}
+
+    def test_archived_rows_are_not_pending_work(self, test_db):
+        """Test that archived items are not offered for digesting again."""
+        repo = Repository(session=test_db)
+        _seed(repo)
+        test_db.get(ContentItem, ("youtube", "old-pending")).content = ARCHIVED_MARKER
+        test_db.commit()
+
+        assert repo.get_articles_without_digest() == []
+
+    def test_restore_and_vacuum(self, test_db):
+        """Test that restoring puts the original content back and vacuum runs afterwards."""
+        repo = Repository(session=test_db)
+        _seed(repo)
+        archive_raw_content(repo, RetentionPolicy(min_age_days=30))
+
+        restored = restore_raw_content(repo, ["youtube:old-digested", "youtube:missing"])
+
+        assert restored == {"youtube:old-digested": TRANSCRIPT}
+        assert test_db.get(ContentItem, ("youtube", "old-digested")).content == TRANSCRIPT
+        assert repo.get_archive_stats()["items"] == 1
+        test_db.commit()
+        vacuum_tables(test_db.get_bind(), ["content_items", "archived_content"])
@@ -0,0 +1,182 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.database.locks import lock_key, run_lock
+from app.database.models import SchedulerRun
+from app.scheduler import CronSchedule, Job, Scheduler
+
+SATURDAY = datetime(2025, 1, 18, 8, 30)
+
+
+class FakeClock:
+    """Manually advanced clock returning naive UTC datetimes."""
+
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def scheduler_db(test_db):
+    """Route the scheduler's sessions to the test database."""
+
+    @contextmanager
+    def scope():
+        yield test_db
+
+    with patch("app.scheduler.session_scope", scope):
+        yield test_db
+
+
+def _scheduler(test_db, clock, jobs, **kwargs) -> Scheduler:
+    return Scheduler(jobs, jitter_seconds=0, engine=test_db.get_bind(), clock=clock, **kwargs)
+
+
+class TestCronSchedule:
+    """Test cron expression parsing and slot computation."""
+
+    @pytest.mark.parametrize(
+        "expression, expected",
+        [
+            ("*/15 * * * *", datetime(2025, 1, 18, 8, 45)),
+            ("0 7 * * 1-5", datetime(2025, 1, 20, 7, 0)),  # Skips the weekend
+            ("0 0 1 * 1", datetime(2025, 1, 20, 0, 0)),  # Day of month OR weekday
+            ("30 3 * * 7", datetime(2025, 1, 19, 3, 30)),  # 7 is Sunday too
+            ("0 0 29 2 *", datetime(2028, 2, 29, 0, 0)),
+            ("@hourly", datetime(2025, 1, 18, 9, 0)),
+        ],
+    )
+    def test_next_after(self, expression, expected):
+        """Test that next_after returns the first matching minute after the given time."""
+        assert CronSchedule(expression).next_after(SATURDAY) == expected
+
+    @pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "*/0 * * * *", "a * * * *", "0 0 31 2 *"])
+    def test_invalid_expressions_raise(self, expression):
+        """Test that malformed or unsatisfiable expressions raise ValueError."""
+        with pytest.raises(ValueError):
+            CronSchedule(expression).next_after(SATURDAY)
+
+
+class TestScheduler:
+    """Test due-job selection, catch-up, locking and run records."""
+
+    def test_runs_each_slot_once_and_records_it(self, scheduler_db):
+        """Test that a job runs when its slot passes, once, and its run is recorded."""
+        clock = FakeClock(SATURDAY)
+        calls = []
+        job = Job("scrape", CronSchedule("0 * * * *"), lambda since: calls.append(since) or {})
+        scheduler = _scheduler(scheduler_db, clock, [job])
+
+        assert scheduler.run_pending() == {}  # Nothing due at start
+        clock.now = SATURDAY.replace(hour=9, minute=0, second=20)
+        scheduler.run_pending()
+        scheduler.run_pending()
+
+        assert calls == [None]
+        run = scheduler_db.get(SchedulerRun, "scrape")
+        assert (run.scheduled_at, run.status, run.last_success_at) == (datetime(2025, 1, 18, 9), "success", clock.now)
+
+        clock.now += timedelta(hours=1)
+        scheduler.run_pending()
+        assert calls == [None, datetime(2025, 1, 18, 9, 0, 20)]  # Since the last successful run
+
+    def test_catch_up_coalesces_missed_slots_within_window(self, scheduler_db):
+        """Test that after downtime a job runs once for its latest missed slot, and older misses are skipped."""
+        scheduler_db.add(SchedulerRun(job="scrape", scheduled_at=datetime(2025, 1, 18, 2), status="success"))
+        scheduler_db.add(SchedulerRun(job="email", scheduled_at=datetime(2025, 1, 16, 7), status="success"))
+        scheduler_db.commit()
+        calls = []
+        scheduler = _scheduler(
+            scheduler_db,
+            FakeClock(SATURDAY),
+            [
+                Job("scrape", CronSchedule("0 * * * *"), lambda since: calls.append("scrape") or {}),
+                Job("email", CronSchedule("0 7 * * *"), lambda since: calls.append("email") or {}),
+            ],
+            catch_up_hours=1,
+        )
+
+        scheduler.run_pending()
+
+        assert calls == ["scrape"]
+        assert scheduler_db.get(SchedulerRun, "scrape").scheduled_at == datetime(2025, 1, 18, 8)
+        email = scheduler_db.get(SchedulerRun, "email")
+        assert (email.status, email.scheduled_at) == ("skipped", datetime(2025, 1, 18, 7, 30))
+
+    def test_skips_while_another_run_holds_the_lock(self, scheduler_db):
+        """Test that due jobs wait for the run lock instead of overlapping, then run."""
+        clock = FakeClock(SATURDAY)
+        calls = []
+        job = Job("digest", CronSchedule("* * * * *"), lambda since: calls.append(since) or {})
+        scheduler = _scheduler(scheduler_db, clock, [job])
+        clock.now += timedelta(minutes=1)
+
+        with run_lock("pipeline", scheduler_db.get_bind()) as held:
+            assert held
+            assert scheduler.run_pending() == {}
+        assert scheduler_db.get(SchedulerRun, "digest") is None
+
+        scheduler.run_pending()
+        assert calls == [None]
+
+    def test_slot_run_by_another_scheduler_during_jitter_is_not_repeated(self, scheduler_db):
+        """Test that a replica waking from its jitter after another ran the slot does not run it again."""
+        clock = FakeClock(SATURDAY)
+        calls = []
+        job = Job("email", CronSchedule("0 9 * * *"), lambda since: calls.append(since) or {})
+        first = _scheduler(scheduler_db, clock, [job])
+        # The second replica's jitter sleep lets the first one take the lock and run the slot
+        second = Scheduler([job], jitter_seconds=60, engine=scheduler_db.get_bind(), clock=clock,
+                           sleep=lambda seconds: first.run_pending())
+        clock.now = SATURDAY.replace(hour=9, minute=0, second=10)
+
+        assert second.run_pending() == {}
+        assert calls == [None]
+        assert scheduler_db.get(SchedulerRun, "email").scheduled_at == datetime(2025, 1, 18, 9)
+
+    def test_failures_are_recorded(self, scheduler_db):
+        """Test that exceptions and success=False results are recorded as failed runs."""
+        clock = FakeClock(SATURDAY)
+
+        def boom(since):
+            raise RuntimeError("feed host down")
+
+        scheduler = _scheduler(
+            scheduler_db,
+            clock,
+            [
+                Job("scrape", CronSchedule("* * * * *"), boom),
+                Job("email", CronSchedule("* * * * *"), lambda since: {"success": False, "error": "No subscribers"}),
+            ],
+        )
+        clock.now += timedelta(minutes=1)
+
+        scheduler.run_pending()
+
+        runs = {run.job: (run.status, run.error, run.last_success_at) for run in scheduler_db.query(SchedulerRun)}
+        assert runs == {"scrape": ("failed", "feed host down", None), "email": ("failed", "No subscribers", None)}
+
+
+class TestRunLock:
+    """Test the cross-process run lock."""
+
+    def test_sqlite_file_lock_excludes_second_holder(self, test_db):
+        """Test that a held lock is refused to a second taker and free again once released."""
+        engine = test_db.get_bind()
+        with run_lock("pipeline", engine) as first:
+            with run_lock("pipeline", engine) as second:
+                assert (first, second) == (True, False)
+            with run_lock("other", engine) as other:
+                assert other
+        with run_lock("pipeline", engine) as again:
+            assert again
+
+    def test_advisory_lock_keys_are_stable_signed_64_bit(self):
+        """Test that Postgres advisory lock keys are deterministic and fit a bigint."""
+        assert lock_key("pipeline") == lock_key("pipeline") != lock_key("other")
+        assert -(2**63) <= lock_key("pipeline") < 2**63
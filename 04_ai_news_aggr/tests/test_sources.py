@@ -0,0 +1,348 @@
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.database.models import ContentItem
+from app.database.repository import UNAVAILABLE_MARKER, Repository
+from app.scrapers.registry import SOURCE_TYPES, FetchedContent, ScrapedItem, Source, load_sources, register_source_type
+from app.scrapers.transcripts import TranscriptSegments, timestamp_url
+
+
+class StaticSource(Source):
+    """Plugin-style source used to test "module:Class" config types."""
+
+    fetches_content = True
+    mark_unavailable = True
+
+    def __init__(self, name: str, contents: dict):
+        super().__init__(name)
+        self.contents = contents
+
+    def get_items(self, hours: int = 24, seen=None):
+        now = datetime.now(timezone.utc)
+        return [ScrapedItem(external_id=key, title=key, url=f"https://example.com/{key}", published_at=now)
+                for key in self.contents]
+
+    def fetch_content(self, item):
+        content = self.contents[item.external_id]
+        if isinstance(content, Exception):
+            raise content
+        return content
+
+
+def _feed(*entries) -> str:
+    items = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{guid}</link><guid>{guid}</guid>"
+        f"<pubDate>{format_datetime(published)}</pubDate><category>{category}</category></item>"
+        for guid, title, published, category in entries
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>{items}</channel></rss>'
+
+
+def _atom(*entries) -> str:
+    items = "".join(
+        f'<entry><id>{guid}</id><title>{title}</title><link rel="alternate" href="https://example.com/{guid}"/>'
+        f'<published>{published.isoformat()}</published><category term="{category}"/>'
+        f"<summary>About {title}</summary></entry>"
+        for guid, title, published, category in entries
+    )
+    return f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>Feed</title>{items}</feed>'
+
+
+class TestSourceRegistry:
+    """Test building sources from config."""
+
+    def test_builtin_types_load_from_config(self):
+        """Test that config dicts build the registered built-in source classes."""
+        sources = load_sources(
+            [
+                {"name": "openai", "type": "rss", "feeds": ["https://openai.com/news/rss.xml"]},
+                {"name": "anthropic", "type": "rss", "feeds": ["https://a/1.xml", "https://a/2.xml"], "fetch_pages": True},
+                {"name": "youtube", "type": "youtube", "channels": ["UC123"]},
+            ]
+        )
+
+        assert [(s.name, type(s).__name__, s.fetches_content) for s in sources] == [
+            ("openai", "RSSSource", False),
+            ("anthropic", "RSSSource", True),
+            ("youtube", "YouTubeSource", True),
+        ]
+        assert sources[2].mark_unavailable
+
+    def test_plugin_class_path_and_registered_type(self):
+        """Test "module:Class" types and types added with register_source_type."""
+        register_source_type("static")(StaticSource)
+        try:
+            sources = load_sources(
+                [
+                    {"name": "a", "type": "tests.test_sources:StaticSource", "contents": {"x": "X"}},
+                    {"name": "b", "type": "static", "contents": {}},
+                ]
+            )
+        finally:
+            SOURCE_TYPES.pop("static")
+
+        assert [type(s) for s in sources] == [StaticSource, StaticSource]
+        assert sources[0].contents == {"x": "X"}
+
+    @pytest.mark.parametrize(
+        "configs, message",
+        [
+            ([{"name": "a", "type": "nope"}], "Unknown source type"),
+            ([{"type": "rss", "feeds": []}], "missing 'name'"),
+            ([{"name": "a", "type": "rss", "feeds": []}, {"name": "a", "type": "rss", "feeds": []}], "Duplicate"),
+        ],
+    )
+    def test_invalid_configs_raise(self, configs, message):
+        """Test that unknown types, missing keys and duplicate names are rejected."""
+        with pytest.raises(ValueError, match=message):
+            load_sources(configs)
+
+    def test_sources_config_file_replaces_defaults(self, tmp_path, monkeypatch):
+        """Test that SOURCES_CONFIG points at a JSON list that replaces app.config.SOURCES."""
+        path = tmp_path / "sources.json"
+        path.write_text(json.dumps([{"name": "blog", "type": "rss", "feeds": ["https://blog/rss"]}]))
+        monkeypatch.setenv("SOURCES_CONFIG", str(path))
+
+        assert [s.name for s in load_sources()] == ["blog"]
+
+
+class TestRSSSource:
+    """Test feed parsing in the rss source type."""
+
+    def test_get_items_filters_and_dedupes_across_feeds(self, tmp_path):
+        """Test the time cutoff, guid dedup across feeds and category extraction."""
+        from app.scrapers.rss import RSSSource
+
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        first, second = tmp_path / "first.xml", tmp_path / "second.xml"
+        first.write_text(_feed(("p1", "Post 1", now - timedelta(hours=1), "Research"),
+                               ("old", "Old", now - timedelta(hours=48), "News")))
+        second.write_text(_feed(("p1", "Post 1", now - timedelta(hours=1), "Research"),
+                                ("p2", "Post 2", now - timedelta(hours=2), "News")))
+
+        for parser in ("stream", "feedparser"):
+            items = RSSSource("blog", feeds=[str(first), str(second)], parser=parser).get_items(hours=24)
+
+            assert [(i.external_id, i.category) for i in items] == [("p1", "Research"), ("p2", "News")]
+            assert items[0].published_at == now - timedelta(hours=1)
+
+    def test_stream_parser_matches_feedparser(self, tmp_path):
+        """Test that the stream parser yields the same items as feedparser for RSS and Atom."""
+        from app.scrapers.rss import RSSSource
+
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        entries = [(f"p{i}", f"Post &amp; {i}", now - timedelta(hours=i), "News") for i in (3, 1, 2)]
+        rss, atom = tmp_path / "rss.xml", tmp_path / "atom.xml"
+        rss.write_text(_feed(*entries).replace("<item>", "<item><description><![CDATA[<p>Body</p>]]></description>", 1))
+        atom.write_text(_atom(*entries))
+
+        for path in (rss, atom):
+            streamed = RSSSource("blog", feeds=[str(path)], sorted_by_date=False).get_items(hours=24)
+            parsed = RSSSource("blog", feeds=[str(path)], parser="feedparser").get_items(hours=24)
+
+            assert [item.model_dump() for item in streamed] == [item.model_dump() for item in parsed]
+            assert len(streamed) == 3
+
+    def test_stream_parser_stops_at_cutoff_and_falls_back(self, tmp_path):
+        """Test early stop on sorted feeds and the feedparser fallback for malformed ones."""
+        import feedparser
+
+        from app.scrapers.rss import RSSSource
+
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        path = tmp_path / "feed.xml"
+        # Anything after the first old entry is never read, so the broken tail does not matter
+        document = _feed(("new", "New", now - timedelta(hours=1), "News"), ("old", "Old", now - timedelta(days=3), "News"))
+        path.write_text(document.replace("</channel></rss>", "<item><title>Broken & unescaped</title></item>"))
+        fallback = MagicMock(wraps=feedparser.parse)
+
+        with patch("app.scrapers.feed_stream.feedparser.parse", fallback):
+            sorted_items = RSSSource("blog", feeds=[str(path)]).get_items(hours=24)
+            assert not fallback.called
+
+            unsorted_items = RSSSource("blog", feeds=[str(path)], sorted_by_date=False).get_items(hours=24)
+            assert fallback.called
+
+        assert [i.external_id for i in sorted_items] == [i.external_id for i in unsorted_items] == ["new"]
+
+    def test_unknown_parser_rejected(self):
+        """Test that an unknown parser option is a config error."""
+        with pytest.raises(ValueError, match="Unknown feed parser"):
+            load_sources([{"name": "blog", "type": "rss", "feeds": [], "parser": "regex"}])
+
+
+class TestProcessContent:
+    """Test the shared content stage."""
+
+    def test_process_source_content_stores_marks_and_retries(self, test_db):
+        """Test fetched content is stored, missing content marked and failed fetches left pending."""
+        from app.services.process_content import process_content
+
+        repo = Repository(session=test_db)
+        published = datetime(2025, 1, 15)
+        for key in ("ok", "empty", "error"):
+            repo.create_content_item("static", key, key, f"https://example.com/{key}", published)
+        source = StaticSource("static", {"ok": "Transcript", "empty": None, "error": RuntimeError("boom")})
+        feed_only = StaticSource("feed", {})
+        feed_only.fetches_content = False
+
+        @contextmanager
+        def scope():
+            yield test_db
+
+        with patch("app.services.process_content.session_scope", scope):
+            stats = process_content(sources=[source, feed_only])
+
+        assert stats == {"static": {"total": 3, "processed": 1, "unavailable": 1, "failed": 1}}
+        contents = {item.external_id: item.content for item in test_db.query(ContentItem)}
+        assert contents == {"ok": "Transcript", "empty": UNAVAILABLE_MARKER, "error": None}
+
+        # Without mark_unavailable, items without content stay pending for the next run
+        source.mark_unavailable = False
+        repo.create_content_item("static", "later", "later", "https://example.com/later", published)
+        source.contents["later"] = None
+        with patch("app.services.process_content.session_scope", scope):
+            stats = process_content(sources=[source])
+
+        assert stats["static"]["failed"] == 2
+        assert sorted(item.external_id for item in repo.get_items_without_content("static")) == ["error", "later"]
+
+
+class TestSeenIds:
+    """Test the persisted per-source set of stored ids."""
+
+    def test_rebuild_persist_and_reload(self, test_db):
+        """Test the set is rebuilt from content_items, saved, reloaded and rebuilt when stale."""
+        from app.scrapers.seen_ids import SeenIds
+
+        repo = Repository(session=test_db)
+        published = datetime(2025, 1, 15)
+        for key in ("a", "b"):
+            repo.create_content_item("blog", key, key, f"https://example.com/{key}", published)
+        repo.create_content_item("other", "c", "c", "https://example.com/c", published)
+
+        seen = SeenIds.load(repo, "blog")
+        assert ("a" in seen, "b" in seen, "c" in seen) == (True, True, False)
+        seen.save(repo)
+
+        assert seen.add_many(["b", "d"]) == 1
+        seen.save(repo)
+        repo.create_content_item("blog", "e", "e", "https://example.com/e", published)
+
+        reloaded = SeenIds.load(repo, "blog")
+        assert len(reloaded) == 3 and "d" in reloaded and "e" not in reloaded
+        assert not reloaded.dirty
+
+        # A stale set is rebuilt from the table, picking up rows stored by other means
+        rebuilt = SeenIds.load(repo, "blog", max_age_hours=0)
+        assert sorted(key for key in "abcde" if key in rebuilt) == ["a", "b", "e"]
+
+    def test_stream_parser_skips_seen_ids(self, tmp_path):
+        """Test seen ids are skipped by both parsers without affecting the cutoff."""
+        from app.scrapers.rss import RSSSource
+
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        path = tmp_path / "feed.xml"
+        path.write_text(_feed(*[(f"p{i}", f"Post {i}", now - timedelta(hours=i), "News") for i in (1, 2, 30)]))
+
+        for parser in ("stream", "feedparser"):
+            items = RSSSource("blog", feeds=[str(path)], parser=parser).get_items(hours=24, seen={"p1"})
+            assert [item.external_id for item in items] == ["p2"]
+
+
+SEGMENTS = [("Welcome back.", 0.0, 2.5), ("Today: agents.", 2.5, 3.0), ("First, tools.", 61.2, 4.0), ("Wrap up.", 130.0, 2.0)]
+
+
+class TestTranscriptSegments:
+    """Test segment-level transcript storage and time chunking."""
+
+    def test_round_trip_keeps_text_and_timing(self, test_db):
+        """Test that packed segments slice back to the original texts and timings."""
+        text, segments = TranscriptSegments.from_segments(SEGMENTS, language="en", is_generated=True)
+        assert text == " ".join(segment[0] for segment in SEGMENTS)
+
+        repo = Repository(session=test_db)
+        repo.bulk_save_transcript_segments("youtube", {"video": segments.to_row()})
+        repo.bulk_save_transcript_segments("youtube", {"video": segments.to_row()})  # Replaces
+        loaded = TranscriptSegments.from_row(repo.get_transcript_segments("youtube", "video"))
+
+        assert list(loaded.segments(text)) == [(start, duration, t) for t, start, duration in SEGMENTS]
+        assert (loaded.language, loaded.is_generated) == ("en", True)
+        assert [loaded.segment_at(seconds) for seconds in (0, 3, 100, 500)] == [0, 1, 2, 3]
+
+    def test_chunks_by_time_and_timestamp_links(self):
+        """Test that chunks group whole segments by start time and links carry the start."""
+        text, segments = TranscriptSegments.from_segments(SEGMENTS)
+
+        chunks = segments.chunks(text, seconds=60)
+
+        assert [(c.start, c.end, c.text) for c in chunks] == [
+            (0.0, 5.5, "Welcome back. Today: agents."),
+            (61.2, 65.2, "First, tools."),
+            (130.0, 132.0, "Wrap up."),
+        ]
+        assert timestamp_url("https://www.youtube.com/watch?v=abc&t=5s", 61.2) == "https://www.youtube.com/watch?v=abc&t=61s"
+
+    def test_youtube_transcripts_store_segments(self, test_db):
+        """Test that YouTube transcripts are fetched with the language preference and stored with timing."""
+        from youtube_transcript_api import FetchedTranscript, FetchedTranscriptSnippet
+
+        from app.scrapers.youtube import YouTubeSource
+        from app.services.process_content import process_source_content
+
+        source = YouTubeSource("youtube", channels=[], languages=["de", "en"])
+        source.scraper.api = MagicMock()
+        source.scraper.api.fetch.return_value = FetchedTranscript(
+            [FetchedTranscriptSnippet(t, start, duration) for t, start, duration in SEGMENTS], "video", "German", "de", False
+        )
+        Repository(session=test_db).create_content_item("youtube", "video", "Video", "https://youtu.be/video", datetime(2025, 1, 15))
+
+        @contextmanager
+        def scope():
+            yield test_db
+
+        with patch("app.services.process_content.session_scope", scope):
+            assert process_source_content(source)["processed"] == 1
+
+        source.scraper.api.fetch.assert_called_once_with("video", languages=["de", "en"], preserve_formatting=False)
+        repo = Repository(session=test_db)
+        segments = TranscriptSegments.from_row(repo.get_transcript_segments("youtube", "video"))
+        content = test_db.get(ContentItem, ("youtube", "video")).content
+        assert isinstance(source.fetch_content(MagicMock(external_id="video")), FetchedContent)
+        assert [segment.text for segment in segments.segments(content)] == [segment[0] for segment in SEGMENTS]
+        assert segments.language == "de"
+
+    def test_youtube_request_failures_stay_pending(self, test_db):
+        """Test that an open breaker fails the fetch instead of marking videos unavailable, unlike a missing transcript."""
+        from youtube_transcript_api import TranscriptsDisabled
+
+        from app.scrapers.http_client import CircuitOpenError
+        from app.scrapers.youtube import YouTubeSource
+        from app.services.process_content import process_source_content
+
+        def fetch(video_id, **kwargs):
+            if video_id == "silent":
+                raise TranscriptsDisabled(video_id)
+            raise CircuitOpenError("Circuit open for www.youtube.com")
+
+        source = YouTubeSource("youtube", channels=[])
+        source.scraper.api = MagicMock()
+        source.scraper.api.fetch.side_effect = fetch
+        repo = Repository(session=test_db)
+        for video_id in ("silent", "a", "b"):
+            repo.create_content_item("youtube", video_id, video_id, f"https://youtu.be/{video_id}", datetime(2025, 1, 15))
+
+        @contextmanager
+        def scope():
+            yield test_db
+
+        with patch("app.services.process_content.session_scope", scope):
+            stats = process_source_content(source)
+
+        assert (stats["unavailable"], stats["failed"]) == (1, 2)
+        assert sorted(item.external_id for item in repo.get_items_without_content("youtube")) == ["a", "b"]
@@ -0,0 +1,114 @@
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from app.agents.email_agent import EmailDigestResponse, EmailIntroduction, RankedArticleDetail
+from app.database.repository import Repository
+from app.profiles.subscribers import add_subscriber, profile_hash, seed_default_subscribers
+from app.services.email import DeliveryReport
+
+RAG_PROFILE = {"name": "Ada", "background": "Search engineer", "interests": ["RAG"]}
+AGENTS_PROFILE = {"name": "Lin", "background": "Platform engineer", "interests": ["Agents"]}
+
+
+def _response(profile: dict) -> EmailDigestResponse:
+    article = RankedArticleDetail(
+        digest_id="openai:1",
+        rank=1,
+        relevance_score=9.0,
+        title=f"Top story for {profile['interests'][0]}",
+        summary="Summary",
+        url="https://example.com/1",
+        article_type="openai",
+    )
+    return EmailDigestResponse(
+        introduction=EmailIntroduction(greeting=f"Hey {profile.get('name', 'there')}! - January 15, 2025", introduction="Hi"),
+        articles=[article],
+        total_ranked=1,
+        top_n=10,
+    )
+
+
+class RecordingMailer:
+    """Stand-in for SMTPMailer that records the batch instead of sending it."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def send_batch(self, messages):
+        self.batches.append(list(messages))
+        return DeliveryReport(sent=[message.recipient for message in messages], connections=1)
+
+
+class TestProfileHash:
+    """Test profile identity used to share rankings."""
+
+    def test_curator_prompt_omits_missing_name(self):
+        """Test that a shared ranking profile yields a curator prompt without a Name line."""
+        from app.agents.curator_agent import CuratorAgent
+        from app.profiles.subscribers import ranking_profile
+
+        shared = CuratorAgent(ranking_profile(RAG_PROFILE), client=object())
+        personal = CuratorAgent(RAG_PROFILE, client=object())
+
+        assert "Name:" not in shared.system_prompt and "Ada" not in shared.system_prompt
+        assert "- Name: Ada" in personal.system_prompt
+
+    def test_hash_ignores_name_but_not_interests(self):
+        """Test that renamed copies share a hash and different interests do not."""
+        assert profile_hash(RAG_PROFILE) == profile_hash({**RAG_PROFILE, "name": "Grace"})
+        assert profile_hash(RAG_PROFILE) != profile_hash(AGENTS_PROFILE)
+
+
+class TestSubscribers:
+    """Test subscriber storage and digest fan-out."""
+
+    def test_seed_only_when_empty(self, test_db, monkeypatch):
+        """Test that default recipients are subscribed once, on an empty table."""
+        monkeypatch.setenv("EMAIL_RECIPIENTS", "a@example.com, b@example.com")
+        repo = Repository(session=test_db)
+
+        assert seed_default_subscribers(repo) == 2
+        assert seed_default_subscribers(repo) == 0
+        assert len({s.profile_hash for s in repo.get_active_subscribers()}) == 1
+
+    def test_fan_out_ranks_once_per_unique_profile(self, test_db):
+        """Test that three subscribers with two profiles cost two rankings and get three emails."""
+        repo = Repository(session=test_db)
+        add_subscriber(repo, "ada@example.com", RAG_PROFILE)
+        add_subscriber(repo, "grace@example.com", {**RAG_PROFILE, "name": "Grace"})
+        add_subscriber(repo, "lin@example.com", AGENTS_PROFILE)
+        mailer = RecordingMailer()
+
+        @contextmanager
+        def test_scope():
+            yield test_db
+
+        with patch("app.services.process_email.session_scope", test_scope), patch(
+            "app.services.process_email.load_digest_candidates", return_value=[{"id": "openai:1"}]
+        ), patch(
+            "app.services.process_email.build_email_digest", side_effect=lambda d, profile, *a, **k: _response(profile)
+        ) as build, patch(
+            "app.services.process_email.SMTPMailer.from_env", return_value=mailer
+        ):
+            from app.services.process_email import send_digest_email
+
+            result = send_digest_email()
+
+        assert result["success"] is True
+        assert result["profiles"] == 2
+        assert build.call_count == 2
+        # The shared ranking never sees one subscriber's name
+        assert all("name" not in call.args[1] for call in build.call_args_list)
+        assert len(mailer.batches) == 1
+        greetings = {m.recipient: m.body_text.splitlines()[0] for m in mailer.batches[0]}
+        assert greetings == {
+            "ada@example.com": "Hey Ada! - January 15, 2025",
+            "grace@example.com": "Hey Grace! - January 15, 2025",
+            "lin@example.com": "Hey Lin! - January 15, 2025",
+        }